@@ -20,10 +20,11 @@
 #------------------------------------------------------------------------------
 #!/usr/bin/env python
 
-import arcpy,os,sys
+import os,sys
 from xml.dom import minidom
 
 import Base
+from Base import arcpy
 
 class AddFields(Base.Base):
 
@@ -47,24 +48,13 @@ class AddFields(Base.Base):
                 self.log("Mosaic dataset is not found.", self.const_warning_text)
                 return False
 
-            self.log("\tCreating fields:", self.const_general_text)
-            for j in range(len(self.fieldNameList)):
-                self.log("\t\t" + self.fieldNameList[j], self.const_general_text)
-                fieldExist = arcpy.ListFields(mdPath,self.fieldNameList[j])
-                if len(fieldExist) == 0:
-                    arcpy.AddField_management(mdPath,self.fieldNameList[j],self.fieldTypeList[j],"","",self.fieldLengthList[j])
-##                    workspace = self.m_base.m_workspace
-##                    geodatabase = self.m_base.m_geodatabase
-##                    if (workspace == ''):
-##                        workspace = self.workspace
-##                    if (geodatabase == ''):
-##                        geodatabase = self.gdbName
-##                    lock_path_  = os.path.join(workspace, geodatabase + '.gdb')
-##                    result_code_  = self.waitForLockRelease(lock_path_)
-##                    if (result_code_ == -1):
-##                        return False
-##                    elif(result_code_ == -2):
-##                        return False
+            fields = [(self.fieldNameList[j], self.fieldTypeList[j], self.fieldLengthList[j]) for j in range(len(self.fieldNameList))]
+            (created, skipped) = Base.g_field_cache.addFields(mdPath, fields)
+            self.log("\tCreated (%s) field(s):" % (len(created)), self.const_general_text)
+            for field in created:
+                self.log("\t\t" + field[0], self.const_general_text)
+            if (len(skipped) > 0):
+                self.log("\tSkipped (%s) existing field(s): %s" % (len(skipped), ', '.join([f[0] for f in skipped])), self.const_general_text)
 
         except:
             self.log("Error: " + arcpy.GetMessages(), self.const_critical_text)
@@ -76,14 +66,13 @@ class AddFields(Base.Base):
 
     def init(self, config):
 
-        Nodelist = self.m_base.m_doc.getElementsByTagName("MosaicDataset")
-        if (Nodelist.length == 0):
+        Nodelist = self.getXMLNodes(self.m_base.m_doc, "MosaicDataset")
+        if (len(Nodelist) == 0):
             self.log("\nError: MosaicDataset node not found! Invalid schema.", self.const_critical_text)
             return False
 
         try:
-            for node in Nodelist[0].childNodes:
-                  node =  node.nextSibling
+            for node in self.getXMLChildElements(Nodelist[0]):
                   if (node != None and node.nodeType == minidom.Node.ELEMENT_NODE):
                     if (node.nodeName == 'Name'):
                         try:
@@ -97,8 +86,8 @@ class AddFields(Base.Base):
             return False
 
 
-        Nodelist = self.m_base.m_doc.getElementsByTagName("Fields")
-        if (Nodelist.length == 0):
+        Nodelist = self.getXMLNodes(self.m_base.m_doc, "Fields")
+        if (len(Nodelist) == 0):
             self.log("Error: Fields node not found! Invalid schema.", self.const_critical_text)
             return False
 
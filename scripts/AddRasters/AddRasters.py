@@ -20,16 +20,18 @@
 #------------------------------------------------------------------------------
 #!/usr/bin/env python
 
-import arcpy
 import os
+import time
 from xml.dom import minidom
 
 import Base
+from Base import arcpy
 class AddRasters(Base.Base):
 
     def __init__(self, base):
         self.sMdNameList = {}
         self.callback_functions = []
+        self.m_discovered = [0, 0]      # (new, changed) files found for the <AddRaster> being added.
 
         self.setLog(base.m_log)
         self.m_sources = base.m_sources
@@ -43,17 +45,7 @@ class AddRasters(Base.Base):
 
 
     def getLastObjectID (self, gdb, md):
-
-        path = os.path.join(gdb, md)
-        rows = arcpy.SearchCursor(path, "objectid = (SELECT MAX(\"objectid\") FROM %sAMD_%s_CAT)" % (self.m_base.m_SDE_database_user, md), None, 'objectid')
-        if (rows == None):
-            return 0        #new table
-
-        objID = 0
-        for row in rows:
-            objID = row.objectid
-            break
-        return objID
+        return self.m_base.m_objectid_tracker.getMax(gdb, md)
 
 
     def GetValue(self, dic_values, key):
@@ -64,16 +56,89 @@ class AddRasters(Base.Base):
         except:
             return ''
 
+    def getDiscoveredCalls(self, discovery, manifest, hshAddRaster, set_filter):     # yields the (input_path, filter, sub_folder, duplicate_items_action, records) per tool call while the sources are being discovered.
+        data_path = self.GetValue(hshAddRaster, 'data_path')
+        recursive = self.GetValue(hshAddRaster, 'sub_folder').upper() != 'NO_SUBFOLDERS'
+        t0 = time.time()
+        self.m_discovered = [0, 0]
+        if (set_filter == '' and
+            discovery.hasFolders(data_path)):       # without a filter the raster type picks the files (no sidecars/.adf parts), the folders get added as is once anything changed.
+            records = []
+            overwrite = False
+            for files in discovery.getChunks(data_path, set_filter, recursive):
+                (new, changed) = manifest.getChanges(hshAddRaster['dataset_id'], files)
+                self.m_discovered[0] += len(new)
+                self.m_discovered[1] += len(changed)
+                records.extend(new + changed)
+                overwrite = overwrite or len(changed) > 0
+            self.log('\tSource discovery: (%s) new, (%s) changed file(s) found in (%.1f) s' % (self.m_discovered[0], self.m_discovered[1], time.time() - t0), self.const_general_text)
+            if (len(records) > 0):
+                yield (data_path, '', self.GetValue(hshAddRaster, 'sub_folder'), 'OVERWRITE_DUPLICATES' if overwrite else self.GetValue(hshAddRaster, 'duplicate_items_action'), records)
+            return
+        for files in discovery.getChunks(data_path, set_filter, recursive):
+            if (manifest is not None):
+                (new, changed) = manifest.getChanges(hshAddRaster['dataset_id'], files)
+            else:
+                (new, changed) = ([(f[0], f[1], f[2], None) for f in files], [])
+            self.m_discovered[0] += len(new)
+            self.m_discovered[1] += len(changed)
+            if (len(new) > 0):
+                yield (';'.join([r[0] for r in new]), '', 'NO_SUBFOLDERS', self.GetValue(hshAddRaster, 'duplicate_items_action'), new)
+            if (len(changed) > 0):      # changed files replace their catalog items.
+                yield (';'.join([r[0] for r in changed]), '', 'NO_SUBFOLDERS', 'OVERWRITE_DUPLICATES', changed)
+        self.log('\tSource discovery: (%s) new, (%s) changed file(s) found in (%.1f) s' % (self.m_discovered[0], self.m_discovered[1], time.time() - t0), self.const_general_text)
+
+
+    def getLastFlagged(self, calls):      # yields (call, is_last) looking one call ahead.
+        prev = None
+        for call in calls:
+            if (prev is not None):
+                yield (prev, False)
+            prev = call
+        if (prev is not None):
+            yield (prev, True)
+
+
+    def buildPyramidsAndStatistics(self, fullPath, hshAddRaster, objID):      # once for all the items added by the discovered chunks.
+        build_pyramids = 'BUILD_PYRAMIDS' if self.GetValue(hshAddRaster, 'build_pyramids').upper() == 'BUILD_PYRAMIDS' else 'NONE'
+        calculate_statistics = 'CALCULATE_STATISTICS' if self.GetValue(hshAddRaster, 'calculate_statistics').upper() == 'CALCULATE_STATISTICS' else 'NONE'
+        if (build_pyramids == 'NONE' and
+            calculate_statistics == 'NONE'):
+            return True
+        estimate_statistics = 'ESTIMATE_STATISTICS' if self.GetValue(hshAddRaster, 'estimate_statistics').upper() == 'ESTIMATE_STATISTICS' else '#'
+        self.log('\tBuilding pyramids/statistics for the added items..', self.const_general_text)
+        lyrName = 'lyr_ar_%s' % str(objID)
+        arcpy.MakeMosaicLayer_management(fullPath, lyrName, 'OBJECTID > %s' % (objID))
+        arcpy.BuildPyramidsandStatistics_management(lyrName, '#', build_pyramids, calculate_statistics, 'BUILD_ON_SOURCE', '#', estimate_statistics,
+        '#', '#', '#', '#', '#', '#', '#', '#', 'SKIP_EXISTING')
+        arcpy.Delete_management(lyrName)
+        return True
+
+
     def AddRasters(self):
         self.log("Adding rasters:", self.const_general_text)
+        manifest = self.m_base.m_source_manifest
+        discovery = self.m_base.m_source_discovery
+        up_to_date = 0
         for sourceID in self.sMdNameList:
             MDName = self.sMdNameList[sourceID]['md']
             fullPath = os.path.join(self.m_base.m_geoPath, MDName)
             if (arcpy.Exists(fullPath) == False):
                 self.log("Path doesn't exist: %s" % (fullPath), self.const_critical_text)
                 return False
-            self.m_base.m_last_AT_ObjectID = self.getLastObjectID (self.m_base.m_geoPath, MDName)
-            for hshAddRaster in self.sMdNameList[sourceID]['addraster']:
+            if (manifest is not None and
+                manifest.open(fullPath) == False):
+                return False
+            tracker = self.m_base.m_objectid_tracker
+            checkpoint = self.m_base.m_checkpoint
+            self.m_base.m_last_AT_ObjectID = tracker.getMax(self.m_base.m_geoPath, MDName)
+            if (checkpoint is not None):        # on resume, the items added by the failed run are still above the original watermark.
+                self.m_base.m_last_AT_ObjectID = checkpoint.getWatermark(sourceID, self.m_base.m_last_AT_ObjectID)
+            for entry, hshAddRaster in enumerate(self.sMdNameList[sourceID]['addraster']):
+                if (checkpoint is not None and
+                    checkpoint.isAddRasterDone(sourceID, entry)):
+                    self.log("\tSkipping mosaic dataset/ID:%s/%s, added by an earlier run." % (MDName, hshAddRaster['dataset_id']), self.const_general_text)
+                    continue
                 try:
                     self.log("\tUsing mosaic dataset/ID:" + MDName + '/' + \
                     hshAddRaster['dataset_id'], self.const_general_text)
@@ -97,48 +162,94 @@ class AddRasters(Base.Base):
                     set_spatial_reference = ''
                     if ('spatial_reference' in hshAddRaster.keys()):
                         set_spatial_reference = hshAddRaster['spatial_reference']
-                    objID = self.getLastObjectID (self.m_base.m_geoPath, MDName)
+                    objID = tracker.getMax(self.m_base.m_geoPath, MDName)
                     self.sMdNameList[sourceID]['pre_AddRasters_record_count'] = objID
                     self.sMdNameList[sourceID]['Dataset_ID'] = hshAddRaster['dataset_id']
 
+                    calls = None
+                    if (discovery is not None):
+                        data_path = self.GetValue(hshAddRaster, 'data_path')
+                        if (discovery.isSupported(data_path) == False):
+                            self.log('\tSource discovery: (%s) is not a local file/folder, adding the data path as is.' % (data_path), self.const_warning_text)
+                        elif (discovery.getMatcher(set_filter) is None):
+                            self.log('\tSource discovery: invalid filter (%s), adding the data path as is.' % (set_filter), self.const_warning_text)
+                        elif (set_filter == '' and
+                            manifest is None and
+                            discovery.hasFolders(data_path)):
+                            self.log('\tSource discovery: no filter set, adding (%s) as is for the raster type to select its files.' % (data_path), self.const_general_text)
+                        else:
+                            calls = self.getDiscoveredCalls(discovery, manifest, hshAddRaster, set_filter)
+                    discovered = calls is not None
+                    if (calls is None):
+                        calls = [(self.GetValue(hshAddRaster,'data_path'), set_filter, self.GetValue(hshAddRaster,'sub_folder'), self.GetValue(hshAddRaster,'duplicate_items_action'), None)]
+
                     self.log('Adding items..')
-                    args=[]
-                    args.append(fullPath)
-                    args.append(rasterType)
-                    args.append(self.GetValue(hshAddRaster,'data_path'))
-                    args.append(self.GetValue(hshAddRaster,'update_cellsize_ranges'))
-                    args.append(self.GetValue(hshAddRaster,'update_boundary'))
-                    args.append(self.GetValue(hshAddRaster,'update_overviews'))
-                    args.append(self.GetValue(hshAddRaster,'maximum_pyramid_levels'))
-                    args.append(self.GetValue(hshAddRaster,'maximum_cell_size'))
-                    args.append(self.GetValue(hshAddRaster,'minimum_dimension'))
-                    args.append(self.GetValue(hshAddRaster,'spatial_reference'))
-                    args.append(set_filter)
-                    args.append(self.GetValue(hshAddRaster,'sub_folder'))
-                    args.append(self.GetValue(hshAddRaster,'duplicate_items_action'))
-                    args.append(self.GetValue(hshAddRaster,'build_pyramids'))
-                    args.append(self.GetValue(hshAddRaster,'calculate_statistics'))
-                    args.append(self.GetValue(hshAddRaster,'build_thumbnails'))
-                    args.append(self.GetValue(hshAddRaster,'operation_description'))
-                    args.append(self.GetValue(hshAddRaster,'force_spatial_reference'))
-                    args.append(self.GetValue(hshAddRaster,'estimate_statistics'))
-                    args.append(self.GetValue(hshAddRaster,'aux_inputs'))
-                    AddRaster = Base.DynaInvoke('arcpy.AddRastersToMosaicDataset_management', args, None, self.m_base.m_log.Message)
-                    if (AddRaster.init() == False):
-                        return False
-                    AddRaster.invoke()
-                    newObjID = self.getLastObjectID (self.m_base.m_geoPath, MDName)
+                    chunked = None
+                    for ((input_path, input_filter, sub_folder, duplicate_items_action, records), is_last) in self.getLastFlagged(calls):
+                        if (chunked is None):
+                            chunked = is_last == False
+                        # the mosaic dataset wide updates run with the last chunk only, pyramids/statistics once all chunks are in.
+                        update_args = ['NO_CELL_SIZES', 'NO_BOUNDARY', 'NO_OVERVIEWS']
+                        if (is_last):
+                            update_args = [self.GetValue(hshAddRaster, k) for k in ('update_cellsize_ranges', 'update_boundary', 'update_overviews')]
+                        args=[]
+                        args.append(fullPath)
+                        args.append(rasterType)
+                        args.append(input_path)
+                        args.extend(update_args)
+                        args.append(self.GetValue(hshAddRaster,'maximum_pyramid_levels'))
+                        args.append(self.GetValue(hshAddRaster,'maximum_cell_size'))
+                        args.append(self.GetValue(hshAddRaster,'minimum_dimension'))
+                        args.append(self.GetValue(hshAddRaster,'spatial_reference'))
+                        args.append(input_filter)
+                        args.append(sub_folder)
+                        args.append(duplicate_items_action)
+                        args.append('NO_PYRAMIDS' if chunked else self.GetValue(hshAddRaster,'build_pyramids'))
+                        args.append('NO_STATISTICS' if chunked else self.GetValue(hshAddRaster,'calculate_statistics'))
+                        args.append(self.GetValue(hshAddRaster,'build_thumbnails'))
+                        args.append(self.GetValue(hshAddRaster,'operation_description'))
+                        args.append(self.GetValue(hshAddRaster,'force_spatial_reference'))
+                        args.append(self.GetValue(hshAddRaster,'estimate_statistics'))
+                        args.append(self.GetValue(hshAddRaster,'aux_inputs'))
+                        AddRaster = Base.DynaInvoke('arcpy.AddRastersToMosaicDataset_management', args, None, self.m_base.m_log.Message)
+                        if (AddRaster.init() == False):
+                            return False
+                        if (AddRaster.invoke() == True and
+                            records is not None and
+                            manifest is not None):
+                            manifest.commit(hshAddRaster['dataset_id'], records)       # only files the tool call has succeeded on.
+                    if (chunked):
+                        self.buildPyramidsAndStatistics(fullPath, hshAddRaster, objID)
+                    if (manifest is not None and
+                        discovered and
+                        sum(self.m_discovered) == 0):
+                        self.log('\tNo new/changed source files for Dataset ID (%s)' % (hshAddRaster['dataset_id']), self.const_general_text)
+                        up_to_date += 1
+                        if (checkpoint is not None):
+                            checkpoint.addRasterDone(sourceID, entry, hshAddRaster['dataset_id'], self.m_base.m_last_AT_ObjectID)
+                        continue
+                    newObjID = tracker.refresh(self.m_base.m_geoPath, MDName)
                     if (newObjID <= objID):
                         self.log('No new mosaic dataset item was added for Dataset ID (%s)' % (hshAddRaster['dataset_id']))
                         continue
                     for callback_fn in self.callback_functions:
                         if (callback_fn(self.m_base.m_geoPath, sourceID, self.sMdNameList[sourceID]) == False):
                             return False
+                    if (checkpoint is not None):
+                        checkpoint.addRasterDone(sourceID, entry, hshAddRaster['dataset_id'], self.m_base.m_last_AT_ObjectID)
                 except Exception as e:
                     self.log(str(e), self.const_warning_text)
                     self.log(arcpy.GetMessages(), self.const_warning_text)
+                    tracker.invalidate(self.m_base.m_geoPath, MDName)      # callbacks/tool may have left the catalog in an unknown state.
                     Warning = True
-            newObjID = self.getLastObjectID (self.m_base.m_geoPath, MDName)
+            newObjID = tracker.getMax(self.m_base.m_geoPath, MDName)
+            if (manifest is not None):
+                manifest.close()
+                if (up_to_date == len(self.sMdNameList[sourceID]['addraster'])):
+                    self.log('Mosaic dataset (%s) is up to date with its sources.' % (MDName), self.const_general_text)
+                    up_to_date = 0
+                    continue
+            up_to_date = 0
             if (newObjID <= self.m_base.m_last_AT_ObjectID):
                 self.log('No new mosaic dataset items added to dataset (%s). Verify the input data path/raster type is correct' % (MDName), self.const_critical_text)
                 self.log(arcpy.GetMessages(), self.const_critical_text)
@@ -147,17 +258,32 @@ class AddRasters(Base.Base):
 
 
     def init(self, config):
+
+        if ('addrasters' in self.m_base.m_compiled_config.keys()):
+            self.sMdNameList = self.m_base.m_compiled_config['addrasters']
+        elif (self.readConfig() == False):
+            return False
+
+        if not arcpy.Exists(self.m_base.m_workspace):
+                self.log("Error: workspace not found!:" + self.m_base.m_workspace, self.const_critical_text)
+                self.log(arcpy.GetMessages(), self.const_critical_text)
+                return False
+
+
+        return True
+
+
+    def readConfig(self):
         mdType = self.getXMLNodeValue(self.m_base.m_doc, 'MosaicDatasetType').lower()
         isDerived = mdType == 'derived'
 
-        Nodelist = self.m_base.m_doc.getElementsByTagName("MosaicDataset")
-        if (Nodelist.length == 0):
+        Nodelist = self.getXMLNodes(self.m_base.m_doc, "MosaicDataset")
+        if (len(Nodelist) == 0):
             self.log("Error: <MosaicDataset> node is not found! Invalid schema.", self.const_critical_text)
             return False
 
         try:
-            for node in Nodelist[0].childNodes:
-                  node =  node.nextSibling
+            for node in self.getXMLChildElements(Nodelist[0]):
                   if (node != None and node.nodeType == minidom.Node.ELEMENT_NODE):
 
                                 if (node.nodeName == 'Name'):
@@ -255,11 +381,4 @@ class AddRasters(Base.Base):
             self.log(str(inst), self.const_critical_text)
             return False
 
-
-        if not arcpy.Exists(self.m_base.m_workspace):
-                self.log("Error: workspace not found!:" + self.m_base.m_workspace, self.const_critical_text)
-                self.log(arcpy.GetMessages(), self.const_critical_text)
-                return False
-
-
         return True
@@ -0,0 +1,839 @@
+#------------------------------------------------------------------------------
+# Copyright 2013 Esri
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#------------------------------------------------------------------------------
+# Name: Backend.py
+# Description: An in-memory stand-in for the arcpy tools, cursors and describe calls used by MDCS. Simulates
+#              mosaic dataset catalogs, OBJECTIDs, fields and tool latencies to run/profile MDCS without ArcGIS.
+# Version: 20161018
+# Requirements: Python
+# Author: Esri Imagery Workflows team
+#------------------------------------------------------------------------------
+#!/usr/bin/env python
+
+import os
+import re
+import sys
+import time
+import fnmatch
+import hashlib
+
+# geoprocessing tool signatures (ArcGIS 10.x parameter names) of tools MDCS calls but the backend doesn't
+# simulate beyond counting the call and applying the latency. The names are used by (DynaInvoke) to map the
+# process info values to the tool arguments.
+TOOL_SIGNATURES = {
+'AlterMosaicDatasetSchema_management' : ['in_mosaic_dataset', 'side_tables', 'editable_fields', 'mosaic_operators', 'raster_type_names', 'editor_tracking'],
+'AnalyzeControlPoints_management' : ['in_mosaic_dataset', 'in_control_points', 'out_coverage_table', 'out_overlap_table', 'in_mask_dataset', 'minimum_area'],
+'AnalyzeMosaicDataset_management' : ['in_mosaic_dataset', 'where_clause', 'checker_keywords'],
+'ApplyBlockAdjustment_management' : ['in_mosaic_dataset', 'adjustment_operation', 'input_solution_table', 'pan_to_ms_scaling_factor'],
+'BuildBoundary_management' : ['in_mosaic_dataset', 'where_clause', 'append_to_existing', 'simplification_method'],
+'BuildFootprints_management' : ['in_mosaic_dataset', 'where_clause', 'reset_footprint', 'min_data_value', 'max_data_value', 'approx_num_vertices', 'shrink_distance', 'maintain_edges', 'skip_derived_images', 'update_boundary', 'request_size', 'min_region_size', 'simplification_method', 'edge_tolerance', 'max_sliver_size', 'min_thinness_ratio'],
+'BuildMosaicDatasetItemCache_management' : ['in_mosaic_dataset', 'where_clause', 'define_cache', 'generate_cache', 'item_cache_folder', 'compression_method', 'compression_quality', 'max_allowed_rows', 'max_allowed_columns', 'request_size_type', 'request_size'],
+'BuildOverviews_management' : ['in_mosaic_dataset', 'where_clause', 'define_missing_tiles', 'generate_overviews', 'generate_missing_images', 'regenerate_stale_images'],
+'BuildPyramids_management' : ['in_raster_dataset', 'pyramid_level', 'SKIP_FIRST', 'resample_technique', 'compression_type', 'compression_quality', 'skip_existing'],
+'BuildPyramidsandStatistics_management' : ['in_workspace', 'include_subdirectories', 'build_pyramids', 'calculate_statistics', 'BUILD_ON_SOURCE', 'block_field', 'estimate_statistics', 'x_skip_factor', 'y_skip_factor', 'ignore_values', 'pyramid_level', 'SKIP_FIRST', 'resample_technique', 'compression_type', 'compression_quality', 'skip_existing'],
+'CalculateCellSizeRanges_management' : ['in_mosaic_dataset', 'where_clause', 'do_compute_min', 'do_compute_max', 'max_range_factor', 'cell_size_tolerance_factor', 'update_missing_only'],
+'CalculateStatistics_management' : ['in_raster_dataset', 'x_skip_factor', 'y_skip_factor', 'ignore_values', 'skip_existing', 'area_of_interest'],
+'ColorBalanceMosaicDataset_management' : ['in_mosaic_dataset', 'balancing_method', 'color_surface_type', 'target_raster', 'gamma', 'exclude_raster', 'stretch_type', 'block_field'],
+'Compact_management' : ['in_workspace'],
+'ComputeBlockAdjustment_management' : ['in_mosaic_dataset', 'in_control_points', 'transformation_type', 'out_solution_table', 'out_solution_point_table', 'maximum_residual_value', 'adjustment_options'],
+'ComputeControlPoints_management' : ['in_mosaic_dataset', 'in_reference_images', 'out_control_points', 'similarity', 'out_image_feature_points', 'density', 'distribution', 'area_of_interest'],
+'ComputeDirtyArea_management' : ['in_mosaic_dataset', 'where_clause', 'timestamp', 'out_feature_class'],
+'ComputeTiePoints_management' : ['in_mosaic_dataset', 'out_control_points', 'similarity', 'in_mask_dataset', 'out_image_features', 'density', 'distribution'],
+'CreateImageSDDraft' : ['raster_or_mosaic_layer', 'out_sddraft', 'service_name', 'server_type', 'connection_file_path', 'copy_data_to_server', 'folder_name', 'summary', 'tags'],
+'DefineMosaicDatasetNoData_management' : ['in_mosaic_dataset', 'num_bands', 'bands_for_nodata_value', 'bands_for_valid_data_range', 'where_clause', 'Composite_nodata_value'],
+'DefineOverviews_management' : ['in_mosaic_dataset', 'overview_image_folder', 'in_template_dataset', 'extent', 'pixel_size', 'number_of_levels', 'tile_rows', 'tile_cols', 'overview_factor', 'force_overview_tiles', 'resampling_method', 'compression_method', 'compression_quality'],
+'EditRasterFunction_management' : ['in_mosaic_dataset', 'edit_mosaic_dataset_item', 'edit_options', 'function_chain_definition', 'location_function_name'],
+'ExportMosaicDatasetItems_management' : ['in_mosaic_dataset', 'out_folder', 'out_base_name', 'where_clause', 'format', 'nodata_value', 'clip_type', 'template_dataset', 'cell_size'],
+'ExportTileCache_management' : ['in_cache_source', 'in_target_cache_folder', 'in_target_cache_name', 'export_cache_type', 'storage_format_type', 'scales', 'area_of_interest'],
+'GenerateExcludeArea_management' : ['in_raster', 'out_raster', 'pixel_type', 'generate_method', 'max_red', 'max_green', 'max_blue', 'max_white', 'max_black', 'max_magenta', 'max_cyan', 'max_yellow', 'percentage_low', 'percentage_high'],
+'ImportMosaicDatasetGeometry_management' : ['in_mosaic_dataset', 'target_featureclass_type', 'target_join_field', 'input_featureclass', 'input_join_field'],
+'ManageTileCache_management' : ['in_cache_location', 'manage_mode', 'in_cache_name', 'in_cache_source', 'tiling_scheme', 'import_tiling_scheme', 'scales', 'area_of_interest', 'max_cell_size'],
+'MergeMosaicDatasetItems_management' : ['in_mosaic_dataset', 'where_clause', 'block_field', 'max_rows_per_merged_items'],
+'RemoveIndex_management' : ['in_table', 'index_name'],
+'AddIndex_management' : ['in_table', 'fields', 'index_name', 'unique', 'ascending'],
+'RepairMosaicDatasetPaths_management' : ['in_mosaic_dataset', 'paths_list', 'where_clause'],
+'SetMosaicDatasetProperties_management' : ['in_mosaic_dataset', 'rows_maximum_imagesize', 'columns_maximum_imagesize', 'allowed_compressions', 'default_compression_type', 'JPEG_quality', 'LERC_Tolerance', 'resampling_type', 'clip_to_footprints', 'footprints_may_contain_nodata', 'clip_to_boundary', 'color_correction', 'allowed_mensuration_capabilities', 'default_mensuration_capabilities', 'allowed_mosaic_methods', 'default_mosaic_method', 'order_field', 'order_base', 'sorting_order', 'mosaic_operator', 'blend_width', 'view_point_x', 'view_point_y', 'max_num_per_mosaic', 'cell_size_tolerance', 'cell_size', 'metadata_level', 'transmission_fields', 'use_time', 'start_time_field', 'end_time_field', 'time_format', 'geographic_transform', 'max_num_of_download_items', 'max_num_of_records_returned', 'data_source_type', 'minimum_pixel_contribution', 'processing_templates', 'default_processing_template'],
+'SetRasterProperties_management' : ['in_raster', 'data_type', 'statistics', 'stats_file', 'nodata'],
+'SharePackage_management' : ['in_package', 'username', 'password', 'summary', 'tags', 'credits', 'public', 'groups'],
+'StageService_server' : ['in_service_definition_draft', 'out_service_definition'],
+'SynchronizeMosaicDataset_management' : ['in_mosaic_dataset', 'where_clause', 'new_items', 'sync_only_stale', 'update_cellsize_ranges', 'update_boundary', 'update_overviews', 'build_pyramids', 'calculate_statistics', 'build_thumbnails', 'build_item_cache', 'rebuild_raster', 'update_fields', 'fields_to_update', 'existing_items', 'broken_items', 'skip_existing_items', 'refresh_aggregate_info', 'estimate_statistics'],
+'UploadServiceDefinition_server' : ['in_sd_file', 'in_server', 'in_service_name', 'in_cluster', 'in_folder_type', 'in_folder', 'in_startupType', 'in_override', 'in_my_contents', 'in_public', 'in_organization', 'in_groups']
+}
+
+# default fields of a mosaic dataset catalog (AMD_<name>_CAT)
+CATALOG_FIELDS = [
+('OBJECTID', 'OID', 4), ('Shape', 'Geometry', 0), ('Raster', 'Raster', 0), ('Name', 'String', 50),
+('MinPS', 'Double', 8), ('MaxPS', 'Double', 8), ('LowPS', 'Double', 8), ('HighPS', 'Double', 8),
+('Category', 'Integer', 4), ('Tag', 'String', 20), ('GroupName', 'String', 50), ('ProductName', 'String', 50),
+('CenterX', 'Double', 8), ('CenterY', 'Double', 8), ('ZOrder', 'Integer', 4), ('TypeID', 'Integer', 4),
+('ItemTS', 'Double', 8), ('UriHash', 'String', 50), ('Uri', 'Blob', 0), ('Shape_Length', 'Double', 8), ('Shape_Area', 'Double', 8)
+]
+
+# field types as returned by (ListFields) for the types passed to (AddField)
+FIELD_TYPES = {
+'TEXT' : 'String', 'FLOAT' : 'Single', 'DOUBLE' : 'Double', 'SHORT' : 'SmallInteger', 'LONG' : 'Integer',
+'DATE' : 'Date', 'BLOB' : 'Blob', 'RASTER' : 'Raster', 'GUID' : 'Guid'
+}
+
+
+class ExecuteError(Exception):
+    pass
+
+
+def isSet(value):       # MDCS passes (#) / None for the tool defaults.
+    return (value is not None and
+            str(value).strip() != '' and
+            str(value).strip() != '#')
+
+
+def getKey(path):
+    return os.path.normpath(str(path).replace('\\', '/')).lower()
+
+
+class Field(object):
+    def __init__(self, name, type, length = 0, aliasName = None):
+        self.name = name
+        self.baseName = name
+        self.type = type
+        self.length = length
+        self.aliasName = aliasName if aliasName is not None else name
+        self.isNullable = True
+        self.required = type in ('OID', 'Geometry')
+        self.editable = type != 'OID'
+        self.precision = 0
+        self.scale = 0
+        self.domain = ''
+
+
+class Result(object):
+    def __init__(self, outputs):
+        self.m_outputs = outputs
+        self.status = 4         # succeeded
+        self.outputCount = len(outputs)
+
+    def getOutput(self, index):
+        return self.m_outputs[index]
+
+    def __str__(self):
+        return str(self.m_outputs[0]) if len(self.m_outputs) > 0 else ''
+
+
+class Describe(object):
+    def __init__(self, dataset):
+        self.name = dataset['name']
+        self.baseName = dataset['name']
+        self.catalogPath = dataset['path']
+        self.path = os.path.dirname(dataset['path'])
+        self.dataType = dataset['type']
+        self.fields = [Field(*f) for f in dataset['fields']]
+        self.OIDFieldName = 'OBJECTID' if len(dataset['fields']) > 0 else ''
+        self.connectionProperties = ConnectionProperties()
+
+
+class ConnectionProperties(object):
+    def __init__(self):
+        self.database = 'mdcs'
+        self.user = 'sde'
+        self.instance = 'memory'
+
+
+class Env(object):      # arcpy.env, values can also be set as (env[key] = value).
+    def __init__(self):
+        self.workspace = None
+        self.scratchWorkspace = None
+        self.overwriteOutput = False
+
+    def __getitem__(self, key):
+        return getattr(self, key, None)
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+
+class Like(object):     # (value in Like(pattern)) for the SQL LIKE operator.
+    def __init__(self, pattern):
+        expr = ''
+        for ch in pattern:
+            if (ch == '%'):
+                expr += '.*'
+            elif (ch == '_'):
+                expr += '.'
+            else:
+                expr += re.escape(ch)
+        self.m_re = re.compile('^%s$' % (expr), re.IGNORECASE | re.DOTALL)
+
+    def __contains__(self, value):
+        return (value is not None and
+                self.m_re.match(str(value)) is not None)
+
+
+class Where(object):
+    # Translates the SQL where clauses used with MDCS (comparisons, AND/OR/NOT, IN, LIKE, IS [NOT] NULL and
+    # the MAX() subquery of the OBJECTID lookups) into a python expression evaluated per row.
+    re_token = re.compile(r"\s*(?:(?P<num>\d+(?:\.\d+)?)|(?P<str>'(?:[^']|'')*')|(?P<op><>|!=|<=|>=|=|<|>|\(|\)|,|\+|-|\*|/)|(?P<name>\"?[A-Za-z_][\w.]*\"?))")
+    re_max = re.compile(r"\(\s*SELECT\s+MAX\(\s*\"?(\w+)\"?\s*\)\s+FROM\s+[^)]*\)", re.IGNORECASE)
+
+    def __init__(self, where, rows):
+        self.m_code = None
+        if (isSet(where) == False):
+            return
+        where = self.re_max.sub(lambda m: str(self._max(rows, m.group(1))), str(where))
+        expr = []
+        pos = 0
+        while (pos < len(where)):
+            m = self.re_token.match(where, pos)
+            if (m is None):
+                if (where[pos:].strip() == ''):
+                    break
+                raise ExecuteError('ERROR 000358: Invalid expression %s' % (where))
+            pos = m.end()
+            if (m.group('num') is not None):
+                expr.append(m.group('num'))
+            elif (m.group('str') is not None):
+                expr.append(repr(m.group('str')[1:-1].replace("''", "'")))
+            elif (m.group('op') is not None):
+                op = m.group('op')
+                expr.append({'=' : '==', '<>' : '!='}.get(op, op))
+            else:
+                name = m.group('name').strip('"')
+                keyword = name.upper()
+                if (keyword in ('AND', 'OR', 'NOT', 'IN')):
+                    if (keyword == 'IN' and
+                        len(expr) > 0 and expr[-1] == 'not'):
+                        expr[-1] = 'not in'
+                        continue
+                    expr.append(keyword.lower())
+                elif (keyword == 'IS'):
+                    expr.append('is')
+                elif (keyword == 'NULL'):
+                    expr.append('None')
+                elif (keyword == 'LIKE'):
+                    if (len(expr) > 0 and expr[-1] == 'not'):
+                        expr[-1] = 'not in'
+                    else:
+                        expr.append('in')
+                    m = self.re_token.match(where, pos)
+                    if (m is None or m.group('str') is None):
+                        raise ExecuteError('ERROR 000358: Invalid expression %s' % (where))
+                    pos = m.end()
+                    expr.append('_like(%s)' % (repr(m.group('str')[1:-1].replace("''", "'"))))
+                else:
+                    expr.append('_v(%s)' % (repr(name.split('.')[-1].upper())))
+        source = ' '.join(expr)
+        try:
+            self.m_code = compile(source, '<where>', 'eval')
+        except SyntaxError:
+            raise ExecuteError('ERROR 000358: Invalid expression %s' % (where))
+
+    def _max(self, rows, field):
+        values = [r.get(field.upper()) for r in rows if r.get(field.upper()) is not None]
+        return max(values) if len(values) > 0 else 0
+
+    def match(self, row):
+        if (self.m_code is None):
+            return True
+        try:
+            return eval(self.m_code, {'_v' : row.__getitem__, '_like' : Like}) == True
+        except KeyError:
+            raise RuntimeError('A column was specified that does not exist.')
+        except TypeError:       # comparing None/mixed types, treated as no match as by SQL.
+            return False
+
+
+class Row(object):      # row of the (old-style) arcpy.SearchCursor/UpdateCursor
+    def __init__(self, values):
+        self.__dict__['m_values'] = dict(values)
+
+    def getValue(self, name):
+        return self.__dict__['m_values'].get(name.upper())
+
+    def setValue(self, name, value):
+        self.__dict__['m_values'][name.upper()] = value
+
+    def isNull(self, name):
+        return self.getValue(name) is None
+
+    def setNull(self, name):
+        self.setValue(name, None)
+
+    def __getattr__(self, name):
+        values = self.__dict__['m_values']
+        if ((name.upper() in values.keys()) == False):
+            raise AttributeError(name)
+        return values[name.upper()]
+
+    def __setattr__(self, name, value):
+        self.setValue(name, value)
+
+
+class Cursor(object):       # old-style cursors, rows are (Row) objects.
+    def __init__(self, backend, dataset, rows):
+        self.m_backend = backend
+        self.m_dataset = dataset
+        self.m_rows = rows
+        self.m_pos = 0
+        self.m_current = None
+
+    def __iter__(self):
+        row = self.next()
+        while (row is not None):
+            yield row
+            row = self.next()
+
+    def next(self):         # returns None past the last row.
+        if (self.m_pos >= len(self.m_rows)):
+            self.m_current = None
+            return None
+        self.m_current = self.m_rows[self.m_pos]
+        self.m_pos += 1
+        return Row(self.m_current)
+
+    def reset(self):
+        self.m_pos = 0
+
+    def updateRow(self, row):
+        if (self.m_current is None):
+            raise RuntimeError('No current row')
+        self.m_backend._updateRow(self.m_dataset, self.m_current, row.__dict__['m_values'])
+
+    def deleteRow(self, row = None):
+        if (self.m_current is None):
+            raise RuntimeError('No current row')
+        self.m_backend._deleteRows(self.m_dataset, [self.m_current])
+        self.m_current = None
+
+
+class DACursor(object):     # arcpy.da cursors, rows are tuples (search) or lists (update).
+    def __init__(self, backend, dataset, fields, rows, editable):
+        self.m_backend = backend
+        self.m_dataset = dataset
+        self.m_keys = fields
+        self.fields = tuple(fields)
+        self.m_rows = rows
+        self.m_pos = 0
+        self.m_editable = editable
+        self.m_current = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.m_rows = []
+        return False
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        if (self.m_pos >= len(self.m_rows)):
+            self.m_current = None
+            raise StopIteration
+        self.m_current = self.m_rows[self.m_pos]
+        self.m_pos += 1
+        values = [self.m_current.get(k.upper()) for k in self.m_keys]
+        return values if self.m_editable else tuple(values)
+
+    __next__ = next
+
+    def reset(self):
+        self.m_pos = 0
+
+    def updateRow(self, row):
+        if (self.m_current is None):
+            raise RuntimeError('No current row')
+        self.m_backend._updateRow(self.m_dataset, self.m_current, dict(zip([k.upper() for k in self.m_keys], row)))
+
+    def deleteRow(self):
+        if (self.m_current is None):
+            raise RuntimeError('No current row')
+        self.m_backend._deleteRows(self.m_dataset, [self.m_current])
+        self.m_current = None
+
+
+class InsertCursor(object):
+    def __init__(self, backend, dataset, fields):
+        self.m_backend = backend
+        self.m_dataset = dataset
+        self.m_keys = [f.upper() for f in fields]
+        self.fields = tuple(fields)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        return False
+
+    def insertRow(self, row):
+        return self.m_backend._insertRow(self.m_dataset, dict(zip(self.m_keys, row)))
+
+
+class DataAccess(object):       # arcpy.da
+    def __init__(self, backend):
+        self.m_backend = backend
+
+    def SearchCursor(self, in_table, field_names, where_clause = None, spatial_reference = None, explode_to_points = False, sql_clause = (None, None)):
+        return self.m_backend._daCursor(in_table, field_names, where_clause, sql_clause, False)
+
+    def UpdateCursor(self, in_table, field_names, where_clause = None, spatial_reference = None, explode_to_points = False, sql_clause = (None, None)):
+        return self.m_backend._daCursor(in_table, field_names, where_clause, sql_clause, True)
+
+    def InsertCursor(self, in_table, field_names):
+        (dataset, where) = self.m_backend._find(in_table)
+        return InsertCursor(self.m_backend, dataset, self.m_backend._getFieldNames(dataset, field_names))
+
+
+class MemoryBackend(object):
+    # Stands in for the arcpy module (see Base.LazyModule.setModule). Tools are plain functions with the
+    # ArcGIS parameter names so (DynaInvoke) resolves their signatures as it does for arcpy. Every tool call
+    # sleeps for the configured latency, (tool_latency) overrides it per tool name.
+
+    def __init__(self, latency = 0.0, tool_latency = None):
+        self.m_latency = latency
+        self.m_tool_latency = tool_latency if tool_latency is not None else {}
+        self.m_datasets = {}        # key -> {'name', 'path', 'type', 'fields' : [(name, type, length, alias)], 'rows' : [], 'next_oid'}
+        self.m_layers = {}          # layer name -> (dataset key, where_clause, join)
+        self.m_calls = {}           # tool name -> number of calls
+        self.m_messages = ''
+        self.m_tools = {}
+        self.m_changed = set()      # keys of the datasets created/edited/deleted, see (getChanges)
+
+        self.env = Env()
+        self.da = DataAccess(self)
+        self.ExecuteError = ExecuteError
+
+    # state
+    def getState(self):         # the datasets/layers, to seed the backend of a worker process.
+        return {'datasets' : self.m_datasets, 'layers' : self.m_layers}
+
+    def setState(self, state):
+        self.m_datasets = state['datasets']
+        self.m_layers = state['layers']
+
+    def getChanges(self):       # the datasets edited by a worker process, to merge back into the backend of the main process.
+        return {
+        'datasets' : dict([(k, self.m_datasets[k]) for k in self.m_changed if k in self.m_datasets]),
+        'deleted' : [k for k in self.m_changed if (k in self.m_datasets) == False],
+        'layers' : self.m_layers
+        }
+
+    def mergeChanges(self, changes):
+        self.m_datasets.update(changes['datasets'])
+        for key in changes['deleted']:
+            self.m_datasets.pop(key, None)
+        self.m_layers.update(changes['layers'])
+        self.m_changed.update(changes['datasets'].keys())
+        self.m_changed.update(changes['deleted'])
+
+    def _changed(self, dataset):
+        self.m_changed.add(getKey(dataset['path']))
+
+    def getStats(self):
+        items = sum([len(d['rows']) for d in self.m_datasets.values()])
+        return 'Memory backend: (%s) tool call(s), (%s) dataset(s), (%s) row(s)' % (sum(self.m_calls.values()), len(self.m_datasets), items)
+
+    # tool dispatch
+    def __getattr__(self, name):
+        if (name.startswith('m_') or
+            name.startswith('tool_') or
+            name.startswith('__')):
+            raise AttributeError(name)
+        if (name in self.m_tools):
+            return self.m_tools[name]
+        impl = getattr(self, 'tool_' + name, None)
+        if (impl is not None):
+            code = impl.__code__
+            varnames = list(code.co_varnames[1:code.co_argcount])     # skip (self)
+        elif (name in TOOL_SIGNATURES):
+            varnames = TOOL_SIGNATURES[name]
+        else:
+            raise AttributeError("'module' object has no attribute '%s'" % (name))
+        self.m_tools[name] = self._makeTool(name, varnames, impl)
+        return self.m_tools[name]
+
+    def _makeTool(self, name, varnames, impl):
+        source = 'def %s(%s):\n\treturn _call(%s, %s, [%s])\n' % (name, ', '.join(['%s=None' % (v) for v in varnames]), repr(name), repr(varnames), ', '.join(varnames))
+        space = {'_call' : self._call}
+        exec(source, space)
+        return space[name]
+
+    def _call(self, name, varnames, args):
+        self.m_calls[name] = self.m_calls.get(name, 0) + 1
+        latency = self.m_tool_latency.get(name, self.m_latency)
+        if (latency > 0):
+            time.sleep(latency)
+        impl = getattr(self, 'tool_' + name, None)
+        try:
+            if (impl is None):
+                ret = Result([args[0] if len(args) > 0 else ''])
+            else:
+                ret = impl(*args)
+        except ExecuteError as exp:
+            self.m_messages = 'Executing: %s\nERROR: %s\nFailed to execute (%s).' % (name, str(exp), name.split('_')[0])
+            raise
+        self.m_messages = 'Executing: %s\nSucceeded.' % (name)
+        return ret
+
+    # datasets
+    def _find(self, path, must_exist = True):       # returns (dataset, where_clause) for a dataset path or a layer.
+        name = str(path)
+        for suffix in ('/Footprint', '\\Footprint'):
+            if (name.endswith(suffix)):
+                name = name[:-len(suffix)]
+        if (name in self.m_layers):
+            layer = self.m_layers[name]
+            return (self.m_datasets[layer['dataset']], layer['where'])
+        key = getKey(name)
+        if (key in self.m_datasets):
+            return (self.m_datasets[key], None)
+        (folder, table) = os.path.split(key)
+        if (table.startswith('amd_') and table.endswith('_cat')):      # the catalog table of a mosaic dataset.
+            alias = os.path.join(folder, table[4:-4])
+            if (alias in self.m_datasets):
+                return (self.m_datasets[alias], None)
+        if (must_exist):
+            raise ExecuteError('ERROR 000732: Dataset %s does not exist or is not supported' % (path))
+        return (None, None)
+
+    def _create(self, path, type, fields):
+        dataset = {
+        'name' : os.path.basename(str(path).replace('\\', '/')),
+        'path' : str(path),
+        'type' : type,
+        'fields' : [list(f) + [f[0]] for f in fields],
+        'rows' : [],
+        'next_oid' : 1
+        }
+        self.m_datasets[getKey(path)] = dataset
+        self._changed(dataset)
+        return dataset
+
+    def _getField(self, dataset, name):
+        for field in dataset['fields']:
+            if (field[0].upper() == name.upper()):
+                return field
+        return None
+
+    def _getFieldNames(self, dataset, field_names):
+        if (isinstance(field_names, str)):
+            field_names = [f.strip() for f in field_names.split(';')]
+        names = []
+        for name in field_names:
+            if (name == '*'):
+                names.extend([f[0] for f in dataset['fields']])
+                continue
+            upper = name.upper()
+            if (upper == 'OID@'):
+                name = 'OBJECTID'
+            elif (upper.startswith('SHAPE@')):
+                name = 'Shape'
+            elif (self._getField(dataset, name) is None):
+                raise RuntimeError('A column was specified that does not exist.')
+            names.append(name)
+        return names
+
+    def _select(self, dataset, where_clause, layer_where = None, order_by = None):
+        rows = dataset['rows']
+        for where in (layer_where, where_clause):
+            if (isSet(where)):
+                clause = Where(where, dataset['rows'])
+                rows = [r for r in rows if clause.match(r)]
+        if (isSet(order_by)):
+            for part in reversed(str(order_by).replace(';', ',').split(',')):
+                values = part.split()
+                if (len(values) == 0):
+                    continue
+                key = values[0].upper()
+                desc = len(values) > 1 and values[1].upper() in ('D', 'DESC')
+                rows = sorted(rows, key = lambda r: (r.get(key) is not None, r.get(key)), reverse = desc)
+        return list(rows)
+
+    def _updateRow(self, dataset, row, values):
+        for key in values.keys():
+            if (key == 'OBJECTID'):
+                continue
+            if (self._getField(dataset, key) is None and
+                key != 'SHAPE'):
+                raise RuntimeError('A column was specified that does not exist.')
+            row[key] = values[key]
+        self._changed(dataset)
+
+    def _deleteRows(self, dataset, rows):
+        ids = set([id(r) for r in rows])
+        dataset['rows'] = [r for r in dataset['rows'] if (id(r) in ids) == False]
+        self._changed(dataset)
+
+    def _insertRow(self, dataset, values):
+        row = dict([(f[0].upper(), None) for f in dataset['fields']])
+        row.update(values)
+        row['OBJECTID'] = dataset['next_oid']
+        dataset['next_oid'] += 1
+        dataset['rows'].append(row)
+        self._changed(dataset)
+        return row['OBJECTID']
+
+    def _daCursor(self, in_table, field_names, where_clause, sql_clause, editable):
+        (dataset, where) = self._find(in_table)
+        fields = self._getFieldNames(dataset, field_names)
+        order_by = None
+        if (sql_clause is not None and
+            len(sql_clause) > 1 and
+            isSet(sql_clause[1])):
+            order_by = re.sub(r'(?i)^\s*ORDER\s+BY\s+', '', sql_clause[1])
+        return DACursor(self, dataset, fields, self._select(dataset, where_clause, where, order_by), editable)
+
+    def _oldCursor(self, dataset, where_clause, sort_fields):
+        (dataset, where) = self._find(dataset)
+        order_by = None
+        if (isSet(sort_fields)):
+            order_by = ','.join([p.replace(' D', ' DESC').replace(' A', ' ASC') for p in str(sort_fields).split(';')])
+        return Cursor(self, dataset, self._select(dataset, where_clause, where, order_by))
+
+    # module functions
+    def Exists(self, dataset):
+        (found, where) = self._find(dataset, False)
+        if (found is not None):
+            return True
+        return (str(dataset).lower().find('.gdb') == -1 and
+                str(dataset).lower().find('.sde') == -1 and
+                os.path.exists(str(dataset)))
+
+    def Describe(self, value):
+        if (str(value).lower().endswith('.sde')):
+            return Describe({'name' : os.path.basename(str(value)), 'path' : str(value), 'type' : 'Workspace', 'fields' : []})
+        (dataset, where) = self._find(value)
+        return Describe(dataset)
+
+    def ListFields(self, dataset, wild_card = None, field_type = None):
+        (found, where) = self._find(dataset)
+        fields = []
+        for field in found['fields']:
+            if (isSet(wild_card) and
+                fnmatch.fnmatch(field[0].lower(), str(wild_card).lower()) == False):
+                continue
+            if (isSet(field_type) and
+                str(field_type).lower() != 'all' and
+                field[1].lower() != str(field_type).lower()):
+                continue
+            fields.append(Field(*field))
+        return fields
+
+    def GetInstallInfo(self, product = None):
+        if (sys.version_info[0] >= 3):
+            return {'ProductName' : 'ArcGISPro', 'Version' : '2.5', 'BuildNumber' : '22081', 'SPNumber' : 'N/A', 'InstallDir' : ''}
+        return {'ProductName' : 'Desktop', 'Version' : '10.5', 'BuildNumber' : '6491', 'SPNumber' : 'N/A', 'InstallDir' : ''}
+
+    def GetMessages(self, severity = None):
+        return self.m_messages
+
+    def AddMessage(self, message):
+        pass
+
+    def AddWarning(self, message):
+        pass
+
+    def AddError(self, message):
+        pass
+
+    def SearchCursor(self, dataset, where_clause = None, spatial_reference = None, fields = None, sort_fields = None):
+        return self._oldCursor(dataset, where_clause, sort_fields)
+
+    def UpdateCursor(self, dataset, where_clause = None, spatial_reference = None, fields = None, sort_fields = None):
+        return self._oldCursor(dataset, where_clause, sort_fields)
+
+    # simulated tools
+    def tool_CreateFileGDB_management(self, out_folder_path, out_name, out_version):
+        name = str(out_name)
+        if (name.lower().endswith('.gdb') == False):
+            name += '.gdb'
+        path = os.path.join(str(out_folder_path), name)
+        if (getKey(path) in self.m_datasets):
+            raise ExecuteError('ERROR 000258: Output %s already exists' % (path))
+        self._create(path, 'Workspace', [])
+        return Result([path])
+
+    def tool_CreateMosaicDataset_management(self, in_workspace, in_mosaicdataset_name, coordinate_system, num_bands, pixel_type, product_definition, product_band_definitions):
+        path = os.path.join(str(in_workspace), str(in_mosaicdataset_name))
+        if (getKey(path) in self.m_datasets):
+            raise ExecuteError('ERROR 000258: Output %s already exists' % (path))
+        self._create(path, 'MosaicDataset', CATALOG_FIELDS)
+        return Result([path])
+
+    def tool_CreateReferencedMosaicDataset_management(self, in_dataset, out_mosaic_dataset, coordinate_system, number_of_bands, pixel_type, where_clause, in_template_dataset, extent, select_using_features, lod_field, minPS_field, maxPS_field, pixelSize, build_boundary):
+        (source, where) = self._find(in_dataset)
+        target = self._create(out_mosaic_dataset, 'MosaicDataset', CATALOG_FIELDS)
+        for row in self._select(source, where_clause, where):
+            self._insertRow(target, dict([(k, row[k]) for k in row.keys() if self._getField(target, k) is not None]))
+        return Result([out_mosaic_dataset])
+
+    def tool_DeleteMosaicDataset_management(self, in_mosaic_dataset, delete_overview_images, delete_item_cache):
+        (dataset, where) = self._find(in_mosaic_dataset)
+        del self.m_datasets[getKey(dataset['path'])]
+        self._changed(dataset)
+        return Result([in_mosaic_dataset])
+
+    def tool_Delete_management(self, in_data, data_type):
+        if (str(in_data) in self.m_layers):
+            del self.m_layers[str(in_data)]
+            return Result([in_data])
+        (dataset, where) = self._find(in_data)
+        del self.m_datasets[getKey(dataset['path'])]
+        self._changed(dataset)
+        return Result([in_data])
+
+    def tool_MakeMosaicLayer_management(self, in_mosaic_dataset, out_mosaic_layer, where_clause, template, band_index, mosaic_method, order_field, order_base_value, lock_rasterid, sort_order, mosaic_operator, cell_size):
+        (dataset, where) = self._find(in_mosaic_dataset)
+        self.m_layers[str(out_mosaic_layer)] = {'dataset' : getKey(dataset['path']), 'where' : where_clause if isSet(where_clause) else None}
+        return Result([out_mosaic_layer])
+
+    def tool_GetCount_management(self, in_rows):
+        (dataset, where) = self._find(in_rows)
+        return Result([str(len(self._select(dataset, None, where)))])
+
+    def tool_AddRastersToMosaicDataset_management(self, in_mosaic_dataset, raster_type, input_path, update_cellsize_ranges, update_boundary, update_overviews, maximum_pyramid_levels, maximum_cell_size, minimum_dimension, spatial_reference, filter, sub_folder, duplicate_items_action, build_pyramids, calculate_statistics, build_thumbnails, operation_description, force_spatial_reference, estimate_statistics, aux_inputs):
+        (dataset, where) = self._find(in_mosaic_dataset)
+        recursive = str(sub_folder).upper() != 'NO_SUBFOLDERS'
+        action = str(duplicate_items_action).upper() if isSet(duplicate_items_action) else 'ALLOW_DUPLICATES'
+        pattern = str(filter) if isSet(filter) else '*'
+        existing = dict([(r.get('URI'), r) for r in dataset['rows']])
+        files = []
+        for path in str(input_path).split(';'):
+            path = path.strip()
+            if (os.path.isfile(path)):
+                files.append(path)
+                continue
+            for (root, dirs, names) in os.walk(path):
+                if (recursive == False):
+                    del dirs[:]
+                for name in sorted(names):
+                    if (fnmatch.fnmatch(name.lower(), pattern.lower())):
+                        files.append(os.path.join(root, name))
+        for path in files:
+            if (path in existing and
+                action != 'ALLOW_DUPLICATES'):
+                if (action == 'EXCLUDE_DUPLICATES'):
+                    continue
+                self._deleteRows(dataset, [existing[path]])
+            name = os.path.splitext(os.path.basename(path))[0]
+            self._insertRow(dataset, {
+            'RASTER' : path, 'NAME' : name, 'GROUPNAME' : name, 'PRODUCTNAME' : '', 'CATEGORY' : 1, 'TAG' : 'Dataset',
+            'MINPS' : 0.0, 'MAXPS' : 0.0, 'LOWPS' : 0.0, 'HIGHPS' : 0.0, 'TYPEID' : 1, 'ITEMTS' : time.time(),
+            'URI' : path, 'URIHASH' : hashlib.md5(path.encode('utf-8')).hexdigest()
+            })
+        return Result([in_mosaic_dataset])
+
+    def tool_RemoveRastersFromMosaicDataset_management(self, in_mosaic_dataset, where_clause, update_boundary, mark_overviews_items, delete_overview_images, delete_item_cache, remove_items, update_cellsize_ranges):
+        (dataset, where) = self._find(in_mosaic_dataset)
+        self._deleteRows(dataset, self._select(dataset, where_clause, where))
+        return Result([in_mosaic_dataset])
+
+    def tool_BuildSeamlines_management(self, in_mosaic_dataset, cell_size, sort_method, sort_order, order_by_attribute, order_by_base_value, view_point, computation_method, blend_width, blend_type, request_size, request_size_type, blend_width_units, area_of_interest, where_clause, update_existing):
+        (dataset, where) = self._find(in_mosaic_dataset)
+        path = os.path.join(os.path.dirname(dataset['path']), 'AMD_%s_SML' % (dataset['name']))
+        seamlines = self._create(path, 'FeatureClass', [('OBJECTID', 'OID', 4), ('Shape', 'Geometry', 0), ('RasterID', 'Integer', 4), ('Name', 'String', 50),
+        ('BlendWidthUnits', 'Integer', 4), ('BlendType', 'Integer', 4), ('BlendWidth', 'Double', 8), ('ItemHash', 'String', 50), ('Shape_Length', 'Double', 8), ('Shape_Area', 'Double', 8)])
+        for row in self._select(dataset, where_clause, where):
+            self._insertRow(seamlines, {'RASTERID' : row['OBJECTID'], 'NAME' : row.get('NAME')})
+        return Result([in_mosaic_dataset])
+
+    def tool_AddField_management(self, in_table, field_name, field_type, field_precision, field_scale, field_length, field_alias, field_is_nullable, field_is_required, field_domain):
+        (dataset, where) = self._find(in_table)
+        if (self._getField(dataset, str(field_name)) is not None):
+            return Result([in_table])       # ArcGIS warns (000012) and continues.
+        length = int(field_length) if isSet(field_length) else (255 if str(field_type).upper() == 'TEXT' else 0)
+        dataset['fields'].append([str(field_name), FIELD_TYPES.get(str(field_type).upper(), str(field_type)), length, field_alias if isSet(field_alias) else str(field_name)])
+        for row in dataset['rows']:
+            row[str(field_name).upper()] = None
+        self._changed(dataset)
+        return Result([in_table])
+
+    def tool_AddFields_management(self, in_table, field_description):     # ArcGIS Pro 2.5+, [[name, type, alias, length, default, domain], ..]
+        for field in field_description:
+            field = list(field) + [''] * (6 - len(field))
+            self.tool_AddField_management(in_table, field[0], field[1], '', '', field[3], field[2], '', '', field[5])
+        return Result([in_table])
+
+    def tool_DeleteField_management(self, in_table, drop_field):
+        (dataset, where) = self._find(in_table)
+        names = drop_field if isinstance(drop_field, (list, tuple)) else str(drop_field).split(';')
+        names = [n.strip().upper() for n in names if n.strip() != '']
+        dataset['fields'] = [f for f in dataset['fields'] if (f[0].upper() in names) == False or f[1] == 'OID']
+        for row in dataset['rows']:
+            for name in names:
+                if (name != 'OBJECTID'):
+                    row.pop(name, None)
+        self._changed(dataset)
+        return Result([in_table])
+
+    def tool_CalculateField_management(self, in_table, field, expression, expression_type, code_block):
+        (dataset, where) = self._find(in_table)
+        target = str(field).split('.')[-1]
+        if (self._getField(dataset, target) is None):
+            raise ExecuteError('ERROR 000728: Field %s does not exist within table' % (field))
+        expr_type = str(expression_type).upper() if isSet(expression_type) else 'VB'
+        expr = str(expression)
+        space = {}
+        if (expr_type.startswith('PYTHON')):
+            expr = re.sub(r'!([^!]+)!', lambda m: '_v(%s)' % (repr(m.group(1).split('.')[-1].upper())), expr)
+            if (isSet(code_block)):
+                exec(str(code_block), space)
+        else:
+            expr = re.sub(r'\[([^\]]+)\]', lambda m: '_v(%s)' % (repr(m.group(1).split('.')[-1].upper())), expr).replace(' & ', ' + ')
+        try:
+            code = compile(expr, '<expression>', 'eval')
+        except SyntaxError:
+            raise ExecuteError('ERROR 000539: Invalid expression %s' % (expression))
+        for row in self._select(dataset, None, where):
+            space['_v'] = row.__getitem__
+            try:
+                row[target.upper()] = eval(code, space)
+            except Exception as exp:
+                raise ExecuteError('ERROR 000539: %s' % (str(exp)))
+        self._changed(dataset)
+        return Result([in_table])
+
+    def tool_JoinField_management(self, in_data, in_field, join_table, join_field, fields):
+        (target, where) = self._find(in_data)
+        (source, source_where) = self._find(join_table)
+        if (isSet(fields)):
+            names = fields if isinstance(fields, (list, tuple)) else str(fields).split(';')
+        else:
+            names = [f[0] for f in source['fields'] if f[1] not in ('OID', 'Geometry')]
+        names = [n for n in names if self._getField(source, n) is not None]
+        lookup = {}
+        for row in source['rows']:
+            key = row.get(str(join_field).upper())
+            if ((key in lookup) == False):
+                lookup[key] = row
+        for name in names:
+            if (self._getField(target, name) is None):
+                field = self._getField(source, name)
+                target['fields'].append(list(field))
+        for row in target['rows']:
+            match = lookup.get(row.get(str(in_field).upper()))
+            for name in names:
+                row[name.upper()] = match.get(name.upper()) if match is not None else None
+        self._changed(target)
+        return Result([in_data])
+
+    def tool_FeatureClassToFeatureClass_conversion(self, in_features, out_path, out_name, where_clause, field_mapping, config_keyword):
+        (source, where) = self._find(in_features)
+        path = os.path.join(str(out_path), str(out_name))
+        if (getKey(path) in self.m_datasets):
+            raise ExecuteError('ERROR 000258: Output %s already exists' % (path))
+        target = self._create(path, 'FeatureClass', [f[:3] for f in source['fields']])
+        for row in self._select(source, where_clause, where):
+            target['rows'].append(dict(row))
+        target['next_oid'] = source['next_oid']
+        self._changed(target)
+        return Result([path])
@@ -22,12 +22,76 @@
 
 import os
 import sys
-import arcpy
+import time
+import json
+import tempfile
+import importlib
+
+class LazyModule(object):
+    # Stands in for a module that's slow to import (arcpy) and imports it on the first attribute access,
+    # so code paths that never call a geoprocessing tool (usage, config validation) don't pay for it.
+    def __init__(self, name):
+        self.__dict__['m_name'] = name
+        self.__dict__['m_module'] = None
+        self.__dict__['m_load_time'] = -1
+        self.__dict__['m_source'] = name
+
+    def isLoaded(self):
+        return self.__dict__['m_module'] is not None
+
+    def load(self):
+        if (self.__dict__['m_module'] is None):
+            t0 = time.time()
+            self.__dict__['m_module'] = importlib.import_module(self.__dict__['m_name'])
+            self.__dict__['m_load_time'] = time.time() - t0
+        return self.__dict__['m_module']
+
+    def getLoadTime(self):       # in seconds, -1 if not loaded yet.
+        return self.__dict__['m_load_time']
+
+    def setModule(self, module, source):     # use (module) instead of importing, i.e. the in-memory backend to run without ArcGIS.
+        self.__dict__['m_module'] = module
+        self.__dict__['m_source'] = source
+        self.__dict__['m_load_time'] = 0
+        g_tool_cache.reset()        # the resolved tools belong to the previous module.
+
+    def getSource(self):
+        return self.__dict__['m_source']
+
+    def reset(self):        # back to the (lazily imported) real module after (setModule).
+        if (self.__dict__['m_source'] == self.__dict__['m_name']):
+            return
+        self.__dict__['m_module'] = None
+        self.__dict__['m_source'] = self.__dict__['m_name']
+        self.__dict__['m_load_time'] = -1
+        g_tool_cache.reset()
+
+    def __getattr__(self, name):
+        attr = getattr(self.load(), name)
+        if (g_metrics is not None and
+            isGPToolName(name) and
+            callable(attr)):
+            return g_metrics.wrap('%s.%s' % (self.__dict__['m_name'], name), attr)
+        return attr
+
+    def __setattr__(self, name, value):
+        setattr(self.load(), name, value)
+
+def isGPToolName(name):        # e.g. AddField_management, StageService_server
+    return (name[:1].isupper() and
+            name.find('_') > 0)
+
+g_metrics = None            # set to a (metrics.Metrics) to time the GP tool calls.
+
+arcpy = LazyModule('arcpy')
 
-if (sys.version_info[0] < 3):           # _winreg has been renamed as (winreg) in python3+
-    from _winreg import *
-else:
-    from winreg import *
+try:
+    if (sys.version_info[0] < 3):           # _winreg has been renamed as (winreg) in python3+
+        from _winreg import *
+    else:
+        from winreg import *
+except ImportError:         # not on Windows, the patch check then relies on the installed version only.
+    pass
 
 from datetime import datetime
 
@@ -38,6 +102,333 @@ try:
 except Exception as inf:
     print ('User-Code functions disabled.')
 
+class ToolCache:
+    # Resolves GP tool names (e.g. arcpy.BuildBoundary_management) to their callables once per process and keeps
+    # their parameter names, count and defaults so invoking a tool needs no eval/reflection per call.
+    # Signatures (not the callables) could be persisted (save/load) to be reused by later runs.
+    CTOOL_CACHE_VERSION = 1
+
+    def __init__(self):
+        self.m_tools = {}           # name -> {'fnc', 'varnames', 'keys', 'argcount', 'defaults'}
+        self.m_signatures = {}      # name -> {'varnames', 'defaults'}, persisted part.
+        self.m_dirty = False
+        self.m_hits = 0
+        self.m_resolved = 0
+
+    def reset(self):        # drops the callables/signatures of the tools resolved so far, i.e. once (arcpy) is swapped for another backend.
+        self.m_tools = {}
+        self.m_signatures = {}
+        self.m_dirty = False
+
+    def _key(self):         # signatures are only reused by the same python (ArcGIS Desktop/Pro) install.
+        return '%s|%s|%s|%s' % (self.CTOOL_CACHE_VERSION, sys.executable, sys.version, arcpy.getSource())
+
+    def _resolve(self, name):
+        parts = name.split('.')
+        if (parts[0] in globals()):
+            obj = globals()[parts[0]]
+            if (isinstance(obj, LazyModule)):
+                obj = obj.load()        # the tool itself, not a (metrics) wrapper.
+        else:
+            obj = importlib.import_module(parts[0])
+        for part in parts[1:]:
+            obj = getattr(obj, part)
+        return obj
+
+    def _jsonValue(self, v):
+        if (v is None or
+            isinstance(v, (bool, int, float, str))):
+            return v
+        return str(v)
+
+    def getSignature(self, name):       # returns {'varnames', 'defaults'}, doesn't resolve the callable if the signature is already known.
+        name = name.strip()
+        if (name in self.m_tools):
+            return self.m_tools[name]
+        if (name in self.m_signatures):
+            return self.m_signatures[name]
+        return self.get(name)
+
+    def get(self, name):
+        name = name.strip()
+        if (name in self.m_tools):
+            self.m_hits += 1
+            return self.m_tools[name]
+        fnc = self._resolve(name)
+        if (name in self.m_signatures):
+            varnames = self.m_signatures[name]['varnames']
+            defaults = self.m_signatures[name]['defaults']
+        else:
+            code = fnc.__code__
+            varnames = list(code.co_varnames[:code.co_argcount])
+            defaults = [self._jsonValue(v) for v in (fnc.__defaults__ or ())]
+            self.m_signatures[name] = {'varnames' : varnames, 'defaults' : defaults}
+            self.m_dirty = True
+        self.m_tools[name] = {
+        'fnc' : fnc,
+        'varnames' : varnames,
+        'keys' : [v.lower() for v in varnames],     # names as used by the process info blocks.
+        'argcount' : len(varnames),
+        'defaults' : defaults
+        }
+        self.m_resolved += 1
+        return self.m_tools[name]
+
+    def load(self, path):
+        try:
+            if (os.path.exists(path) == False):
+                return False
+            with open(path, 'r') as reader:
+                cache = json.load(reader)
+            if (cache['key'] != self._key()):
+                return False
+            self.m_signatures.update(cache['tools'])
+            return True
+        except:
+            return False
+
+    def save(self, path):
+        if (self.m_dirty == False):
+            return True
+        try:
+            folder = os.path.dirname(path)
+            if (folder != '' and
+                os.path.exists(folder) == False):
+                os.makedirs(folder)
+            with open(path, 'w') as writer:
+                json.dump({'key' : self._key(), 'tools' : self.m_signatures}, writer)
+            self.m_dirty = False
+            return True
+        except:
+            return False
+
+    def getStats(self):
+        return 'Tool cache: (%s) tool(s) resolved, (%s) cached lookups, (%s) known signatures' % \
+        (self.m_resolved, self.m_hits, len(self.m_signatures))
+
+g_tool_cache = ToolCache()      # per process.
+
+class EnvironmentProbe:
+    # Install info (arcpy.GetInstallInfo), the desktop version and the installed patches (registry) are read once per
+    # process. They could be persisted (save/load) for batch/daemon runs, the key changes with the python/ArcGIS install.
+    CENV_PROBE_VERSION = 1
+
+    def __init__(self):
+        self.m_values = {}          # arcpy source -> {'install_info', 'version', 'patches' : {product key : [patch names]}}
+        self.m_loaded = {}          # arcpy source -> True if the values came from disk.
+        self.m_dirty = False
+
+    def _getInstallStamp(self):     # mtime of the arcpy package, changes when ArcGIS gets upgraded/re-installed.
+        try:
+            if (sys.version_info[0] >= 3):
+                import importlib.util
+                spec = importlib.util.find_spec('arcpy')
+                origin = spec.origin if spec is not None else ''
+            else:
+                import imp
+                origin = imp.find_module('arcpy')[1]
+            return '%s:%s' % (origin, os.path.getmtime(origin))
+        except:
+            return ''
+
+    def _key(self):
+        stamp = self._getInstallStamp() if arcpy.getSource() == 'arcpy' else ''
+        return '%s|%s|%s|%s|%s' % (self.CENV_PROBE_VERSION, sys.executable, sys.version, arcpy.getSource(), stamp)
+
+    def _get(self):
+        source = arcpy.getSource()
+        if ((source in self.m_values.keys()) == False):
+            self.m_values[source] = {'patches' : {}}
+        return self.m_values[source]
+
+    def getInstallInfo(self):
+        values = self._get()
+        if (('install_info' in values.keys()) == False):
+            values['install_info'] = dict(arcpy.GetInstallInfo())
+            self.m_dirty = True
+        return values['install_info']
+
+    def getDesktopVersion(self):        # [major, minor, sp, build]
+        values = self._get()
+        if (('version' in values.keys()) == False):
+            values['version'] = self._getDesktopVersion(self.getInstallInfo())
+            self.m_dirty = True
+        return list(values['version'])
+
+    def _getDesktopVersion(self, d):
+
+        version = []
+
+        buildNumber = 0
+        spNumber = 0
+
+        CVERSION = 'version'
+        CBUILDNUMBER = 'buildnumber'
+        CSPNUMBER = 'spnumber'
+
+        ValError = False
+
+        for k in d:
+            key = k.lower()
+            if (key == CVERSION or
+                key == CBUILDNUMBER or
+                key == CSPNUMBER):
+                try:
+                    if (key == CVERSION):
+                        [version.append(int(x)) for x in d[k].split(".")]
+                    elif (key == CBUILDNUMBER):
+                        buildNumber = int(d[k])
+                    elif (key == CSPNUMBER):
+                        spNumber = int(d[k])        # could be N/A
+                except:
+                    ValError = True
+
+        CMAJOR_MINOR_REVISION = 3
+        if (len(version) < CMAJOR_MINOR_REVISION):  # On a system with full-install, ArcGIS version piece of information could return 3 numbers (major, minor, revision/SP)
+            version.append(spNumber)                # and thus the SP number shouldn't be added to the version sperately.
+        version.append(buildNumber)
+
+        return version
+
+    def getPatches(self, key, refresh = False):      # names of the updates installed for the product (key), e.g. Desktop10.2
+        values = self._get()
+        if (refresh or
+            (key in values['patches'].keys()) == False):
+            values['patches'][key] = self._readPatches(key)
+            self.m_loaded.pop(arcpy.getSource(), None)       # read live now.
+            self.m_dirty = True
+        return values['patches'][key]
+
+    def getValue(self, name, fnc):      # memoizes the result of an environment check (fnc), e.g. is101SP1
+        values = self._get()
+        if (('checks' in values.keys()) == False):
+            values['checks'] = {}
+        if ((name in values['checks'].keys()) == False):
+            values['checks'][name] = fnc()
+            self.m_dirty = True
+        return values['checks'][name]
+
+    def isLoaded(self):
+        return arcpy.getSource() in self.m_loaded.keys()
+
+    def _readPatches(self, key):
+        patches = []
+        try:
+            reg_path = "Software\\Wow6432Node\\ESRI\\%s\\Updates" % (key)
+            arcgis = OpenKey(
+                HKEY_LOCAL_MACHINE, reg_path)
+
+            i = 0
+            while 1:
+                name = EnumKey(arcgis, i)
+                try:
+                    arcgis_sub = OpenKey(arcgis, name)      # relative to the open (Updates) key.
+                    value, type = QueryValueEx(arcgis_sub, "Name")
+                    if (type == 1):   # reg_sz
+                        patches.append(value)
+                except:
+                    pass
+                i += 1
+        except:
+            pass
+        return patches
+
+    def load(self, path):
+        try:
+            if (os.path.exists(path) == False):
+                return False
+            with open(path, 'r') as reader:
+                cache = json.load(reader)
+            if (cache['key'] != self._key()):
+                return False
+            self.m_values[arcpy.getSource()] = cache['values']
+            self.m_loaded[arcpy.getSource()] = True
+            return True
+        except:
+            return False
+
+    def save(self, path):
+        if (self.m_dirty == False or
+            (arcpy.getSource() in self.m_values.keys()) == False):
+            return True
+        try:
+            folder = os.path.dirname(path)
+            if (folder != '' and
+                os.path.exists(folder) == False):
+                os.makedirs(folder)
+            with open(path, 'w') as writer:
+                json.dump({'key' : self._key(), 'values' : self.m_values[arcpy.getSource()]}, writer)
+            self.m_dirty = False
+            return True
+        except:
+            return False
+
+g_env_probe = EnvironmentProbe()        # per process.
+
+class LockWatcher:
+    # Waits for the file geodatabase lock files (<table>.<host>.<pid>.<id>.<type>.lock) of a process to go, polling with
+    # a backoff so waiting processes don't compete with the geoprocessing for CPU. The names are parsed from the right
+    # as host names could contain dots.
+    CPOLL_MIN = 0.05        # seconds
+    CPOLL_MAX = 1.0
+    CSHARED_TYPES = ['sr', 'rd']        # shared schema/read locks, held by any open dataset reference.
+
+    def __init__(self, folder_path, pid = None, schema = False):
+        self.m_folder = folder_path
+        self.m_pid = os.getpid() if pid is None else pid       # (0) for the locks of any process.
+        self.m_schema = schema      # only the exclusive/edit locks of processes other than (pid) block a schema change.
+        self.m_found = []
+
+    def parseLockName(self, name):      # returns {'table', 'host', 'ids', 'type'} or None if (name) isn't a lock file.
+        if (name[-5:].lower() != '.lock'):
+            return None
+        parts = name[:-5].split('.')
+        if (len(parts) < 3):
+            return None
+        ids = []
+        i = len(parts) - 2      # skip the lock type, e.g. (sr, rd, ed, wr)
+        while (i > 0 and
+               parts[i].isdigit()):
+            ids.insert(0, int(parts[i]))
+            i -= 1
+        return {
+        'table' : parts[0],
+        'host' : '.'.join(parts[1:i + 1]),
+        'ids' : ids,        # process id followed by the thread/connection id.
+        'type' : parts[-1]
+        }
+
+    def hasLocks(self):
+        self.m_found = []
+        try:
+            names = os.listdir(self.m_folder)
+        except OSError:
+            return False
+        for name in names:
+            lock = self.parseLockName(name)
+            if (lock is None):
+                continue
+            owned = self.m_pid == 0 or self.m_pid in lock['ids']
+            if (self.m_schema):
+                if (owned or
+                    lock['type'].lower() in self.CSHARED_TYPES):
+                    continue
+                self.m_found.append(name)
+            elif (owned):
+                self.m_found.append(name)
+        return len(self.m_found) > 0
+
+    def wait(self, timeout):        # returns the seconds waited (int) or -1 on timeout.
+        t0 = time.time()
+        delay = self.CPOLL_MIN
+        while (self.hasLocks()):
+            elapsed = time.time() - t0
+            if (elapsed >= timeout):
+                return -1
+            time.sleep(min(delay, timeout - elapsed))
+            delay = min(delay * 2, self.CPOLL_MAX)
+        return int(time.time() - t0)
+
 class DynaInvoke:
     # log status types enums
     const_general_text = 0
@@ -50,13 +441,15 @@ class DynaInvoke:
         self.m_args = args
         self.m_evnt_update_args =  evnt_fnc_update_args
         self.m_log = log
+        self.m_tool = None
     def _message(self, msg, msg_type):
         if (self.m_log):
             return self.m_log(msg, msg_type)
         print (msg)
     def init(self):
         try:
-            arg_count = eval('%s.__code__.co_argcount' % (self.m_name))
+            self.m_tool = g_tool_cache.get(self.m_name)
+            arg_count = self.m_tool['argcount']
         except Exception as exp:
             self._message(str(exp), self.const_critical_text)
             return False
@@ -81,7 +474,10 @@ class DynaInvoke:
                         self._message ('Original args may have been updated through custom code.', self.const_warning_text)
                         self.m_args = usr_args
             self._message ('Calling (%s)' % (self.m_name), self.const_general_text)
-            ret = eval ('%s(*self.m_args)' % (self.m_name))     # gp-tools return NULL?
+            if (g_metrics is not None):
+                ret = g_metrics.wrap(self.m_name.strip(), self.m_tool['fnc'])(*self.m_args)
+            else:
+                ret = self.m_tool['fnc'](*self.m_args)     # gp-tools return NULL?
             return True
         except Exception as exp:
             result = 'FAILED'
@@ -90,6 +486,334 @@ class DynaInvoke:
         finally:
             self._message ('Status: %s' % (result), self.const_general_text)
 
+class ConfigIndex:
+    # Indexes the config DOM in a single pass so lookups by tag name or element path needn't scan
+    # the whole tree. The index refers to the DOM nodes, values are always read from the (live) nodes.
+    def __init__(self, doc):
+        self.m_doc = doc
+        self.m_paths = {}
+        self.m_tags = {}
+        self.m_children = {}
+        self.m_elements = []
+        self.m_build_time = 0
+        self.m_lookups = 0
+        self.m_lookup_time = 0
+        self.build()
+        doc.m_config_index = self
+
+    def build(self):
+        t0 = time.time()
+        self.m_paths = {}
+        self.m_tags = {}
+        self.m_children = {}
+        self.m_elements = []
+        stack = [(n, '') for n in reversed(self.m_doc.childNodes) if n.nodeType == minidom.Node.ELEMENT_NODE]
+        while (len(stack) > 0):
+            (node, parent_path) = stack.pop()
+            path = node.nodeName if parent_path == '' else parent_path + '/' + node.nodeName
+            self.m_paths.setdefault(path, []).append(node)
+            self.m_tags.setdefault(node.nodeName, []).append(node)
+            self.m_elements.append(node)
+            children = [n for n in node.childNodes if n.nodeType == minidom.Node.ELEMENT_NODE]
+            self.m_children[node] = children
+            for child in reversed(children):
+                stack.append((child, path))
+        self.m_build_time = time.time() - t0
+        return True
+
+    def _lookup(self, table, key):
+        t0 = time.time()
+        if (key == '*' and
+            table is self.m_tags):
+            nodes = self.m_elements
+        else:
+            nodes = table[key] if key in table else []
+        self.m_lookups += 1
+        self.m_lookup_time += time.time() - t0
+        return nodes
+
+    def getNodes(self, tag):            # same as (getElementsByTagName), document order.
+        return self._lookup(self.m_tags, tag)
+
+    def getPathNodes(self, path):       # path, e.g. Application/Workspace/MosaicDataset/Name
+        return self._lookup(self.m_paths, path)
+
+    def getChildElements(self, node):
+        if (node in self.m_children):
+            return self.m_children[node]
+        return [n for n in node.childNodes if n.nodeType == minidom.Node.ELEMENT_NODE]
+
+    def getStats(self):
+        return 'Config index: (%s) elements indexed in (%.1f) ms, (%s) lookups in (%.1f) ms' % \
+        (len(self.m_elements), self.m_build_time * 1000, self.m_lookups, self.m_lookup_time * 1000)
+
+class ConfigTemplate:
+    # Compiles the ($NAME$ / default;$NAME$) placeholders of the config text nodes once, so the
+    # dynamic values can be applied (or rendered for many sets of values) in a single linear pass.
+    # Tokens are ('l', text) for literals and ('v', name, whole) for variables where (whole) is True
+    # if the variable is the only content of the value (the default value is used if not defined).
+    def __init__(self, doc, elements = None):
+        self.m_doc = doc
+        self.m_entries = []         # (node, default, tokens) for text nodes with placeholders only.
+        self.m_compile_time = 0
+        self.compile(elements if elements is not None else doc.getElementsByTagName('*'))
+        doc.m_config_template = self
+
+    def compileValue(self, v):
+        usr_key = v
+        default = ''
+
+        d = v.split(';')
+        if (len(d) > 1):
+            default = d[0].strip()
+            usr_key = d[1].strip()
+
+        tokens = []
+        first = usr_key.find('$') + 1
+        second = first + usr_key[first + 1:].find('$') + 1
+
+        if (first > 1):
+            tokens.append(('l', usr_key[0:first - 1]))
+
+        while (second >= 0):
+            tokens.append(('v', usr_key[first:second], first == 1 and second == (len(usr_key) - 1)))
+            first = second + 1
+            indx = usr_key[first + 1:].find('$')
+            if (indx == -1):
+                if (first != len(usr_key)):
+                    tokens.append(('l', usr_key[first:len(usr_key)]))
+                break
+            second = first + indx + 1
+
+        return (default, tokens)
+
+    def compile(self, elements):
+        t0 = time.time()
+        self.m_entries = []
+        for node in elements:
+            text = node.firstChild
+            if (text is None or
+                text.nodeType != minidom.Node.TEXT_NODE):
+                continue
+            v = text.data.strip()
+            if (v.find('$') == -1):
+                continue
+            (default, tokens) = self.compileValue(v)
+            self.m_entries.append((text, default, tokens))
+        self.m_compile_time = time.time() - t0
+        return True
+
+    def renderValue(self, default, tokens, params):
+        revalue = []
+        for token in tokens:
+            if (token[0] == 'l'):
+                revalue.append(token[1])
+                continue
+            uValue = token[1]
+            if (uValue.upper() in params):
+                revalue.append(params[uValue.upper()])
+                continue
+            if (uValue.find('\\$') >= 0):
+                uValue = uValue.replace('\\$', '$')
+            else:
+                if (default == ''):
+                    default = uValue
+                if (token[2]):
+                    uValue = default
+            revalue.append(uValue)
+        return ''.join(revalue)
+
+    def render(self, params):           # returns the values in the order of (m_entries), the DOM isn't changed.
+        return [self.renderValue(default, tokens, params) for (text, default, tokens) in self.m_entries]
+
+    def apply(self, params):            # always renders from the compiled (original) values, so could be called repeatedly.
+        for (text, default, tokens) in self.m_entries:
+            text.data = self.renderValue(default, tokens, params)
+        return True
+
+    def renderXML(self, params):        # the resolved config for a set of (params), e.g. to generate config variants in a batch.
+        self.apply(params)
+        return self.m_doc.toxml()
+
+class ObjectIDTracker:
+    # Keeps the max OBJECTID of mosaic dataset catalogs for the duration of a run so the catalog
+    # needn't be scanned with a MAX() subquery each time. Values are refreshed incrementally after
+    # MDCS adds items and dropped (invalidate) after commands that could add/remove items otherwise.
+    def __init__(self, base):
+        self.m_base = base
+        self.m_max_objectid = {}
+
+    def _key(self, gdb, md):
+        return os.path.join(gdb, md).lower()
+
+    def _queryMax(self, gdb, md):
+        path = os.path.join(gdb, md)
+        rows = arcpy.SearchCursor(path, "objectid = (SELECT MAX(\"objectid\") FROM %sAMD_%s_CAT)" % (self.m_base.m_SDE_database_user, md), None, 'objectid')
+        if (rows == None):
+            return 0        #new table
+
+        objID = 0
+        for row in rows:
+            objID = row.objectid
+            break
+        return objID
+
+    def getMax(self, gdb, md):
+        key = self._key(gdb, md)
+        if ((key in self.m_max_objectid.keys()) == False):
+            self.m_max_objectid[key] = self._queryMax(gdb, md)
+        return self.m_max_objectid[key]
+
+    def refresh(self, gdb, md):     # to call after MDCS has added items, only the rows above the known max get read.
+        key = self._key(gdb, md)
+        if ((key in self.m_max_objectid.keys()) == False):
+            return self.getMax(gdb, md)
+        objID = self.m_max_objectid[key]
+        try:
+            rows = arcpy.SearchCursor(os.path.join(gdb, md), "OBJECTID >%s" % (objID), None, 'objectid', 'objectid D')
+            if (rows != None):
+                for row in rows:
+                    objID = row.objectid
+                    break
+        except:
+            objID = self._queryMax(gdb, md)
+        self.m_max_objectid[key] = objID
+        return objID
+
+    def invalidate(self, gdb = None, md = None):
+        if (gdb is None or
+            md is None):
+            self.m_max_objectid = {}
+            return
+        key = self._key(gdb, md)
+        if (key in self.m_max_objectid.keys()):
+            del self.m_max_objectid[key]
+
+# (arcpy.ListFields) field types -> (AddField_management) field types
+field_types = {
+'String' : 'TEXT',
+'Integer' : 'LONG',
+'SmallInteger' : 'SHORT',
+'Double' : 'DOUBLE',
+'Single' : 'FLOAT',
+'Date' : 'DATE',
+'GUID' : 'GUID',
+'Blob' : 'BLOB'
+}
+
+def getListFieldType(field_type):       # e.g. TEXT -> String
+    for key in field_types.keys():
+        if (field_types[key] == str(field_type).upper()):
+            return key
+    return field_type
+
+class FieldCache:
+    # Field names per dataset for the duration of a run so (arcpy.ListFields) isn't called for each
+    # <AddRaster> entry/field. Fields added through the cache are recorded, the whole cache is dropped
+    # (invalidate) after commands that could change a schema otherwise.
+    def __init__(self):
+        self.m_fields = {}
+        self.m_schema = {}
+
+    def _key(self, path):
+        return str(path).lower()
+
+    def getFields(self, path):      # returns {upper case field name : field type}
+        key = self._key(path)
+        if ((key in self.m_fields.keys()) == False):
+            self.m_schema[key] = [(f.name, f.type, f.length) for f in arcpy.ListFields(path)]
+            self.m_fields[key] = dict([(f[0].upper(), f[1]) for f in self.m_schema[key]])
+        return self.m_fields[key]
+
+    def getSchema(self, path):      # returns [(field name, field type, length)] in the order of the dataset.
+        self.getFields(path)
+        return self.m_schema[self._key(path)]
+
+    def _added(self, path, name, field_type, length):
+        field_type = getListFieldType(field_type)
+        self.getFields(path)[name.upper()] = field_type
+        self.getSchema(path).append((name, field_type, length))
+
+    def hasField(self, path, name):
+        return name.upper() in self.getFields(path).keys()
+
+    def addField(self, path, name, field_type, length = ''):      # adds the field unless it exists, returns True if it got added.
+        if (self.hasField(path, name)):
+            return False
+        arcpy.AddField_management(path, name, field_type, '', '', length)
+        self._added(path, name, field_type, length)
+        return True
+
+    def addFields(self, path, fields):      # (fields) [(name, type, length)], returns the ([created], [skipped]) fields. Missing fields get added in one tool call where supported.
+        existing = self.getFields(path)
+        created = []
+        skipped = []
+        for field in fields:
+            if (field[0].upper() in existing.keys() or
+                field[0].upper() in [f[0].upper() for f in created]):
+                skipped.append(field)
+            else:
+                created.append(field)
+        if (len(created) == 0):
+            return (created, skipped)
+        try:
+            if (hasattr(arcpy, 'AddFields_management')):        # ArcGIS Pro 2.5+, one schema lock for all fields.
+                arcpy.AddFields_management(path, [[name, field_type, '', length, '', ''] for (name, field_type, length) in created])
+            else:
+                for (name, field_type, length) in created:
+                    arcpy.AddField_management(path, name, field_type, '', '', length)
+        except:
+            self.invalidate(path)       # some of the fields may have been added.
+            raise
+        for (name, field_type, length) in created:
+            self._added(path, name, field_type, length)
+        return (created, skipped)
+
+    def invalidate(self, path = None):
+        if (path is None):
+            self.m_fields = {}
+            self.m_schema = {}
+            return
+        key = self._key(path)
+        if (key in self.m_fields.keys()):
+            del self.m_fields[key]
+            del self.m_schema[key]
+
+g_field_cache = FieldCache()        # per process.
+
+def saveJSON(path, value):      # writes to a unique temp file next to (path) and moves it in place, concurrent writers/readers never see a partial file.
+    (fd, tmp) = tempfile.mkstemp(prefix = os.path.basename(path) + '.', suffix = '.tmp', dir = os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'w') as writer:
+            json.dump(value, writer)
+        if (hasattr(os, 'replace')):
+            os.replace(tmp, path)
+        else:       # python 2.x, (os.rename) doesn't overwrite on Windows.
+            if (os.path.exists(path)):
+                os.remove(path)
+            os.rename(tmp, path)
+    except:
+        if (os.path.exists(tmp)):
+            os.remove(tmp)
+        raise
+
+def stampFields(path, fields, where):       # sets the constant values of (fields) [(name, type, length, value)] on the catalog items matching (where) in one pass.
+    for (name, field_type, length, value) in fields:
+        g_field_cache.addField(path, name, field_type, length)
+    lyrName = 'lyr_stamp_%s' % (os.path.basename(path))
+    arcpy.MakeMosaicLayer_management(path, lyrName, where)
+    try:
+        lyrName_footprint = lyrName + '/Footprint'
+        if (len(fields) > 1 and
+            hasattr(arcpy, 'CalculateFields_management')):      # ArcGIS Pro 2.5+, all fields in one tool call.
+            arcpy.CalculateFields_management(lyrName_footprint, 'PYTHON3', [[f[0], repr(f[3])] for f in fields])
+        else:
+            for (name, field_type, length, value) in fields:
+                arcpy.CalculateField_management(lyrName_footprint, name, repr(value), 'PYTHON_9.3', '')
+    finally:
+        arcpy.Delete_management(lyrName)
+    return True
+
 class Base(object):
 
 #begin - constansts
@@ -159,6 +883,7 @@ class Base(object):
 
         # To keep track of the last objectID before any new data items could be added.
         self.m_last_AT_ObjectID = 0     #by default, take in all the previous records for any operation.
+        self.m_objectid_tracker = ObjectIDTracker(self)
 
 
         # SDE specific variables
@@ -176,11 +901,37 @@ class Base(object):
         self.m_cli_msg_callback_ptr = None
         # ends
 
+        self.m_validate_only = False    # True to resolve the config without calling into arcpy (-validate).
+
+        # compiled config cache specific
+        self.m_cache_folder = ''        # set to enable the cache.
+        self.m_compiled_config = {}     # values restored from the cache (i.e. 'addrasters')
+        self.m_config_resolved = False  # True if (m_doc) already has the dynamic values applied.
+        # ends
+
+        # concurrent command execution specific
+        self.m_max_workers = 1          # > 1 to run independent commands in the chain on worker processes.
+        self.m_env_settings = {}        # arcpy.env values set by (SE), replayed in worker processes.
+        # ends
+
+        self.m_backend = 'arcpy'        # or (memory[:latency]), see (Solutions.setBackend)
+
+        self.m_resume = False           # True to skip the steps completed by an earlier run of the same chain (-resume).
+        self.m_checkpoint = None        # the (Checkpoint) journal of the run.
+        self.m_incremental = ''         # (stat) or (hash) to add only new/changed source files (-incremental).
+        self.m_source_manifest = None   # the (SourceManifest) of the run if incremental.
+        self.m_lock_timeout = 10        # seconds to wait for the geodatabase locks to go before schema changes (-locktimeout).
+        self.m_discovery_workers = 0    # threads listing the <AddRaster> data paths (-discover), 0 leaves the discovery to the tool.
+        self.m_source_discovery = None  # the (SourceDiscovery) of the run.
+
     def init(self):         #return (status [true|false], reason)
 
         if (self.m_doc == None):
             return False
 
+        if (self.getConfigIndex(self.m_doc) is None):
+            ConfigIndex(self.m_doc)
+
         #version check.
         try:
 
@@ -219,8 +970,17 @@ class Base(object):
             return (False, self.const_init_ret_patch)
         # ends
 
+        return self.resolveConfig()
+
+
+    def resolveConfig(self):        # config values only, doesn't need arcpy except for (SDE) workspaces.
 
-        self.setUserDefinedValues()         #replace user defined dynamic variables in config file with values provided at the command-line.
+        if (self.getConfigIndex(self.m_doc) is None):
+            ConfigIndex(self.m_doc)
+
+        if (self.m_config_resolved == False):
+            self.setUserDefinedValues()         #replace user defined dynamic variables in config file with values provided at the command-line.
+            self.m_config_resolved = True
 
         if (self.m_workspace == ''):
             self.m_workspace = self.prefixFolderPath(self.getAbsPath(self.getXMLNodeValue(self.m_doc, "WorkspacePath")), self.const_workspace_path_)
@@ -245,6 +1005,8 @@ class Base(object):
 
         if (ext == self.const_geodatabase_SDE_ext):
             self.m_IsSDE = True
+            if (self.m_validate_only):
+                return (True, 'OK')
             try:
                 self.log('Reading SDE connection properties from (%s)' % (self.m_geoPath))
                 conProperties  = arcpy.Describe(self.m_geoPath).connectionProperties
@@ -292,8 +1054,45 @@ class Base(object):
         return self.m_code_base
 
 
+    def getConfigIndex(self, doc):
+        if (doc is None):
+            return None
+        return getattr(doc, 'm_config_index', None)
+
+
+    def logConfigStats(self):
+        index = self.getConfigIndex(self.m_doc)
+        if (index is not None):
+            self.log(index.getStats(), self.const_general_text)
+
+
+    def getXMLNodes(self, doc, nodeName):       # uses the config index if one has been built for the (doc)
+        index = self.getConfigIndex(doc)
+        if (index is not None):
+            return index.getNodes(nodeName)
+        return doc.getElementsByTagName(nodeName)
+
+
+    def getXMLChildElements(self, node):
+        index = self.getConfigIndex(node.ownerDocument)
+        if (index is not None):
+            return index.getChildElements(node)
+        return [n for n in node.childNodes if n.nodeType == minidom.Node.ELEMENT_NODE]
+
+
     def getXMLXPathValue(self, xPath, key):
 
+        index = self.getConfigIndex(self.m_doc)
+        if (index is not None):
+            nodes = index.getPathNodes(xPath)
+            if (len(nodes) == 0 or
+                xPath.split('/')[-1] != key):
+                return ''
+            node = nodes[0]
+            if (node.hasChildNodes() == False):
+                return ''
+            return str(node.firstChild.data).strip()
+
         nodes = self.m_doc.getElementsByTagName(key)
         for node in nodes:
             parents = []
@@ -309,6 +1108,9 @@ class Base(object):
 
         return ''
 
+    def getObjectIDScope(self):         # where clause to restrict commands to the items added by this run.
+        return "OBJECTID >%s" % (str(self.m_last_AT_ObjectID))
+
     def setLog(self, log):
         self.m_log = log
         return True
@@ -484,73 +1286,25 @@ class Base(object):
         CPRODUCT_NAME = 'ProductName'
         CVERSION = 'Version'
 
-        setupInfo = arcpy.GetInstallInfo()
+        setupInfo = g_env_probe.getInstallInfo()
         if ((CVERSION in setupInfo.keys()) == False or
             (CPRODUCT_NAME in setupInfo.keys()) == False):
             return False
 
         key = setupInfo[CPRODUCT_NAME] + setupInfo[CVERSION]
 
-        try:
-            reg_path = "Software\\Wow6432Node\\ESRI\\%s\\Updates" % (key)
-            arcgis = OpenKey(
-                HKEY_LOCAL_MACHINE, reg_path)
-
-            i = 0
-            while 1:
-                name = EnumKey(arcgis, i)
-                arcgis_sub = OpenKey(
-                    HKEY_LOCAL_MACHINE, reg_path + '\\' + name)
-                try:
-                    value, type = QueryValueEx(arcgis_sub, "Name")
-                    if (type == 1):   # reg_sz
-                        if (value.lower().find(search_key.lower()) >= 0):
-                            return True     # return true if the value is found!
-                except:
-                    pass
-                i += 1
-        except:
-            pass
+        for refresh in [False, True]:
+            for value in g_env_probe.getPatches(key, refresh):
+                if (value.lower().find(search_key.lower()) >= 0):
+                    return True     # return true if the value is found!
+            if (g_env_probe.isLoaded() == False):
+                break       # the patch list has been read from the registry already.
 
         return False
 
 
     def getDesktopVersion(self):    #returns major, minor, sp and the build number.
-
-        d = arcpy.GetInstallInfo()
-
-        version = []
-
-        buildNumber = 0
-        spNumber = 0
-
-        CVERSION = 'version'
-        CBUILDNUMBER = 'buildnumber'
-        CSPNUMBER = 'spnumber'
-
-        ValError = False
-
-        for k in d:
-            key = k.lower()
-            if (key == CVERSION or
-                key == CBUILDNUMBER or
-                key == CSPNUMBER):
-                try:
-                    if (key == CVERSION):
-                        [version.append(int(x)) for x in d[k].split(".")]
-                    elif (key == CBUILDNUMBER):
-                        buildNumber = int(d[k])
-                    elif (key == CSPNUMBER):
-                        spNumber = int(d[k])        # could be N/A
-                except:
-                    ValError = True
-
-        CMAJOR_MINOR_REVISION = 3
-        if (len(version) < CMAJOR_MINOR_REVISION):  # On a system with full-install, ArcGIS version piece of information could return 3 numbers (major, minor, revision/SP)
-            version.append(spNumber)                # and thus the SP number shouldn't be added to the version sperately.
-        version.append(buildNumber)
-
-        return version
+        return g_env_probe.getDesktopVersion()
 
 
 
@@ -632,10 +1386,10 @@ class Base(object):
     def getXMLNodeValue(self, doc, nodeName) :
         if (doc == None):
             return ''
-        node = doc.getElementsByTagName(nodeName)
+        node = self.getXMLNodes(doc, nodeName)
 
         if (node == None or
-            node.length == 0 or
+            len(node) == 0 or
             node[0].hasChildNodes() == False or
             node[0].firstChild.nodeType != minidom.Node.TEXT_NODE):
             return ''
@@ -711,75 +1465,26 @@ class Base(object):
             return ''
 
 
-    def setUserDefinedValues(self):
-
-        nodes = self.m_doc.getElementsByTagName('*')
-        for node in nodes:
-            if (node.firstChild != None):
-                 v = node.firstChild.data.strip()
-
-                 if (v.find('$') == -1):
-                    continue
-
-                 usr_key = v
-                 default = ''
-
-                 d = v.split(';')
+    def getConfigTemplate(self, doc):
+        template = getattr(doc, 'm_config_template', None)
+        if (template is None):
+            template = ConfigTemplate(doc, self.getXMLNodes(doc, '*'))
+        return template
 
-                 if (len(d) > 1):
-                    default = d[0].strip()
-                    usr_key = d[1].strip()
 
-                 revalue = []
-
-                 first = usr_key.find('$')
-                 first += 1
-
-                 second =  first + usr_key[first+1:].find('$') + 1
-
-                 if (first > 1):
-                    revalue.append(usr_key[0:first - 1])
-
-                 while(second >= 0):
-
-                    uValue = usr_key[first:second]
-
-                    if (uValue.upper() in self.m_dynamic_params.keys()):
-                        revalue.append(self.m_dynamic_params[uValue.upper()])
-                    else:
-                        if (uValue.find('\$') >= 0):
-                            uValue = uValue.replace('\$', '$')
-                        else:
-                            if (default == ''):
-                                default = uValue
-
-                            if (first == 1
-                            and second == (len(usr_key) - 1)):
-                                uValue = default
-
-                        revalue.append(uValue)
-
-                    first = second + 1
-                    indx = usr_key[first+1:].find('$')
-                    if (indx == -1):
-                        if (first != len(usr_key)):
-                            revalue.append(usr_key[first:len(usr_key)])
-                        break
-
-                    second = first + indx + 1
+    def setUserDefinedValues(self):
 
-                 updateVal = ''.join(revalue)
-                 node.firstChild.data = updateVal
+        self.getConfigTemplate(self.m_doc).apply(self.m_dynamic_params)
 
 
 
     def getXMLNode(self, doc, nodeName) :
         if (doc == None):
             return ''
-        node = doc.getElementsByTagName(nodeName)
+        node = self.getXMLNodes(doc, nodeName)
 
         if (node == None or
-            node.length == 0 or
+            len(node) == 0 or
             node[0].hasChildNodes() == False or
             node[0].firstChild.nodeType != minidom.Node.TEXT_NODE):
             return ''
@@ -787,47 +1492,21 @@ class Base(object):
         return node[0]
 
     def foundLockFiles(self, folder_path):
-
-        file_list_ = os.listdir(folder_path)
-        found_lock_ = False
-        for i in file_list_:
-            if (i[-5:].lower() == '.lock'):
-                sp = i.split('.')
-                pid = os.getpid()
-                if (pid == int(sp[3])):         #indx 3 == process id
-                    found_lock_ = True
-                    break;
-
-        return found_lock_
+        return LockWatcher(folder_path).hasLocks()
 
 
-    def waitForLockRelease(self, folder_path_):
+    def waitForLockRelease(self, folder_path_, timeout = None, schema = False):        # returns the seconds waited, -1 on timeout or -2 if (folder_path_) doesn't exist.
 
         if (os.path.exists(folder_path_) == False):
             self.log('lock file path does not exist!. Quitting...', self.const_critical_text)
             return -2       #path does not exist error code!
 
-        t0 = datetime.now()
-        duration_req_sec_ = 3
-        max_time_to_wait_sec_ = 10
-        tot_count_sec_ = 0
-
-        while True:
-            if (tot_count_sec_ == 0):
-                if (self.foundLockFiles(folder_path_) == False):   #try to see if we could get lucky on the first try, else enter periodic check.
-                    break;
-            t1 = datetime.now() - t0
-
-            if (t1.seconds > duration_req_sec_):
-                if (self.foundLockFiles(folder_path_) == False):
-                    break;
-                tot_count_sec_ += duration_req_sec_
-                if (tot_count_sec_ > max_time_to_wait_sec_):
-                    self.log('lock file release timed out!. Quitting...', self.const_critical_text)
-                    tot_count_sec_ = -1
-                    break;
-                t0 = datetime.now()
-
-        return tot_count_sec_
+        if (timeout is None):
+            timeout = self.m_lock_timeout
+        watcher = LockWatcher(folder_path_, schema = schema)
+        waited = watcher.wait(timeout)
+        if (waited < 0):
+            self.log('lock file release timed out after (%s) s, locks held: %s' % (timeout, ', '.join(watcher.m_found)), self.const_warning_text)
+        return waited
 
  
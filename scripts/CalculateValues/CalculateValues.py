@@ -0,0 +1,196 @@
+#------------------------------------------------------------------------------
+# Copyright 2013 Esri
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#------------------------------------------------------------------------------
+# Name: CalculateValues.py
+# Description: Evaluates the <CalculateValue> entries of (CV) grouped by query in a single update cursor pass per group.
+# Version: 20161018
+# Requirements: ArcGIS 10.1 SP1
+# Author: Esri Imagery Workflows team
+#------------------------------------------------------------------------------
+#!/usr/bin/env python
+
+import re
+import sys
+
+import Base
+from Base import arcpy
+
+if (sys.version_info[0] < 3):
+    _text = unicode
+else:
+    _text = str
+
+_field_token = re.compile(r'!([^!]+)!')
+_word = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+_coerce = {         # catalog field type -> conversion CalculateField applies to the expression result.
+'String' : _text,
+'Integer' : int,
+'SmallInteger' : int,
+'Double' : float,
+'Single' : float
+}
+
+class CalculateValues(Base.Base):
+    # Python expressions are compiled once and evaluated row by row in the order of the config, entries
+    # with the same query share one cursor pass unless an entry in between reads/writes the same fields.
+    # Other expression types (VB) and geometry tokens (!shape.area!) fall back to (CalculateField).
+
+    def __init__(self, base):
+        self.setLog(base.m_log)
+        self.m_base = base
+
+
+    def getWords(self, text):
+        if (text == '#'):
+            return set()
+        return set([w.upper() for w in _word.findall(text)])
+
+
+    def compileEntry(self, path, entry):      # returns the compiled entry or None if it has to run through (CalculateField).
+        expr_type = entry['expression_type'].upper()
+        if (expr_type.startswith('PYTHON') == False or
+            entry['expression'] == '#'):
+            return None
+        fields = Base.g_field_cache.getFields(path)
+        target = entry['fieldname'].upper()
+        if ((target in fields.keys()) == False):
+            return None     # (CalculateField) reports the missing field.
+        reads = [name.upper() for name in _field_token.findall(entry['expression'])]
+        for name in reads:
+            if ((name in fields.keys()) == False):
+                return None     # geometry tokens/unknown fields.
+        space = {}
+        try:
+            if (entry['code_block'] != '#'):
+                exec(entry['code_block'], space)
+            keys = sorted(set(reads))
+            expr = _field_token.sub(lambda m: '_r[%s]' % (keys.index(m.group(1).upper())), entry['expression'])
+            fnc = eval('lambda _r: (%s)' % (expr), space)
+        except Exception as inf:
+            self.log('Calculate values: (%s) falls back to CalculateField, %s' % (entry['fieldname'], str(inf)), self.const_warning_text)
+            return None
+        return {
+        'entry' : entry,
+        'target' : target,
+        'reads' : keys,
+        'fnc' : fnc,
+        'coerce' : _coerce.get(fields[target]),
+        'words' : self.getWords(entry['expression']) | self.getWords(entry['code_block'])
+        }
+
+
+    def getGroups(self, path, entries):       # returns the [(query, [compiled entries])] or [(None, entry)] to run in order.
+        groups = []
+        for entry in entries:
+            compiled = self.compileEntry(path, entry)
+            if (compiled is None):
+                groups.append((None, entry))
+                continue
+            query_words = self.getWords(entry['query'])
+            join = None
+            for i in range(len(groups) - 1, -1, -1):
+                (query, members) = groups[i]
+                if (query is None):
+                    break       # (CalculateField) entries keep their order.
+                if (query == entry['query'] and
+                    len([m for m in members if m['target'] in query_words]) == 0):
+                    join = i
+                    break
+                conflict = False
+                for member in members:     # the entry can't move ahead of a group it depends on or that depends on it.
+                    if (member['target'] == compiled['target'] or
+                        member['target'] in compiled['words'] or
+                        member['target'] in query_words or
+                        compiled['target'] in member['words'] or
+                        compiled['target'] in self.getWords(query)):
+                        conflict = True
+                        break
+                if (conflict):
+                    break
+            if (join is None):
+                groups.append((entry['query'], [compiled]))
+            else:
+                groups[join][1].append(compiled)
+        return groups
+
+
+    def runGroup(self, path, query, members):
+        expression = self.m_base.getObjectIDScope()
+        if (query != '#'):
+            expression += ' AND %s' % (query)
+        fields = []
+        for member in members:
+            for name in [member['target']] + member['reads']:
+                if ((name in fields) == False):
+                    fields.append(name)
+        for member in members:
+            member['target_index'] = fields.index(member['target'])
+            member['read_index'] = [fields.index(name) for name in member['reads']]
+
+        count = 0
+        with arcpy.da.UpdateCursor(path, fields, expression) as rows:
+            for row in rows:
+                for member in members:
+                    value = member['fnc']([row[i] for i in member['read_index']])
+                    if (value is not None and
+                        member['coerce'] is not None):
+                        value = member['coerce'](value)
+                    row[member['target_index']] = value
+                rows.updateRow(row)
+                count += 1
+        self.log('\tCalculated (%s) for (%s) item(s)%s' % (', '.join([m['entry']['fieldname'] for m in members]), count, '' if query == '#' else ' where (%s)' % (query)), self.const_general_text)
+        return True
+
+
+    def calculateField(self, path, entry):      # the (CalculateField) path for entries the cursor can't evaluate.
+        expression = self.m_base.getObjectIDScope()
+        if (entry['query'] != '#'):
+            expression += ' AND %s' % (entry['query'])
+        lyrName = 'lyr_%s' % str(self.m_base.m_last_AT_ObjectID)
+        isError = False
+        try:
+            arcpy.MakeMosaicLayer_management(path, lyrName, expression)
+            lyrName_footprint = lyrName + "/Footprint"
+            arcpy.CalculateField_management(lyrName_footprint,
+            entry['fieldname'],
+            entry['expression'],
+            entry['expression_type'],
+            entry['code_block']
+            )
+        except:
+            self.log(arcpy.GetMessages(), self.const_critical_text)
+            isError = True
+        try:
+            arcpy.Delete_management(lyrName)     # passes for unknown/uncreated layer names
+        except:
+            self.log(arcpy.GetMessages(), self.const_critical_text)
+            isError = True
+        return not isError
+
+
+    def run(self, path, entries):       # (entries) [{fieldname, expression, expression_type, code_block, query}], values not set are '#'
+        isError = False
+        for (query, members) in self.getGroups(path, entries):
+            if (query is None):
+                if (self.calculateField(path, members) == False):
+                    isError = True
+                continue
+            try:
+                self.runGroup(path, query, members)
+            except Exception as inf:
+                self.log('Calculate values: failed to calculate (%s): %s' % (', '.join([m['entry']['fieldname'] for m in members]), str(inf)), self.const_critical_text)
+                self.log(arcpy.GetMessages(), self.const_critical_text)
+                isError = True
+        return not isError
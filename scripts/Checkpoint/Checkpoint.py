@@ -0,0 +1,193 @@
+#------------------------------------------------------------------------------
+# Copyright 2013 Esri
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#------------------------------------------------------------------------------
+# Name: Checkpoint.py
+# Description: Journals the completed commands/<AddRaster> entries of a command chain so a failed run can be resumed (-resume).
+# Version: 20161018
+# Requirements: ArcGIS 10.1 SP1
+# Author: Esri Imagery Workflows team
+#------------------------------------------------------------------------------
+#!/usr/bin/env python
+
+import os
+import json
+import time
+import hashlib
+
+import Base
+
+class Checkpoint(Base.Base):
+    # One journal (JSON lines) per config and mosaic dataset. The first line describes the run, each following
+    # line a completed step. The journal is removed once the whole chain has completed.
+
+    CCHECKPOINT_VERSION = 1
+    CCHECKPOINT_EXT = '.mdcsj'
+
+    def __init__(self, base, folder):
+        self.m_folder = folder
+        self.m_path = ''
+        self.m_header = {}
+        self.m_commands = {}        # chain position -> record of the completed command
+        self.m_addrasters = {}      # (chain position, source id, entry index) -> record of the completed <AddRaster>
+        self.m_watermarks = {}      # (chain position, source id) -> OBJECTID watermark before the first entry got added.
+        self.m_pos = -1             # chain position of the command running now.
+
+        self.setLog(base.m_log)
+        self.m_base = base
+
+
+    def getPath(self, config):
+        hsh = hashlib.sha1()
+        hsh.update(('%s|%s' % (os.path.abspath(config), os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName))).lower().encode('utf-8'))
+        return os.path.join(self.m_folder, '%s_%s%s' % (os.path.splitext(os.path.basename(config))[0], hsh.hexdigest()[:12], self.CCHECKPOINT_EXT))
+
+
+    def getHeader(self, config, chain):
+        return {
+        'type' : 'run',
+        'version' : self.CCHECKPOINT_VERSION,
+        'config' : os.path.abspath(config),
+        'md' : os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName),
+        'chain' : chain,
+        'dynamic_params' : self.m_base.m_dynamic_params
+        }
+
+
+    def _write(self, record, mode = 'a'):
+        try:
+            if (os.path.exists(self.m_folder) == False):
+                os.makedirs(self.m_folder)
+            record['time'] = time.time()
+            with open(self.m_path, mode) as writer:
+                writer.write(json.dumps(record) + '\n')
+                writer.flush()
+                if (self.m_base.m_resume or
+                    record['type'] != 'addraster'):     # synced at command boundaries, per <AddRaster> entry only on resumed runs.
+                    os.fsync(writer.fileno())
+            return True
+        except Exception as inf:
+            self.log('Checkpoint: unable to write the journal (%s)' % (str(inf)), self.const_warning_text)
+            return False
+
+
+    def _read(self):
+        records = []
+        with open(self.m_path, 'r') as reader:
+            for line in reader:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break       # the last record may have been cut short by the failure.
+        return records
+
+
+    def start(self, config, chain, resume):     # returns True if there are completed steps to resume from.
+        self.m_path = self.getPath(config)
+        header = self.getHeader(config, chain)
+        if (resume and
+            os.path.exists(self.m_path)):
+            try:
+                records = self._read()
+                saved = dict(records[0])
+                saved.pop('time', None)
+                if (saved != header):
+                    self.log('Checkpoint: the journal (%s) was written for a different command chain/values, starting over.' % (self.m_path), self.const_warning_text)
+                else:
+                    for record in records[1:]:
+                        if (record['type'] == 'command'):
+                            self.m_commands[record['pos']] = record
+                        elif (record['type'] == 'addraster'):
+                            self.m_addrasters[(record['pos'], record['source'], record['entry'])] = record
+                            key = (record['pos'], record['source'])
+                            if ((key in self.m_watermarks.keys()) == False):
+                                self.m_watermarks[key] = record['watermark']
+                    self.m_header = header
+                    self.log('Checkpoint: resuming from (%s), (%s) command(s) and (%s) <AddRaster> entries completed earlier.' % \
+                    (self.m_path, len(self.m_commands), len(self.m_addrasters)), self.const_general_text)
+                    return len(self.m_commands) + len(self.m_addrasters) > 0
+            except Exception as inf:
+                self.log('Checkpoint: unable to read the journal (%s), starting over.' % (str(inf)), self.const_warning_text)
+        elif (resume):
+            self.log('Checkpoint: no journal found to resume from (%s), starting over.' % (self.m_path), self.const_warning_text)
+
+        self.m_header = header
+        self.m_commands = {}
+        self.m_addrasters = {}
+        self.m_watermarks = {}
+        self._write(dict(header), 'w')
+        return False
+
+
+    def getPending(self, nodes):       # the nodes not completed in an earlier run, restores the OBJECTID watermark they ran with.
+        pending = [n for n in nodes if (n['pos'] in self.m_commands.keys()) == False]
+        done = [n for n in nodes if n['pos'] in self.m_commands.keys()]
+        if (len(done) == 0):
+            return pending
+        self.log('Checkpoint: skipping completed command(s) %s' % ('+'.join([n['cat'] for n in done])), self.const_general_text)
+        if (len(pending) > 0):
+            prior = [n['pos'] for n in done if n['pos'] < pending[0]['pos']]
+            if (len(prior) > 0):
+                self.m_base.m_last_AT_ObjectID = self.m_commands[max(prior)]['last_objectid']
+                self.log('Checkpoint: OBJECTID watermark restored to (%s)' % (self.m_base.m_last_AT_ObjectID), self.const_general_text)
+        return pending
+
+
+    def setCommand(self, node):
+        self.m_pos = node['pos']
+
+
+    def commandDone(self, node):
+        record = {
+        'type' : 'command',
+        'pos' : node['pos'],
+        'cat' : node['cat'],
+        'index' : node['index'],
+        'last_objectid' : self.m_base.m_last_AT_ObjectID
+        }
+        self.m_commands[node['pos']] = record
+        return self._write(record)
+
+
+    def isAddRasterDone(self, source, entry):
+        return (self.m_pos, source, entry) in self.m_addrasters.keys()
+
+
+    def getWatermark(self, source, objectid):      # the OBJECTID before the first <AddRaster> entry of (source) got added in the original run.
+        return self.m_watermarks.get((self.m_pos, source), objectid)
+
+
+    def addRasterDone(self, source, entry, dataset_id, watermark):
+        record = {
+        'type' : 'addraster',
+        'pos' : self.m_pos,
+        'source' : source,
+        'entry' : entry,
+        'dataset_id' : dataset_id,
+        'watermark' : watermark
+        }
+        self.m_addrasters[(self.m_pos, source, entry)] = record
+        if (((self.m_pos, source) in self.m_watermarks.keys()) == False):
+            self.m_watermarks[(self.m_pos, source)] = watermark
+        return self._write(record)
+
+
+    def remove(self):       # the whole chain has completed.
+        try:
+            if (self.m_path != '' and
+                os.path.exists(self.m_path)):
+                os.remove(self.m_path)
+            return True
+        except Exception as inf:
+            self.log('Checkpoint: unable to remove the journal (%s)' % (str(inf)), self.const_warning_text)
+            return False
@@ -0,0 +1,89 @@
+#------------------------------------------------------------------------------
+# Copyright 2013 Esri
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#------------------------------------------------------------------------------
+# Name: ConfigCache.py
+# Description: Persists the resolved (compiled) config so repeated runs with the same config/dynamic values skip re-resolving it.
+# Version: 20161018
+# Requirements: ArcGIS 10.1 SP1
+# Author: Esri Imagery Workflows team
+#------------------------------------------------------------------------------
+#!/usr/bin/env python
+
+import os
+import json
+import hashlib
+
+import Base
+
+class ConfigCache(Base.Base):
+
+    CCACHE_VERSION = 1          # bump to invalidate entries written by older MDCS versions.
+    CCACHE_EXT = '.mdcsc'
+
+    def __init__(self, base, cache_folder):
+        self.m_cache_folder = cache_folder
+        self.m_key = ''
+
+        self.setLog(base.m_log)
+        self.m_base = base
+
+
+    def getKey(self, config):   # config content hash + everything else that changes how the config resolves.
+        hsh = hashlib.sha1()
+        with open(config, 'rb') as reader:
+            hsh.update(reader.read())
+        values = {
+        'version' : self.CCACHE_VERSION,
+        'dynamic_params' : self.m_base.m_dynamic_params,
+        'workspace' : self.m_base.m_workspace,
+        'geodatabase' : self.m_base.m_geodatabase,
+        'md' : self.m_base.m_mdName,
+        'sources' : self.m_base.m_sources,
+        'code_base' : self.m_base.m_code_base,
+        'cwd' : os.getcwd()         # relative paths (e.g. WorkspacePath) are resolved against it.
+        }
+        hsh.update(json.dumps(values, sort_keys=True).encode('utf-8'))
+        return hsh.hexdigest()
+
+
+    def getPath(self):
+        return os.path.join(self.m_cache_folder, self.m_key + self.CCACHE_EXT)
+
+
+    def load(self, config):
+        try:
+            self.m_key = self.getKey(config)
+            path = self.getPath()
+            if (os.path.exists(path) == False):
+                return None
+            with open(path, 'r') as reader:
+                entry = json.load(reader)
+            if (entry['key'] != self.m_key):
+                return None
+            return entry
+        except Exception as inf:
+            self.log('Config cache: unable to read entry (%s)' % (str(inf)), self.const_warning_text)
+            return None
+
+
+    def save(self, entry):
+        try:
+            if (os.path.exists(self.m_cache_folder) == False):
+                os.makedirs(self.m_cache_folder)
+            entry['key'] = self.m_key
+            Base.saveJSON(self.getPath(), entry)
+            return True
+        except Exception as inf:
+            self.log('Config cache: unable to write entry (%s)' % (str(inf)), self.const_warning_text)
+            return False
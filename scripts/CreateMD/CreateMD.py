@@ -20,10 +20,11 @@
 #------------------------------------------------------------------------------
 #!/usr/bin/env python
 
-import arcpy,os,sys
+import os,sys
 from xml.dom import minidom
 
 import Base
+from Base import arcpy
 
 class CreateMD(Base.Base):
     def __init__(self, base):
@@ -81,14 +82,13 @@ class CreateMD(Base.Base):
 
 
     def init(self, config):
-        Nodelist = self.m_base.m_doc.getElementsByTagName("MosaicDataset")
-        if (Nodelist.length == 0):
+        Nodelist = self.getXMLNodes(self.m_base.m_doc, "MosaicDataset")
+        if (len(Nodelist) == 0):
             self.log("\nError: MosaicDatasets node not found! Invalid schema.", self.const_critical_text)
             return False
 
         try:
-            for node in Nodelist[0].childNodes:
-                  node =  node.nextSibling
+            for node in self.getXMLChildElements(Nodelist[0]):
                   if (node != None and node.nodeType == minidom.Node.ELEMENT_NODE):
                       if(node.nodeName == 'SRS'):
                             self.srs = node.firstChild.nodeValue
@@ -20,11 +20,12 @@
 #------------------------------------------------------------------------------
 #!/usr/bin/env python
 
-import arcpy,os,sys
+import os,sys
 sys.path.append('../SetMDProperties/')
 
 import SetMDProperties
 import Base
+from Base import arcpy
 
 from xml.dom import minidom
 
@@ -128,8 +129,8 @@ class CreateReferencedMD(Base.Base):
 
         self.m_numBands  = self.getXMLNodeValue(self.m_base.m_doc, "num_bands")
 
-        Nodelist = self.m_base.m_doc.getElementsByTagName("MosaicDataset")
-        if (Nodelist.length == 0):
+        Nodelist = self.getXMLNodes(self.m_base.m_doc, "MosaicDataset")
+        if (len(Nodelist) == 0):
             self.log("Error: MosaicDatasets node not found! Invalid schema.", self.const_critical_text)
             return False
 
@@ -138,8 +139,7 @@ class CreateReferencedMD(Base.Base):
         dName = ''
 
         try:
-            for node in Nodelist[0].childNodes:
-                  node =  node.nextSibling
+            for node in self.getXMLChildElements(Nodelist[0]):
                   if (node != None and node.nodeType == minidom.Node.ELEMENT_NODE):
 
                         if (node.nodeName == 'CreateReferencedMosaicDataset'):
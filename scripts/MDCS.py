@@ -23,16 +23,21 @@
 #------------------------------------------------------------------------------
 #!/usr/bin/env python
 
-import arcpy
+import time
+g_import_t0 = time.time()
+
 import sys, os
 
 solutionLib_path = os.path.dirname(__file__)        #set the location to the solutionsLib path
 sys.path.append(solutionLib_path)
 
-sys.path.append(os.path.join(solutionLib_path, 'solutionsLog'))
+sys.path.append(os.path.join(solutionLib_path, 'SolutionsLog'))
 import logger
 import solutionsLib     #import Raster Solutions library
 import Base
+from Base import arcpy      # loaded on first use.
+
+g_import_time = time.time() - g_import_t0
 
 # cli callback ptrs
 g_cli_callback = None
@@ -51,6 +56,8 @@ def register_for_msg_callbacks(fn_ptr):
     g_cli_msg_callback = fn_ptr
 # ends
 
+stamp_fields = [('Dataset_ID', 'TEXT', '50')]     # catalog fields set to the <AddRaster> value of the same name (info) on the newly added items.
+
 def postAddData(gdbPath, mdName, info):
     mdName = info['md']
     obvalue = info['pre_AddRasters_record_count']
@@ -59,18 +66,14 @@ def postAddData(gdbPath, mdName, info):
     mosaicMDType = info['type'].lower()
     if(mosaicMDType == 'source'):
         expression = 'OBJECTID >{}'.format(obvalue)
+        fields = [(name, field_type, length, info[name]) for (name, field_type, length) in stamp_fields if name in info.keys()]
+        if (len(fields) == 0):
+            return True
         try:
-            fieldName = 'Dataset_ID'
-            fieldExist = arcpy.ListFields(fullPath, fieldName)
-            if (not fieldExist):
-                arcpy.AddField_management(fullPath, fieldName, "TEXT", "", "", "50")
-            log.Message('Calculating \'Dataset ID\' for the mosaic dataset ({}) with value ({})'.format(mdName, info[fieldName]), log.const_general_text)
-            with arcpy.da.UpdateCursor(fullPath,[fieldName],expression) as rows:
-                for row in rows:
-                    row[0] = info[fieldName]
-                    rows.updateRow(row)
+            log.Message('Calculating ({}) for the mosaic dataset ({}) with value(s) ({})'.format(', '.join([f[0] for f in fields]), mdName, ', '.join([str(f[3]) for f in fields])), log.const_general_text)
+            Base.stampFields(fullPath, fields, expression)
         except:
-            log.Message('Err. Failed to calculate \'Dataset_ID\'', log.const_critical_text)
+            log.Message('Err. Failed to calculate ({})'.format(', '.join([f[0] for f in fields])), log.const_critical_text)
             log.Message(arcpy.GetMessages(), log.const_critical_text)
             return False
     return True
@@ -90,7 +93,18 @@ def main(argc, argv):
         "-m: Mosaic dataset path including GDB and MD name [e.g. c:\WorldElevation.gdb\Portland]",
         "-s: Source data paths. (As inputs to command (AR)",
         "-l: Log file output path [path+file name]",
-        "-artdem: Update DEM path in ART file"
+        "-artdem: Update DEM path in ART file",
+        "-workers: Max number of worker processes to run independent commands concurrently",
+        "-cache: Folder to cache the resolved config for faster repeated runs [default: <mdcs>/cache]",
+        "-validate: Check the config, process blocks and commands without running them",
+        "-plan: Print the execution plan (arguments and estimated cost per command) without running it",
+        "-timing: Report module import times",
+        "-backend: Geoprocessing backend, arcpy [default] or memory[:<tool latency in seconds>] to run without ArcGIS",
+        "-metrics: Export per command/GP tool timings next to the log file as (.metrics.json) and a Prometheus textfile (.prom)",
+        "-resume: Skip the commands/<AddRaster> entries completed by an earlier failed run of the same config and commands",
+        "-incremental: Add only the source files new/changed since the last run (size, mtime), -incremental:hash to also compare file contents",
+        "-discover: List the source folders with a pool of threads [default: 8] and add the files found in chunks, e.g. -discover:16",
+        "-locktimeout: Seconds to wait for file geodatabase locks to be released before schema changes (AF, DF, AI, AMDS) [default: 10]"
         ]
 
         print ("\nMDCS.py v5.8a [20150611]\nUsage: MDCS.py -c:<Optional:command> -i:<config_file>" \
@@ -117,8 +131,16 @@ def main(argc, argv):
     log = logger.Logger(base);
     base.setLog(log)
 
+    # state left by an earlier run in this process (MDCS_Batch workers).
+    Base.g_metrics = None
+    Base.g_field_cache.invalidate()
+    Base.g_tool_cache.reset()
+    arcpy.reset()
+
     argIndx = 0
     md_path_ = artdem = config = com = log_folder = code_base =  ''
+    backend = 'arcpy'
+    validate_only = plan_only = report_timing = collect_metrics = False
 
     while(argIndx < argc):
         (values) = argv[argIndx].split(':')
@@ -133,7 +155,20 @@ def main(argc, argv):
 
         value = ':'.join(values).strip()
 
-        if (subCode == 'c'):
+        if (exSubCode == 'cache'):
+            base.m_cache_folder = value if value != '' else os.path.join(os.path.dirname(solutionLib_path), 'cache')
+        elif (exSubCode == 'backend'):     # checked before (-b)
+            backend = value
+        elif (exSubCode == 'metrics'):     # checked before (-m)
+            collect_metrics = True
+        elif (exSubCode == 'locktimeout'):     # checked before (-l)
+            try:
+                base.m_lock_timeout = float(value)
+            except:
+                log.Message('Invalid lock timeout ({})'.format(value), log.const_warning_text)
+        elif (exSubCode == 'incremental'):     # checked before (-i)
+            base.m_incremental = 'hash' if value.lower() == 'hash' else 'stat'
+        elif (subCode == 'c'):
             com = value.replace(' ', '')        #remove spaces in between.
         elif(subCode == 'i'):
             config = value
@@ -149,6 +184,24 @@ def main(argc, argv):
             artdem =  value
         elif(exSubCode == 'gprun'):
             log.isGPRun = True                  # direct log messages also to (arcpy.AddMessage)
+        elif(exSubCode == 'validate'):
+            validate_only = True
+        elif(exSubCode == 'plan'):
+            plan_only = True
+        elif(exSubCode == 'timing'):
+            report_timing = True
+        elif(exSubCode == 'resume'):
+            base.m_resume = True
+        elif(exSubCode == 'discover'):
+            try:
+                base.m_discovery_workers = int(value) if value != '' else 8
+            except:
+                log.Message('Invalid number of discovery threads ({})'.format(value), log.const_warning_text)
+        elif(exSubCode == 'workers'):
+            try:
+                base.m_max_workers = int(value)
+            except:
+                log.Message('Invalid number of workers ({})'.format(value), log.const_warning_text)
         elif(subCode == 'p'):
             pMax = value.rfind('$')
             if (pMax == -1):
@@ -191,6 +244,10 @@ def main(argc, argv):
     configName, ext = os.path.splitext(config)
     configName = os.path.basename(configName)
 
+    if (collect_metrics):
+        import metrics
+        Base.g_metrics = metrics.Metrics(configName)
+
     # setup log
     log.Project ('MDCS')
     log.LogNamePrefix(configName)
@@ -212,6 +269,7 @@ def main(argc, argv):
         log.Message('Input config file is not specified/not found! ({})'.format(config), logger.Logger.const_critical_text)
         log.Message(base.CCMD_STATUS_FAILED, logger.Logger.const_status_text)    # set (failed) status
         log.WriteLog('#all')
+        log.Close()
         return False
 
     if (artdem != ''):
@@ -226,10 +284,38 @@ def main(argc, argv):
         com = base.const_cmd_default_text
 
     solutions = solutionsLib.Solutions(base)
-    success = solutions.run(config, com, comInfo)
-
-    log.Message ("Done...", log.const_general_text)
-    log.WriteLog('#all')   #persist information/errors collected.
+    if (solutions.setBackend(backend) == False):
+        log.Message(base.CCMD_STATUS_FAILED, logger.Logger.const_status_text)
+        log.WriteLog('#all')
+        log.Close()
+        return False
+    success = False
+    try:
+        if (plan_only):
+            success = solutions.plan(config, com)
+        elif (validate_only):
+            success = solutions.validate(config, com)
+        else:
+            success = solutions.run(config, com, comInfo)
+    except Exception as inf:
+        log.Message('Err. Unexpected error: {}'.format(str(inf)), log.const_critical_text)
+        log.Message(base.CCMD_STATUS_FAILED, logger.Logger.const_status_text)
+        raise
+    finally:        # the log (and metrics) are written even if the run raised.
+        if (report_timing):
+            log.Message('Timing: MDCS modules imported in (%.1f) ms, arcpy %s' % (g_import_time * 1000,
+            'imported in (%.1f) ms' % (arcpy.getLoadTime() * 1000) if arcpy.isLoaded() else 'not loaded'), log.const_general_text)
+
+        log.Message ("Done...", log.const_general_text)
+        if (Base.g_metrics is not None):
+            t0 = Base.g_metrics.start()
+        log.WriteLog('#all')   #persist information/errors collected.
+        log.Close()
+        if (Base.g_metrics is not None):
+            Base.g_metrics.add('phase', 'write_log', t0)
+            if (log.m_log_path != ''):
+                Base.g_metrics.export(os.path.splitext(log.m_log_path)[0])
+    return success
 
 if __name__ == '__main__':
     main(len(sys.argv), sys.argv)
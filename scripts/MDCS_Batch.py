@@ -0,0 +1,182 @@
+#------------------------------------------------------------------------------
+# Copyright 2013 Esri
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#------------------------------------------------------------------------------
+# Name: MDCS_Batch.py
+# Description: Runs MDCS over many configuration files on a bounded process pool.
+# Version: 20161018
+# Requirements: ArcGIS 10.1 SP1
+# Required Arguments: -i:<config_file(s)> or -f:<batch_file>
+# Usage: python.exe MDCS_Batch.py -i:<config(s)/wildcard> -f:<Optional:batch_file> -j:<Optional:workers> -l:<Optional:log_folder>
+# Notes: All other flags (-c, -p, -m, -s, -b, -artdem) are passed on to each MDCS run.
+#        Each line in a batch file holds a config path followed by its own MDCS flags,
+#        e.g. c:\configs\a.xml -p:2015$year -c:AR+BB
+#        Per-config flags take precedence over the flags given at the command-line.
+# Author: Esri Imagery Workflows team
+#------------------------------------------------------------------------------
+#!/usr/bin/env python
+
+import sys, os
+import glob
+import shlex
+import time
+import multiprocessing
+
+solutionLib_path = os.path.dirname(os.path.abspath(__file__))        #set the location to the solutionsLib path
+sys.path.append(solutionLib_path)
+
+import MDCS
+
+const_batch_ok = 'OK'
+const_batch_failed = 'Failed!'
+
+
+def expandConfigs(value):
+    configs = []
+    for entry in value.split(';'):
+        entry = entry.strip()
+        if (entry == ''):
+            continue
+        matches = sorted(glob.glob(entry))
+        if (len(matches) == 0):
+            configs.append(entry)       # let MDCS report the missing config file.
+            continue
+        configs.extend(matches)
+    return configs
+
+
+def readBatchFile(path):
+    jobs = []
+    with open(path, 'r') as reader:
+        for line in reader:
+            line = line.strip()
+            if (line == '' or
+                line[:1] == '#'):
+                continue
+            tokens = [t.strip('"') for t in shlex.split(line, posix=False)]
+            for config in expandConfigs(tokens[0]):
+                jobs.append({'config' : config, 'args' : tokens[1:]})
+    return jobs
+
+
+def runConfig(job):
+    # MDCS keeps the last (-c, -m, -s, -b) but the first (-p) value of a variable, the per-config flags are placed to win either way.
+    params = [a for a in job['common_args'] if a[:3].lower() == '-p:']
+    common_args = [a for a in job['common_args'] if (a in params) == False]
+    argv = ['MDCS.py', '-i:{}'.format(job['config'])] + common_args + job['args'] + params
+    argv.append('-l:{}'.format(job['log']))
+
+    info = {
+    'config' : job['config'],
+    'log' : job['log'],
+    'status' : const_batch_failed,
+    'error' : ''
+    }
+    t0 = time.time()
+    try:
+        if (MDCS.main(len(argv), argv) != False):
+            info['status'] = const_batch_ok
+    except SystemExit:
+        info['error'] = 'MDCS quit unexpectedly.'
+    except Exception as inst:
+        info['error'] = str(inst)
+    info['duration'] = time.time() - t0
+    return info
+
+
+def main(argc, argv):
+
+    if (argc < 2):
+        print ("\nMDCS_Batch.py [20161018]\nUsage: MDCS_Batch.py -i:<config(s)> -f:<Optional:batch_file> -j:<Optional:workers> -l:<Optional:log_folder>" \
+        "\n\n-i: Config file paths separated by ';'. Wildcards are allowed [e.g. c:\\configs\\*.xml]" \
+        "\n-f: Batch file with one config and its own MDCS flags per line" \
+        "\n-j: Max number of configs to process at the same time (default: number of CPUs)" \
+        "\n-l: Folder to hold a log file per config" \
+        "\n\nAny other flags are passed on to every MDCS run. Type 'python.exe mdcs.py' to list them.")
+        sys.exit(1)
+
+    jobs = []
+    common_args = []
+    workers = multiprocessing.cpu_count()
+    log_folder = os.path.join(os.path.dirname(solutionLib_path), 'logs')
+
+    for arg in argv[1:]:
+        (values) = arg.split(':')
+        code = values.pop(0).lower()
+        value = ':'.join(values).strip()
+        if (code == '-i'):
+            jobs.extend([{'config' : c, 'args' : []} for c in expandConfigs(value)])
+        elif (code == '-f'):
+            if (os.path.isfile(value) == False):
+                print ('Batch file is not found! ({})'.format(value))
+                return False
+            jobs.extend(readBatchFile(value))
+        elif (code == '-j'):
+            try:
+                workers = max(1, int(value))
+            except:
+                print ('Invalid number of workers ({}), using ({})'.format(value, workers))
+        elif (code == '-l'):
+            log_folder = value
+        else:
+            common_args.append(arg)
+
+    if (len(jobs) == 0):
+        print ('No config files to process.')
+        return False
+
+    if (os.path.exists(log_folder) == False):
+        os.makedirs(log_folder)
+
+    for i in range(0, len(jobs)):
+        configName = os.path.splitext(os.path.basename(jobs[i]['config']))[0]
+        jobs[i]['log'] = os.path.join(log_folder, '{}_{:04d}.xml'.format(configName, i))
+        jobs[i]['common_args'] = common_args
+
+    workers = min(workers, len(jobs))
+    print ('Processing ({}) config(s) using ({}) worker(s)..'.format(len(jobs), workers))
+
+    t0 = time.time()
+    results = []
+    if (workers == 1):
+        for job in jobs:
+            info = runConfig(job)
+            print ('{} ({:.1f}s) {}'.format(info['status'], info['duration'], info['config']))
+            results.append(info)
+    else:
+        pool = multiprocessing.Pool(processes=workers)
+        try:
+            for info in pool.imap_unordered(runConfig, jobs):
+                print ('{} ({:.1f}s) {}'.format(info['status'], info['duration'], info['config']))
+                results.append(info)
+        finally:
+            pool.close()
+            pool.join()
+    wall_time = time.time() - t0
+
+    failed = [r for r in results if r['status'] != const_batch_ok]
+    total_time = sum([r['duration'] for r in results])
+    slowest = max(results, key=lambda r: r['duration'])
+
+    print ('\nSummary:')
+    for info in sorted(results, key=lambda r: r['config']):
+        print ('\t{:<8}{:>10.1f}s  {}  [log: {}]'.format(info['status'], info['duration'], info['config'], info['log']))
+        if (info['error'] != ''):
+            print ('\t\t{}'.format(info['error']))
+    print ('Configs: {}, Failed: {}'.format(len(results), len(failed)))
+    print ('Wall time: {:.1f}s, Sum of run times: {:.1f}s, Slowest: {:.1f}s ({})'.format(wall_time, total_time, slowest['duration'], slowest['config']))
+
+    return len(failed) == 0
+
+if __name__ == '__main__':
+    sys.exit(0 if main(len(sys.argv), sys.argv) else 1)
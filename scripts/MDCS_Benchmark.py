@@ -0,0 +1,414 @@
+#------------------------------------------------------------------------------
+# Copyright 2013 Esri
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#------------------------------------------------------------------------------
+# Name: MDCS_Benchmark.py
+# Description: Times the MDCS orchestration hot paths over generated configs/catalogs on the in-memory backend.
+# Version: 20161018
+# Requirements: Python (ArcGIS isn't needed)
+# Usage: python MDCS_Benchmark.py -n:<Optional:scale> -r:<Optional:repeat> -o:<Optional:baseline_output.json> -compare:<Optional:baseline.json> -threshold:<Optional:percent>
+# Notes: The results (min/median seconds and peak memory per phase) are written as JSON to compare builds.
+#        With -compare, phases slower than the baseline by more than the threshold [default: 10%] are
+#        reported as regressions and the script exits with (1).
+# Author: Esri Imagery Workflows team
+#------------------------------------------------------------------------------
+#!/usr/bin/env python
+
+import sys, os
+import json
+import time
+import shutil
+import platform
+import tempfile
+from datetime import datetime
+from xml.dom import minidom
+
+solutionLib_path = os.path.dirname(os.path.abspath(__file__))        #set the location to the solutionsLib path
+sys.path.append(solutionLib_path)
+
+import MDCS
+import solutionsLib
+import logger
+import Base
+from Base import arcpy
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None      # python 2.x, peak memory isn't reported.
+
+if (hasattr(time, 'perf_counter')):
+    timer = time.perf_counter
+else:
+    timer = time.time
+
+const_benchmark_version = 1
+
+const_md_name = 'md'
+const_gdb_name = 'bench.gdb'
+
+
+class Quiet(object):        # silences the console output of the log while a phase runs.
+    def __enter__(self):
+        self.m_stdout = sys.stdout
+        sys.stdout = open(os.devnull, 'w')
+        return self
+
+    def __exit__(self, type, value, traceback):
+        if (getattr(MDCS, 'log', None) is not None):     # set by (Benchmark.newBase)
+            MDCS.log.FlushMessages()
+        sys.stdout.close()
+        sys.stdout = self.m_stdout
+        return False
+
+
+def getSizes(scale):
+    return {
+    'add_rasters' : scale,              # <AddRaster> entries
+    'source_files' : scale * 2,         # files in the source folder
+    'process_blocks' : max(1, scale // 10),     # copies of each <Processes> block
+    'calculate_values' : scale,         # <CalculateValue> entries per <CalculateValues>
+    'indexes' : max(1, scale // 5),     # <Index> entries per <AddIndex>
+    'variables' : scale,                # $VAR$ placeholders
+    'catalog_items' : scale * 10,       # catalog rows for (postAddData)
+    'dyna_invokes' : scale * 5,         # tool calls through (DynaInvoke)
+    'log_messages' : scale * 20         # log messages written by (WriteLog)
+    }
+
+
+def addElement(doc, parent, name, value = None):
+    node = doc.createElement(name)
+    if (value is not None):
+        node.appendChild(doc.createTextNode(str(value)))
+    parent.appendChild(node)
+    return node
+
+
+def createConfig(path, workspace, source_folder, sizes):
+    doc = minidom.Document()
+    app = addElement(doc, doc, 'Application')
+    addElement(doc, app, 'Name', 'Benchmark')
+    addElement(doc, app, 'Command', 'CM+AR')
+    wrk = addElement(doc, app, 'Workspace')
+    addElement(doc, wrk, 'WorkspacePath', workspace)
+    addElement(doc, wrk, 'Geodatabase', const_gdb_name)
+    mds = addElement(doc, wrk, 'MosaicDataset')
+    addElement(doc, mds, 'MosaicDatasetType', 'source')
+    addElement(doc, mds, 'Name', const_md_name)
+    addElement(doc, mds, 'SRS', '#')
+
+    add_rasters = addElement(doc, mds, 'AddRasters')
+    for i in range(0, sizes['add_rasters']):
+        entry = addElement(doc, add_rasters, 'AddRaster')
+        addElement(doc, entry, 'dataset_id', 'ds%s_$VAR%s$' % (i, i % sizes['variables']))
+        addElement(doc, entry, 'raster_type', 'Raster Dataset')
+        sources = addElement(doc, entry, 'Sources')
+        addElement(doc, sources, 'data_path', source_folder)
+        addElement(doc, entry, 'filter', 'f%s_*.tif' % (i))
+        addElement(doc, entry, 'sub_folder', 'SUBFOLDERS')
+        addElement(doc, entry, 'duplicate_items_action', 'EXCLUDE_DUPLICATES')
+
+    processes = addElement(doc, mds, 'Processes')
+    for i in range(0, sizes['process_blocks']):
+        block = addElement(doc, processes, 'BuildBoundary')
+        addElement(doc, block, 'where_clause', 'OBJECTID > $VAR%s$' % (i % sizes['variables']))
+        addElement(doc, block, 'append_to_existing', 'OVERWRITE')
+        addElement(doc, block, 'simplification_method', 'NONE')
+        block = addElement(doc, processes, 'BuildFootprint')
+        addElement(doc, block, 'where_clause', '#')
+        addElement(doc, block, 'reset_footprint', 'RADIOMETRY')
+        block = addElement(doc, processes, 'AddIndex')
+        for j in range(0, sizes['indexes']):
+            index = addElement(doc, block, 'Index')
+            addElement(doc, index, 'fields', 'Name')
+            addElement(doc, index, 'index_name', 'idx_%s_%s' % (i, j))
+            addElement(doc, index, 'unique', 'NON_UNIQUE')
+            addElement(doc, index, 'ascending', 'ASCENDING')
+        block = addElement(doc, processes, 'CalculateValues')
+        for j in range(0, sizes['calculate_values']):
+            value = addElement(doc, block, 'CalculateValue')
+            addElement(doc, value, 'query', 'OBJECTID > %s' % (j))
+            addElement(doc, value, 'fieldName', 'Tag')
+            addElement(doc, value, 'expression', '"$VAR%s$"' % (j % sizes['variables']))
+            addElement(doc, value, 'expression_type', 'PYTHON_9.3')
+
+    with open(path, 'w') as writer:
+        doc.writexml(writer, '', '  ', '\n', 'utf-8')
+
+
+def createSources(folder, sizes):
+    for i in range(0, sizes['source_files']):
+        sub = os.path.join(folder, 'sub%s' % (i % 10))
+        if (os.path.exists(sub) == False):
+            os.makedirs(sub)
+        open(os.path.join(sub, 'f%s_%s.tif' % (i % sizes['add_rasters'], i)), 'w').close()
+
+
+class BenchmarkError(Exception):        # a measured phase failed, its timings would be meaningless.
+    pass
+
+
+class Benchmark(object):
+
+    def __init__(self, scale, repeat):
+        self.m_sizes = getSizes(scale)
+        self.m_scale = scale
+        self.m_repeat = repeat
+        self.m_folder = tempfile.mkdtemp(prefix='mdcs_bench_')
+        self.m_workspace = os.path.join(self.m_folder, 'workspace')
+        self.m_sources = os.path.join(self.m_folder, 'sources')
+        self.m_config = os.path.join(self.m_folder, 'bench.xml')
+        self.m_dynamic_params = dict([('VAR%s' % (i), str(i)) for i in range(0, self.m_sizes['variables'])])
+        self.m_results = {}
+
+    def cleanup(self):
+        shutil.rmtree(self.m_folder, True)
+
+    def newBase(self):      # a fresh run state on a fresh in-memory backend.
+        base = Base.Base()
+        log = logger.Logger(base)
+        base.setLog(log)
+        log.Project('MDCS')
+        log.StartLog()
+        log.SetLogFolder(os.path.join(self.m_folder, 'logs'))
+        MDCS.log = log
+        base.m_dynamic_params = dict(self.m_dynamic_params)
+        base.m_cache_folder = tempfile.mkdtemp(prefix='cache_', dir=self.m_folder)     # checkpoint journals/caches stay out of the code tree, cold for every pass.
+        solutions = solutionsLib.Solutions(base)
+        solutions.setBackend('memory')
+        return (base, solutions)
+
+    def loadBase(self):
+        (base, solutions) = self.newBase()
+        solutions.config = self.m_config
+        solutions.userInfo = {}
+        solutions.load()
+        return (base, solutions)
+
+    def measure(self, name, setup, fnc):
+        times = []
+        for i in range(0, self.m_repeat):
+            with Quiet():
+                state = setup()
+                t0 = timer()
+                fnc(state)
+                times.append(timer() - t0)
+        peak = None
+        if (tracemalloc is not None):
+            with Quiet():
+                state = setup()
+                tracemalloc.start()
+                fnc(state)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+        times.sort()
+        self.m_results[name] = {
+        'min' : times[0],
+        'median' : times[len(times) // 2],
+        'peak_kb' : peak / 1024.0 if peak is not None else None
+        }
+        print ('{:<26}{:>12.4f}s{:>12.4f}s{:>14}'.format(name, times[0], times[len(times) // 2], '{:.1f} KB'.format(peak / 1024.0) if peak is not None else 'n/a'))
+
+    # phases
+    def setupParse(self):
+        return self.m_config
+
+    def runParse(self, config):
+        minidom.parse(config)
+
+    def setupUserValues(self):
+        (base, solutions) = self.newBase()
+        base.m_doc = minidom.parse(self.m_config)
+        return base
+
+    def runUserValues(self, base):
+        base.setUserDefinedValues()
+
+    def setupProcessInfo(self):
+        (base, solutions) = self.newBase()
+        base.m_doc = minidom.parse(self.m_config)
+        base.resolveConfig()
+        return solutions.getModule('ProcessInfo').ProcessInfo(base)
+
+    def runProcessInfo(self, processInfo):
+        processInfo.init(self.m_config)
+
+    def getChain(self):
+        chain = []
+        for i in range(0, self.m_sizes['process_blocks']):
+            chain.extend(['BB%s' % (i), 'BF%s' % (i), 'AI%s' % (i), 'CV%s' % (i)])
+        return '+'.join(chain)
+
+    def setupDispatch(self):
+        (base, solutions) = self.loadBase()
+        if (solutions.runNodes(solutions.getCommandNodes('CM+AR')) == False):
+            raise BenchmarkError('command_dispatch: (CM+AR) failed')
+        return (solutions, solutions.getCommandNodes(self.getChain()))
+
+    def runDispatch(self, state):
+        (solutions, nodes) = state
+        if (solutions.runNodes(nodes) == False):
+            raise BenchmarkError('command_dispatch: the command chain failed')
+
+    def setupDynaInvoke(self):
+        (base, solutions) = self.loadBase()
+        solutions.runNodes(solutions.getCommandNodes('CM'))
+        return base
+
+    def runDynaInvoke(self, base):
+        fullPath = os.path.join(base.m_geoPath, base.m_mdName)
+        for i in range(0, self.m_sizes['dyna_invokes']):
+            tool = Base.DynaInvoke('arcpy.BuildBoundary_management', [fullPath, '#', 'OVERWRITE'], None, base.m_log.Message)
+            if (tool.init()):
+                tool.invoke()
+
+    def setupPostAddData(self):
+        (base, solutions) = self.loadBase()
+        solutions.runNodes(solutions.getCommandNodes('CM'))
+        fullPath = os.path.join(base.m_geoPath, base.m_mdName)
+        with arcpy.da.InsertCursor(fullPath, ['Name']) as rows:
+            for i in range(0, self.m_sizes['catalog_items']):
+                rows.insertRow(['item%s' % (i)])
+        return (base, {'md' : base.m_mdName, 'type' : 'source', 'pre_AddRasters_record_count' : 0, 'Dataset_ID' : 'bench'})
+
+    def runPostAddData(self, state):
+        (base, info) = state
+        MDCS.postAddData(base.m_geoPath, base.m_mdName, info)
+
+    def setupWriteLog(self):
+        (base, solutions) = self.newBase()
+        log = base.m_log
+        for i in range(0, self.m_sizes['log_messages']):
+            if (i % 100 == 0):
+                if (i > 0):
+                    log.CloseCategory()
+                log.CreateCategory('C%s' % (i // 100))
+            log.Message('Message (%s) <&> "benchmark"' % (i), log.const_general_text if i % 10 else log.const_warning_text)
+        log.CloseCategory()
+        log.FlushMessages()
+        return log
+
+    def runWriteLog(self, log):
+        log.WriteLog('#all')
+        log.Close()
+
+    def setupRun(self):
+        (base, solutions) = self.newBase()
+        return solutions
+
+    def runRun(self, solutions):
+        if (solutions.run(self.m_config, 'CM+AR+' + self.getChain(), {'AR' : {'cb' : MDCS.postAddData}}) == False):
+            raise BenchmarkError('run: (Solutions.run) failed')
+
+    def run(self):
+        os.makedirs(self.m_workspace)
+        createSources(self.m_sources, self.m_sizes)
+        createConfig(self.m_config, self.m_workspace, self.m_sources, self.m_sizes)
+
+        print ('Scale ({}), repeat ({}), config ({:.1f} KB)'.format(self.m_scale, self.m_repeat, os.path.getsize(self.m_config) / 1024.0))
+        print ('{:<26}{:>13}{:>13}{:>14}'.format('Phase', 'Min', 'Median', 'Peak memory'))
+        self.measure('config_parse', self.setupParse, self.runParse)
+        self.measure('set_user_defined_values', self.setupUserValues, self.runUserValues)
+        self.measure('process_info_init', self.setupProcessInfo, self.runProcessInfo)
+        self.measure('command_dispatch', self.setupDispatch, self.runDispatch)
+        self.measure('dyna_invoke', self.setupDynaInvoke, self.runDynaInvoke)
+        self.measure('post_add_data', self.setupPostAddData, self.runPostAddData)
+        self.measure('write_log', self.setupWriteLog, self.runWriteLog)
+        self.measure('run', self.setupRun, self.runRun)
+
+        return {
+        'version' : const_benchmark_version,
+        'created' : datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+        'python' : sys.version.split()[0],
+        'platform' : platform.platform(),
+        'scale' : self.m_scale,
+        'repeat' : self.m_repeat,
+        'sizes' : self.m_sizes,
+        'phases' : self.m_results
+        }
+
+
+def compare(baseline, current, threshold):      # returns the number of phases slower than the baseline by more than (threshold) percent.
+    if (baseline['scale'] != current['scale']):
+        print ('Warning: the baseline was taken at scale ({}), this run is at ({})'.format(baseline['scale'], current['scale']))
+    regressions = 0
+    print ('\n{:<26}{:>13}{:>13}{:>10}'.format('Phase', 'Baseline', 'Current', 'Change'))
+    for name in sorted(current['phases'].keys()):
+        if ((name in baseline['phases'].keys()) == False):
+            print ('{:<26}{:>13}{:>12.4f}s{:>10}'.format(name, 'n/a', current['phases'][name]['min'], 'new'))
+            continue
+        old = baseline['phases'][name]['min']
+        new = current['phases'][name]['min']
+        change = ((new - old) / old * 100) if old > 0 else 0
+        flag = ''
+        if (change > threshold):
+            flag = '  <- regression'
+            regressions += 1
+        print ('{:<26}{:>12.4f}s{:>12.4f}s{:>9.1f}%{}'.format(name, old, new, change, flag))
+    return regressions
+
+
+def main(argc, argv):
+
+    scale = 100
+    repeat = 5
+    threshold = 10.0
+    output = baseline = ''
+
+    for arg in argv[1:]:
+        (values) = arg.split(':')
+        code = values.pop(0).lower()
+        value = ':'.join(values).strip()
+        try:
+            if (code == '-n'):
+                scale = max(1, int(value))
+            elif (code == '-r'):
+                repeat = max(1, int(value))
+            elif (code == '-o'):
+                output = value
+            elif (code == '-compare'):
+                baseline = value
+            elif (code == '-threshold'):
+                threshold = float(value)
+            else:
+                print ('Unknown flag ({})'.format(arg))
+                return False
+        except ValueError:
+            print ('Invalid value ({})'.format(arg))
+            return False
+
+    benchmark = Benchmark(scale, repeat)
+    try:
+        results = benchmark.run()
+    except BenchmarkError as inf:
+        print ('\nBenchmark failed, {}'.format(str(inf)))
+        return False
+    finally:
+        benchmark.cleanup()
+
+    if (output != ''):
+        with open(output, 'w') as writer:
+            json.dump(results, writer, indent = 1, sort_keys = True)
+        print ('Results written to ({})'.format(output))
+
+    if (baseline != ''):
+        with open(baseline, 'r') as reader:
+            regressions = compare(json.load(reader), results, threshold)
+        if (regressions > 0):
+            print ('({}) phase(s) slower than the baseline by more than ({}%)'.format(regressions, threshold))
+            return False
+
+    return True
+
+if __name__ == '__main__':
+    sys.exit(0 if main(len(sys.argv), sys.argv) else 1)
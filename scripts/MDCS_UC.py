@@ -22,9 +22,9 @@
 
 import os
 import sys
-import arcpy
 
 import Base
+from Base import arcpy
 
 class UserCode:
     def sample00(self, data):
@@ -0,0 +1,173 @@
+#------------------------------------------------------------------------------
+# Copyright 2013 Esri
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#------------------------------------------------------------------------------
+# Name: Planner.py
+# Description: Builds a dry-run execution plan (materialized command arguments and cost estimates) for a MDCS command chain.
+# Version: 20161018
+# Requirements: ArcGIS 10.1 SP1
+# Author: Esri Imagery Workflows team
+#------------------------------------------------------------------------------
+#!/usr/bin/env python
+
+import os
+import fnmatch
+
+import Base
+import Scheduler
+
+class ExecutionPlanner(Base.Base):
+
+    # cost basis per command, derived from what the command reads/writes (Scheduler.command_effects).
+    CCOST_SOURCES = 'sources'       # scales with the number/size of the source files.
+    CCOST_ITEMS = 'items'           # scales with the number of catalog items.
+    CCOST_FIXED = 'fixed'           # independent of the data size.
+
+    def __init__(self, solutions):
+        self.m_solutions = solutions
+        self.m_base = solutions.m_base
+        self.setLog(self.m_base.m_log)
+
+        self.m_catalog_count = None     # None if the mosaic dataset doesn't exist yet/couldn't be queried.
+        self.m_pending_items = 0        # items expected to be added by (AR) commands earlier in the chain.
+        self.m_listing = {}             # data_path|filter -> (file_count, total_size)
+
+
+    def getCostBasis(self, cmd):
+        if (cmd == 'AR'):
+            return self.CCOST_SOURCES
+        (reads, writes) = Scheduler.getEffects(cmd)
+        if (Scheduler.CRES_GDB in writes):         # create/delete/compact.
+            return self.CCOST_FIXED
+        if (Scheduler.CRES_CAT in reads or
+            Scheduler.CRES_CAT in writes):
+            return self.CCOST_ITEMS
+        return self.CCOST_FIXED
+
+
+    def getCatalogCount(self):      # read-only, only queried if the geodatabase is already on disk.
+        if (self.m_catalog_count is not None):
+            return self.m_catalog_count
+        if (self.m_base.m_IsSDE or
+            os.path.exists(self.m_base.m_geoPath) == False):
+            return None
+        try:
+            from Base import arcpy
+            fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+            if (arcpy.Exists(fullPath)):
+                self.m_catalog_count = int(arcpy.GetCount_management(fullPath).getOutput(0))
+        except Exception as inf:
+            self.log('Plan: unable to read the catalog row count (%s)' % (str(inf)), self.const_warning_text)
+        return self.m_catalog_count
+
+
+    def getSourceStats(self, data_path, filter, recursive = True):
+        key = '%s|%s|%s' % (data_path, filter, recursive)
+        if (key in self.m_listing.keys()):
+            return self.m_listing[key]
+        count = size = 0
+        for path in data_path.split(';'):
+            path = path.strip()
+            if (path == ''):
+                continue
+            if (os.path.isfile(path)):
+                count += 1
+                size += os.path.getsize(path)
+                continue
+            for (root, dirs, files) in os.walk(path):
+                if (recursive == False):
+                    del dirs[:]
+                for f in files:
+                    if (filter != '' and
+                        fnmatch.fnmatch(f, filter) == False):
+                        continue
+                    try:
+                        size += os.path.getsize(os.path.join(root, f))
+                        count += 1
+                    except:
+                        pass
+        self.m_listing[key] = (count, size)
+        return self.m_listing[key]
+
+
+    def getArguments(self, node):       # the process info values the command would be invoked with.
+        process = self.m_solutions.getCommand(node['cmd'])['process']
+        if (process is None):
+            return []
+        entry = self.m_solutions.processInfo.processInfo[process][node['index']]
+        if (isinstance(entry, list)):       # [addindex, calculatevalues] hold a list of values per entry.
+            return ['[%s] %s' % (i, ', '.join(['%s=%s' % (k, entry[i][k]) for k in entry[i]])) for i in range(0, len(entry))]
+        return ['%s=%s' % (k, entry[k]) for k in entry]
+
+
+    def planAddRasters(self, lines):
+        addRasters = self.m_solutions.getModule('AddRasters').AddRasters(self.m_base)
+        if ('addrasters' in self.m_base.m_compiled_config.keys()):
+            addRasters.sMdNameList = self.m_base.m_compiled_config['addrasters']
+        elif (addRasters.readConfig() == False):
+            return None
+        files = size = 0
+        for md in addRasters.sMdNameList:
+            for entry in addRasters.sMdNameList[md]['addraster']:
+                filter = addRasters.GetValue(entry, 'filter')
+                if (filter == '*'):
+                    filter = ''
+                recursive = addRasters.GetValue(entry, 'sub_folder').upper() != 'NO_SUBFOLDERS'
+                (c, s) = self.getSourceStats(addRasters.GetValue(entry, 'data_path'), filter, recursive)
+                files += c
+                size += s
+                lines.append('dataset_id=%s, raster_type=%s, data_path=%s, filter=%s -> (%s) files, (%.1f) MB' % \
+                (addRasters.GetValue(entry, 'dataset_id'), addRasters.GetValue(entry, 'art'), addRasters.GetValue(entry, 'data_path'), filter, c, s / 1048576.0))
+        return (files, size)
+
+
+    def estimate(self, node, lines):
+        basis = self.getCostBasis(node['cmd'])
+        if (basis == self.CCOST_SOURCES):
+            stats = self.planAddRasters(lines)
+            if (stats is None):
+                return 'n/a'
+            self.m_pending_items += stats[0]
+            return '~%s source file(s), %.1f MB' % (stats[0], stats[1] / 1048576.0)
+        if (basis == self.CCOST_ITEMS):
+            count = self.getCatalogCount()
+            if (count is None and
+                self.m_pending_items == 0):
+                return 'unknown item count'
+            return '~%s catalog item(s)' % ((count if count is not None else 0) + self.m_pending_items)
+        return 'fixed'
+
+
+    def run(self, nodes):
+
+        errors = 0
+        if (len(self.m_solutions.m_invalid_commands) > 0):
+            errors += len(self.m_solutions.m_invalid_commands)
+        for node in nodes:
+            msg = self.m_solutions.checkNode(node)
+            if (msg != ''):
+                self.log('Plan: %s' % (msg), self.const_critical_text)
+                errors += 1
+        if (errors > 0):
+            self.log('Plan: (%s) error(s) found, nothing planned.' % (errors), self.const_critical_text)
+            return False
+
+        self.log('Execution plan for (%s), mosaic dataset (%s):' % (self.m_solutions.config, os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)), self.const_general_text)
+        for i in range(0, len(nodes)):
+            node = nodes[i]
+            lines = []
+            cost = self.estimate(node, lines)
+            self.log('%s. %s (%s) [%s]' % (i + 1, node['cat'], self.m_solutions.getCommand(node['cmd'])['desc'], cost), self.const_general_text)
+            for line in lines + self.getArguments(node):
+                self.log('\t%s' % (line), self.const_general_text)
+        return True
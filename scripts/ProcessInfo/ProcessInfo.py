@@ -64,21 +64,26 @@ class ProcessInfo(Base.Base):
             self.userProcessInfo = pInfo
             return self.init(self.config)
 
+    def setProcessInfo(self, config, processInfo):     # to restore the values read earlier by (init), i.e. from the config cache.
+        self.config = config
+        self.processInfo = processInfo
+        self.hasProcessInfo = len(self.processInfo) > 0
+        return True
+
     def init(self, config):
 
         self.config = config
         self.processInfo = {}
         self.hasProcessInfo = False
 
-        Nodelist = self.m_base.m_doc.getElementsByTagName("MosaicDataset")
-        if (Nodelist.length == 0):
+        Nodelist = self.getXMLNodes(self.m_base.m_doc, "MosaicDataset")
+        if (len(Nodelist) == 0):
             self.log ("Error: <MosaicDataset> node is not found! Invalid schema.",
             self.const_critical_text)
             return False
 
         try:
-            for node in Nodelist[0].childNodes:
-                  node =  node.nextSibling
+            for node in self.getXMLChildElements(Nodelist[0]):
                   if (node != None and node.nodeType == minidom.Node.ELEMENT_NODE):
 
                                 if(node.nodeName == 'Processes'):
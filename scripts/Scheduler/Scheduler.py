@@ -0,0 +1,205 @@
+#------------------------------------------------------------------------------
+# Copyright 2013 Esri
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#------------------------------------------------------------------------------
+# Name: Scheduler.py
+# Description: Builds a dependency graph (DAG) out of a MDCS command chain and runs independent commands concurrently.
+# Version: 20161018
+# Requirements: ArcGIS 10.1 SP1
+# Author: Esri Imagery Workflows team
+#------------------------------------------------------------------------------
+#!/usr/bin/env python
+
+import time
+
+# resources a command could read from/write to.
+CRES_GDB = 'gdb'                # geodatabase (workspace level, e.g. new tables, compact)
+CRES_MD = 'md'                  # mosaic dataset properties/statistics/overviews
+CRES_CAT = 'catalog'            # mosaic dataset catalog (items and their fields)
+CRES_BND = 'boundary'           # mosaic dataset boundary table
+CRES_SML = 'seamline'           # mosaic dataset seamline table
+CRES_SRC = 'sources'            # source rasters (pyramids/statistics/aux files)
+CRES_ENV = 'env'                # arcpy environment settings
+CRES_EXT = 'external'           # anything outside the geodatabase (exports, services)
+CRES_GDB_CONTENT = [CRES_MD, CRES_CAT, CRES_BND, CRES_SML]
+CRES_ALL = [CRES_GDB, CRES_MD, CRES_CAT, CRES_BND, CRES_SML, CRES_SRC, CRES_ENV, CRES_EXT]
+
+# read (r) / write (w) effects for each built-in command. Commands not listed here (user commands) act as a barrier.
+command_effects = \
+{
+    'CM' :      { 'r' : [], 'w' : [CRES_GDB, CRES_MD, CRES_CAT] },
+    'CR' :      { 'r' : [CRES_CAT], 'w' : [CRES_GDB, CRES_MD, CRES_CAT] },
+    'AF' :      { 'r' : [], 'w' : [CRES_CAT] },
+    'AR' :      { 'r' : [CRES_SRC], 'w' : [CRES_MD, CRES_CAT, CRES_BND] },
+    'BF' :      { 'r' : [CRES_SRC], 'w' : [CRES_CAT, CRES_BND] },
+    'JF' :      { 'r' : CRES_ALL, 'w' : CRES_ALL },
+    'BS' :      { 'r' : [CRES_CAT], 'w' : [CRES_SML] },
+    'BP' :      { 'r' : [CRES_CAT], 'w' : [CRES_SRC] },
+    'ANCP' :    { 'r' : [CRES_CAT], 'w' : [CRES_MD, CRES_CAT, CRES_EXT] },
+    'APCP' :    { 'r' : [CRES_CAT], 'w' : [CRES_MD, CRES_CAT, CRES_EXT] },
+    'ABA' :     { 'r' : [CRES_EXT], 'w' : [CRES_MD, CRES_CAT] },
+    'CBA' :     { 'r' : [CRES_CAT, CRES_EXT], 'w' : [CRES_MD, CRES_EXT] },
+    'CCP' :     { 'r' : [CRES_CAT], 'w' : [CRES_EXT] },
+    'CTP' :     { 'r' : [CRES_CAT], 'w' : [CRES_EXT] },
+    'AMDS' :    { 'r' : [], 'w' : [CRES_MD, CRES_CAT] },
+    'AMD' :     { 'r' : [CRES_MD, CRES_CAT], 'w' : [] },
+    'BMDIC' :   { 'r' : [CRES_SRC], 'w' : [CRES_CAT] },
+    'CDA' :     { 'r' : [CRES_CAT], 'w' : [CRES_MD] },
+    'GEA' :     { 'r' : [CRES_CAT], 'w' : [CRES_MD, CRES_CAT] },
+    'CS' :      { 'r' : [CRES_CAT, CRES_SRC], 'w' : [CRES_MD] },
+    'RP' :      { 'r' : [], 'w' : [CRES_CAT] },
+    'CBMD' :    { 'r' : [CRES_CAT, CRES_SRC], 'w' : [CRES_MD] },
+    'RRFMD' :   { 'r' : [], 'w' : [CRES_MD, CRES_CAT, CRES_BND] },
+    'DMD' :     { 'r' : [], 'w' : [CRES_GDB, CRES_MD, CRES_CAT] },
+    'MMDI' :    { 'r' : [], 'w' : [CRES_CAT, CRES_BND] },
+    'BPS' :     { 'r' : [CRES_CAT], 'w' : [CRES_SRC] },
+    'ERF' :     { 'r' : [], 'w' : [CRES_CAT] },
+    'DN' :      { 'r' : [], 'w' : [CRES_CAT] },
+    'SP' :      { 'r' : [], 'w' : [CRES_MD] },
+    'IG' :      { 'r' : [CRES_EXT], 'w' : [CRES_CAT, CRES_BND] },
+    'DF' :      { 'r' : [], 'w' : [CRES_CAT] },
+    'IF' :      { 'r' : [CRES_EXT], 'w' : [CRES_CAT] },
+    'BB' :      { 'r' : [CRES_CAT], 'w' : [CRES_BND] },
+    'SS' :      { 'r' : [CRES_EXT], 'w' : [CRES_MD] },
+    'CC' :      { 'r' : [], 'w' : [CRES_CAT] },
+    'BO' :      { 'r' : [CRES_SRC], 'w' : [CRES_MD, CRES_CAT] },
+    'DO' :      { 'r' : [], 'w' : [CRES_MD, CRES_CAT] },
+    'AI' :      { 'r' : [], 'w' : [CRES_CAT] },
+    'RI' :      { 'r' : [], 'w' : [CRES_CAT] },
+    'CFC' :     { 'r' : [CRES_CAT, CRES_SML], 'w' : [CRES_EXT] },
+    'CV' :      { 'r' : [], 'w' : [CRES_CAT] },
+    'CP' :      { 'r' : [], 'w' : [CRES_GDB, CRES_MD, CRES_CAT] },
+    'SY' :      { 'r' : [CRES_SRC], 'w' : [CRES_MD, CRES_CAT, CRES_BND] },
+    'SE' :      { 'r' : [], 'w' : [CRES_ENV] },
+    'MTC' :     { 'r' : [CRES_MD, CRES_CAT], 'w' : [CRES_EXT] },
+    'ETC' :     { 'r' : [CRES_EXT], 'w' : [CRES_EXT] },
+    'STP' :     { 'r' : [CRES_EXT], 'w' : [CRES_EXT] },
+    'EMDG' :    { 'r' : [CRES_CAT], 'w' : [CRES_EXT] },
+    'EMDI' :    { 'r' : [CRES_CAT], 'w' : [CRES_EXT] },
+    'SMDI' :    { 'r' : [], 'w' : [CRES_CAT] },
+    'CSDD' :    { 'r' : [CRES_MD], 'w' : [CRES_EXT] },
+    'STS' :     { 'r' : [CRES_EXT], 'w' : [CRES_EXT] },
+    'USD' :     { 'r' : [CRES_EXT], 'w' : [CRES_EXT] }
+}
+
+# commands that update in-process state (callbacks, OBJECTID scope, arcpy.env) and so can't be run by a worker process.
+local_commands = ['AR', 'SE', 'CR']
+
+
+def getEffects(cmd):
+    if (cmd in command_effects.keys()):
+        effects = command_effects[cmd]
+        reads = set(effects['r'])
+        reads.add(CRES_ENV)         # all GP tools are affected by the environment settings.
+        return (reads, set(effects['w']))
+    return (set(CRES_ALL), set(CRES_ALL))
+
+
+def isConflict(first, second):
+    (r1, w1) = getEffects(first)
+    (r2, w2) = getEffects(second)
+    if (CRES_GDB in w1):
+        w1 = w1.union(CRES_GDB_CONTENT)
+    if (CRES_GDB in w2):
+        w2 = w2.union(CRES_GDB_CONTENT)
+    return len(w1 & (r2 | w2)) > 0 or len(w2 & r1) > 0
+
+
+class CommandScheduler(object):
+
+    def __init__(self, nodes, log = None):
+        # nodes: list of dicts with at least the keys {'cmd', 'is_user_cmd'} in chain order.
+        self.m_nodes = nodes
+        self.m_log = log
+        self.m_deps = []
+        self.buildGraph()
+
+    def log(self, msg, level = 0):
+        if (self.m_log):
+            return self.m_log(msg, level)
+        print (msg)
+
+    def buildGraph(self):
+        self.m_deps = []
+        for i in range(0, len(self.m_nodes)):
+            deps = set()
+            for j in range(0, i):
+                if (self.m_nodes[i]['is_user_cmd'] or
+                    self.m_nodes[j]['is_user_cmd'] or
+                    isConflict(self.m_nodes[j]['cmd'], self.m_nodes[i]['cmd'])):
+                        deps.add(j)
+            self.m_deps.append(deps)
+        return self.m_deps
+
+    def isLocal(self, i):
+        node = self.m_nodes[i]
+        return (node['is_user_cmd'] or
+                node['cmd'] in local_commands or
+                not node['cmd'] in command_effects.keys())
+
+    def getLevels(self):        # returns the list of node indexes that could run together, for reporting.
+        levels = []
+        level_of = {}
+        for i in range(0, len(self.m_nodes)):
+            level = 0
+            for d in self.m_deps[i]:
+                level = max(level, level_of[d] + 1)
+            level_of[i] = level
+            if (level == len(levels)):
+                levels.append([])
+            levels[level].append(i)
+        return levels
+
+    def run(self, fn_local, fn_submit, fn_stop):
+        # fn_local(i) -> status, runs node (i) in-process.
+        # fn_submit(i) -> handle with (ready(), get()) to run node (i) in a worker. get() -> status
+        # fn_stop(i, status) -> True to stop processing any further nodes.
+        pending = list(range(0, len(self.m_nodes)))
+        running = {}
+        done = set()
+        stop = False
+        result = True
+
+        while (len(pending) > 0 or len(running) > 0):
+            finished = []
+            if (not stop):
+                ready = [i for i in pending if self.m_deps[i].issubset(done)]
+                for i in ready:
+                    if (self.isLocal(i) == False):
+                        running[i] = fn_submit(i)
+                        pending.remove(i)
+                local = [i for i in ready if self.isLocal(i)]
+                if (len(local) > 0):
+                    i = local[0]
+                    pending.remove(i)
+                    finished.append((i, fn_local(i)))
+
+            for i in list(running.keys()):
+                if (running[i].ready()):
+                    finished.append((i, running[i].get()))
+                    del running[i]
+
+            if (len(finished) == 0):
+                if (len(running) == 0):
+                    break                   # stopped, nothing left to wait on.
+                time.sleep(0.05)
+                continue
+
+            for (i, status) in finished:
+                done.add(i)
+                if (status == False and
+                    fn_stop(i, status)):
+                    stop = True
+                    result = False
+
+        return result
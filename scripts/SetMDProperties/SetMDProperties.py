@@ -35,7 +35,7 @@ class SetMDProperties(Base.Base):
 
 
     def is101SP1(self):
-        return self.CheckMDCSVersion([10, 1, 0, 0], [0, 0, 0, 0])       # ver [major, minor, revision, build]
+        return Base.g_env_probe.getValue('is101SP1', lambda: self.CheckMDCSVersion([10, 1, 0, 0], [0, 0, 0, 0]))       # ver [major, minor, revision, build]
 
 
     def getInternalPropValue(self, md, key):
@@ -104,14 +104,13 @@ class SetMDProperties(Base.Base):
 
     def init(self, config):
 
-        Nodelist = self.m_base.m_doc.getElementsByTagName("MosaicDataset")
-        if (Nodelist.length == 0):
+        Nodelist = self.getXMLNodes(self.m_base.m_doc, "MosaicDataset")
+        if (len(Nodelist) == 0):
             self.log("Error: MosaicDataset node not found! Invalid schema.", self.const_critical_text)
             return False
 
         try:
-            for node in Nodelist[0].childNodes:
-                  node =  node.nextSibling
+            for node in self.getXMLChildElements(Nodelist[0]):
                   if (node != None and node.nodeType == minidom.Node.ELEMENT_NODE):
                         if (node.nodeName == 'DefaultProperties'):
                             for node in node.childNodes:
@@ -24,16 +24,91 @@ from xml.dom.minidom import Document
 from datetime import datetime
 
 import os,sys
-import arcpy
+import json
+import time
+import shutil
+import atexit
+import tempfile
+import threading
+try:
+    import queue
+except ImportError:
+    import Queue as queue       # python 2.x
 
 solutionLib_path = os.path.dirname(os.path.dirname(__file__))        #set the location to the solutionsLib path
 sys.path.append(solutionLib_path)
 sys.path.append(os.path.join(solutionLib_path, 'Base'))
 import Base
+from Base import arcpy
 
 const_start_time_node = 'StartTime'
 const_end_time_node = 'EndTime'
 
+const_log_buffer_size = 256         # records held in memory before they get appended to the journal.
+const_log_fsync_interval = 5        # seconds between forced disk syncs of the journal.
+const_log_message_batch = 128       # GP/CLI messages held before they get sent out, they are also sent at command boundaries.
+
+class LogSink(object):
+    # Writes the console messages on a background thread in batches so that logging never blocks the caller on terminal I/O.
+    # GP (arcpy.AddMessage/AddWarning/AddError) and CLI callback messages are batched by (Logger) on the calling thread instead. (flush) waits for the queue to drain.
+    const_batch_size = 128
+
+    def __init__(self, fn_emit):
+        self.m_emit = fn_emit
+        self.m_queue = queue.Queue()
+        self.m_thread = None
+        self.m_lock = threading.Lock()
+
+    def put(self, record):
+        if (self.m_thread is None):
+            with self.m_lock:
+                if (self.m_thread is None):
+                    self.m_thread = threading.Thread(target = self._run)
+                    self.m_thread.daemon = True
+                    self.m_thread.start()
+                    atexit.register(self.flush)
+        self.m_queue.put(record)
+
+    def _run(self):
+        while (True):
+            batch = [self.m_queue.get()]
+            try:
+                while (len(batch) < self.const_batch_size and
+                    batch[-1] is not None):
+                    batch.append(self.m_queue.get_nowait())
+            except queue.Empty:
+                pass
+            stop = batch[-1] is None        # (close) sentinel.
+            try:
+                records = [r for r in batch if r is not None]
+                if (len(records) > 0):
+                    self.m_emit(records)
+            except Exception as inf:
+                sys.stderr.write('log-sink: %s\n' % (str(inf)))
+            finally:
+                for record in batch:
+                    self.m_queue.task_done()
+            if (stop):
+                return
+
+    def flush(self):
+        if (self.m_thread is not None):
+            self.m_queue.join()
+        return True
+
+    def close(self):        # drains the queue and stops the thread, the next (put) starts a new one.
+        with self.m_lock:
+            if (self.m_thread is None):
+                return True
+            self.flush()
+            self.m_queue.put(None)
+            self.m_thread.join()
+            self.m_thread = None
+            if (hasattr(atexit, 'unregister')):     # python 2.x keeps the hook, (flush) is a no-op once stopped.
+                atexit.unregister(self.flush)
+        return True
+
+
 class Logger(Base.Base):
 
     const_general_text = 0
@@ -54,6 +129,7 @@ class Logger(Base.Base):
         self.duration_label = ''
         self.logNamePrefix = ''
         self.logFileName = ''
+        self.m_log_path = ''            # the last log file written by (WriteLog)
 
         if (base):
             self.setLog(base.m_log)
@@ -61,6 +137,15 @@ class Logger(Base.Base):
 
         self.isGPRun = False
 
+        # log records are streamed to an append-only journal (JSON lines) and the XML log is generated from it.
+        self.m_buffer = []
+        self.m_journal = None
+        self.m_journal_path = ''
+        self.m_last_sync = time.time()
+
+        self.m_sink = LogSink(self._emit)
+        self.m_pending = []         # (isGPRun, messageType, message) GP/CLI messages not sent yet, arcpy isn't called from other threads.
+
     @property
     def LogNamePrefix(self):
         return self.logNamePrefix
@@ -79,6 +164,7 @@ class Logger(Base.Base):
             self.start_time = datetime.now()
 
     def CloseCategory(self):
+        self._sendPending()
         if (const_start_time_node in self.projects[self.active_key].keys()):
             end_time = datetime.now()
             start_time = self.projects[self.active_key][const_start_time_node]
@@ -97,6 +183,90 @@ class Logger(Base.Base):
 
     def SetLogFolder(self, logFolder):
         self.logFolder = logFolder
+        if (self.m_journal is None or
+            os.path.dirname(self.m_journal_path) == os.path.abspath(logFolder)):
+            return
+        try:        # move the journal started before the log folder was known.
+            if (os.path.exists(logFolder) == False):
+                os.makedirs(logFolder)
+            path = os.path.join(os.path.abspath(logFolder), os.path.basename(self.m_journal_path))
+            self.m_journal.close()
+            shutil.move(self.m_journal_path, path)
+            self.m_journal_path = path
+        except:
+            pass
+        if (self.m_journal.closed):
+            self.m_journal = open(self.m_journal_path, 'a')
+
+
+    def _openJournal(self):
+        folder = tempfile.gettempdir()
+        if (self.logFolder != ''):
+            try:
+                if (os.path.exists(self.logFolder) == False):
+                    os.makedirs(self.logFolder)
+                folder = os.path.abspath(self.logFolder)
+            except:
+                pass
+        prefix = self.logNamePrefix if self.logNamePrefix != '' else 'log'
+        (fd, self.m_journal_path) = tempfile.mkstemp(prefix = '%s_' % (prefix), suffix = '.log.jsonl', dir = folder)
+        self.m_journal = os.fdopen(fd, 'a')
+
+
+    def Flush(self, sync = False):      # appends the buffered records to the journal.
+        if (len(self.m_buffer) == 0 and
+            sync == False):
+            return True
+        try:
+            if (self.m_journal is None):
+                self._openJournal()
+            for record in self.m_buffer:
+                self.m_journal.write(json.dumps(record) + '\n')
+            self.m_buffer = []
+            self.m_journal.flush()
+            if (sync or
+                time.time() - self.m_last_sync > const_log_fsync_interval):
+                os.fsync(self.m_journal.fileno())
+                self.m_last_sync = time.time()
+            return True
+        except Exception as inf:
+            print ('Error writing log journal (%s)' % (str(inf)))
+            return False
+
+
+    def Close(self):        # call once the XML log has been written, removes the journal.
+        self._sendPending()
+        self.m_sink.close()
+        self.m_buffer = []
+        if (self.m_journal is None):
+            return True
+        try:
+            self.m_journal.close()
+            os.remove(self.m_journal_path)
+        except:
+            pass
+        self.m_journal = None
+        self.m_journal_path = ''
+        return True
+
+
+    def _records(self):     # all records in the order they were logged as (category, message)
+        if (self.m_journal is not None):
+            self.m_journal.flush()
+            with open(self.m_journal_path, 'r') as reader:
+                for line in reader:
+                    if (line.strip() != ''):
+                        (key, msg) = json.loads(line)
+                        yield (key, msg)
+        for (key, msg) in self.m_buffer:
+            yield (key, msg)
+
+
+    def _append(self, key, msg):
+        self.m_buffer.append((key, msg))
+        if (len(self.m_buffer) >= const_log_buffer_size or
+            'error' in msg.keys() and msg['error']['type'] == 'critical'):
+            self.Flush('error' in msg.keys())
 
 
     def SetCurrentCategory(self, category):
@@ -110,15 +280,33 @@ class Logger(Base.Base):
 
 
     def CreateCategory(self, project):
+            self._sendPending()
             key = project.strip()
             if ((key in self.projects.keys()) == False):
-                self.projects[key] = {'logs' : { 'message' : []}}
+                self.projects[key] = {}
                 self.active_key = key
 
                 self.projects[key][const_start_time_node] = datetime.now()
                 self.command_order.append(key)
 
 
+    def GetCategoryMessages(self, category):
+        key = category.strip()
+        if ((key in self.projects.keys()) == False):
+            return []
+        return [msg for (k, msg) in self._records() if k == key]
+
+
+    def MergeCategory(self, category, messages, duration):      # adds in messages logged elsewhere (i.e. worker processes)
+        active_key = self.active_key
+        key = category.strip()
+        self.CreateCategory(key)
+        for msg in messages:
+            self._append(key, msg)
+        self.projects[key]['DurationLabel'] = "%u" % (duration)
+        self.active_key = active_key
+
+
     def Message(self, message, messageType):
             if (len(message) == 0):
                 return False
@@ -135,47 +323,107 @@ class Logger(Base.Base):
                 messageType == self.const_status_text):
                 if (messageType == self.const_status_text):
                     errorTypeText = 'status'
-                self.projects[key]['logs']['message'].append({'text': message, 'type': errorTypeText})
+                self._append(key, {'text': message, 'type': errorTypeText})
 
             elif(messageType > self.const_general_text):     #warning
                 errorTypeText = 'warning'
                 if (messageType == self.const_critical_text):
                     errorTypeText = "critical"
-                self.projects[key]['logs']['message'].append({'error' : {'type' : errorTypeText, 'text': message}})
+                self._append(key, {'error' : {'type' : errorTypeText, 'text': message}})
 
             _message = 'log-' + errorTypeText + ': ' + message     #print out error message to console while logging.
 
-            if (self.isGPRun == True):
-                _arcpy_msg = _message
+            if (self.isGPRun == False):
+                self.m_sink.put(_message)
+            if (self.isGPRun == True or
+                self.m_base):
+                self.m_pending.append((self.isGPRun, messageType, _message))
+                if (len(self.m_pending) >= const_log_message_batch or
+                    messageType == self.const_critical_text):
+                    self._sendPending()
+            return True
+
+
+    def _sendPending(self):      # sends the held GP/CLI messages, consecutive messages of the same kind as one.
+        batch = self.m_pending
+        self.m_pending = []
+        i = 0
+        while (i < len(batch)):
+            (isGPRun, messageType, _message) = batch[i]
+            group = [_message]
+            i += 1
+            while (i < len(batch) and
+                batch[i][0] == isGPRun and
+                (isGPRun == False or batch[i][1] == messageType)):
+                    group.append(batch[i][2])
+                    i += 1
+
+            if (isGPRun == True):
+                _arcpy_msg = '\n'.join(group)
                 if (messageType == self.const_warning_text):
                     arcpy.AddWarning(_arcpy_msg)
                 elif (messageType == self.const_critical_text):
                     arcpy.AddError(_arcpy_msg)
                 else:
                     arcpy.AddMessage(_arcpy_msg)
-            else:
-                print (_message)
+            elif (self.m_base):
                 msg_type = 'general'     # msg-code
-                if (self.m_base):
-                    self.m_base.invoke_cli_msg_callback(msg_type, [_message])
-            return True
+                self.m_base.invoke_cli_msg_callback(msg_type, group)
+
+
+    def _emit(self, batch):      # called by the sink thread with the queued console messages.
+        sys.stdout.write('\n'.join(batch) + '\n')
+        sys.stdout.flush()
+
+
+    def FlushMessages(self):     # sends the held GP/CLI messages and waits until the queued console messages have been written out.
+        self._sendPending()
+        return self.m_sink.flush()
+
+
+    def _writeMessages(self, keys, fragments, doc):     # XML (Message/Status) elements per category, errors nest under the preceding message.
+        pending = {}
+        for (key, msg) in self._records():
+            if ((key in keys) == False):
+                continue
+            indent = '\t\t' if key == '__root' else '\t\t\t'
+            if ('text' in msg.keys()):
+                if (key in pending.keys()):
+                    pending[key].writexml(fragments[key], indent, '\t', '\n')
+                eleMessage = doc.createElement('Status' if msg['type'] == 'status' else 'Message')
+                eleMessage.appendChild(doc.createTextNode(msg['text']))
+                pending[key] = eleMessage
+            elif ('error' in msg.keys()):
+                eleError = doc.createElement('Error')
+                eleErrorType = doc.createElement('type')
+                eleErrorType.appendChild(doc.createTextNode(msg['error']['type']))
+                eleErrorText = doc.createElement('text')
+                eleErrorText.appendChild(doc.createTextNode(msg['error']['text']))
+                eleError.appendChild (eleErrorType)
+                eleError.appendChild (eleErrorText)
+                #if warning/error begins without a parent 'Message' node, create an empty 'Message' parent node.
+                if ((key in pending.keys()) == False):
+                    pending[key] = doc.createElement('Message')
+                pending[key].appendChild(eleError)
+        for key in pending.keys():
+            indent = '\t\t' if key == '__root' else '\t\t\t'
+            pending[key].writexml(fragments[key], indent, '\t', '\n')
+
 
     def WriteLog(self, project):
 
+        self.FlushMessages()
         const_startend_time_format = "%04d%02d%02dT%02d%02d%02d"
         prj = project.strip()
-        key_command = prj
         doc  = Document()
 
-        eleDoc = doc.createElement('Projects')
-        eleParent = doc.createElement(self.projectName)
-
+        header = []
         if (self.start_time != None):
             startLogNode = doc.createElement(const_start_time_node)
             time_log_lebel = const_startend_time_format % (self.start_time.year, self.start_time.month, self.start_time.day, \
             self.start_time.hour, self.start_time.minute, self.start_time.second)
             startLogNode.appendChild(doc.createTextNode(time_log_lebel))
-            eleParent.appendChild(startLogNode)
+            header.append(startLogNode)
 
 #add start-time, end-time and the duration under each project node.
             end_time = datetime.now()
@@ -186,79 +434,19 @@ class Logger(Base.Base):
             time_log_lebel = const_startend_time_format % (end_time.year, end_time.month, end_time.day, \
             end_time.hour, end_time.minute, end_time.second)
             endLogNode.appendChild(doc.createTextNode(time_log_lebel))
-            eleParent.appendChild(endLogNode)
+            header.append(endLogNode)
 
             durationLogNode = doc.createElement('TotalDuration')
             duration = end_time - self.start_time
             durationLogNode.appendChild(doc.createTextNode("%u" % (duration.total_seconds())))
+            header.append(durationLogNode)
 
-            eleParent.appendChild(durationLogNode)
-
-
-        eleDoc.appendChild(eleParent)
-        doc.appendChild(eleDoc)
-
-        for key_ in self.command_order:
-            if (key_ == prj or key_command == '#all'):
-                if (key_command == '#all'):
-                    prj = key_
-
-                if (key_ != '__root'):
-                    eleProject = doc.createElement(prj)
-
-                msgNode = None
-                for key in self.projects[key_]:
-                    if (key == 'logs'):
-                        for msg in self.projects[prj]['logs']['message']:
-
-                            if ('text' in msg.keys()):
-                                nodeName = 'Message'
-                                if (msg['type'] == 'status'):
-                                    nodeName = 'Status'
-                                eleMessage = doc.createElement(nodeName)
-                                eleText = doc.createTextNode(msg['text'])
-                                eleMessage.appendChild(eleText)
-
-                                msgNode = eleMessage
-
-                            elif('error' in msg.keys()):
-
-                                eleError = doc.createElement('Error')
-                                eleErrorType = doc.createElement('type')
-                                eleErrorType.appendChild(doc.createTextNode(msg['error']['type']))
-
-                                eleErrorText = doc.createElement('text')
-                                eleErrorText.appendChild(doc.createTextNode(msg['error']['text']))
-
-                                eleError.appendChild (eleErrorType)
-                                eleError.appendChild (eleErrorText)
-
-                                #if warning/error begins without a parent 'Message' node, create an empty 'Message' parent node.
-                                if (msgNode == None):
-                                    msgNode = doc.createElement('Message')
-                                    eleMessage = msgNode
-
-                                msgNode.appendChild(eleError)
-
-                            if (key_ == '__root'):
-                                eleParent.appendChild(eleMessage);
-                            else:
-                                eleProject.appendChild(eleMessage)
-
-                        if ('DurationLabel' in self.projects[prj].keys()):
-                            durationLogNode = doc.createElement('Duration')
-                            durationLogNode.appendChild(doc.createTextNode(self.projects[prj]['DurationLabel']))
-
-                            if (key_ == '__root'):
-                                eleParent.appendChild(durationLogNode)
-                            else:
-                                eleProject.appendChild(durationLogNode)
-
-                        if (key_ != '__root'):
-                            eleParent.appendChild(eleProject)
-                        eleDoc.appendChild(eleParent)
-
+        keys = [k for k in self.command_order if (k == prj or prj == '#all')]
+        fragments = {}
         try:
+            for key in keys:
+                fragments[key] = tempfile.TemporaryFile('w+')
+            self._writeMessages(keys, fragments, doc)
 
             #log reports can be saved uniquely named with date and time for easy review.
             ousr_date =  datetime.now()
@@ -279,10 +467,40 @@ class Logger(Base.Base):
                     os.mkdir(self.logFolder)
 
             logPath = os.path.join(self.logFolder, recordUpdated )
+            self.m_log_path = logPath
             c = open(logPath, "w")
-            c.write(doc.toprettyxml())
+            c.write('<?xml version="1.0" ?>\n<Projects>\n')
+            if (len(header) == 0 and
+                len(keys) == 0):
+                c.write('\t<%s/>\n' % (self.projectName))
+            else:
+                c.write('\t<%s>\n' % (self.projectName))
+                for node in header:
+                    node.writexml(c, '\t\t', '\t', '\n')
+                for key in keys:
+                    indent = '\t\t' if key == '__root' else '\t\t\t'
+                    fragments[key].seek(0)
+                    is_empty = fragments[key].read(1) == ''
+                    has_duration = 'DurationLabel' in self.projects[key].keys()
+                    if (key != '__root'):
+                        if (is_empty and
+                            has_duration == False):
+                            c.write('\t\t<%s/>\n' % (key))
+                            continue
+                        c.write('\t\t<%s>\n' % (key))
+                    fragments[key].seek(0)
+                    shutil.copyfileobj(fragments[key], c)
+                    if (has_duration):
+                        durationLogNode = doc.createElement('Duration')
+                        durationLogNode.appendChild(doc.createTextNode(self.projects[key]['DurationLabel']))
+                        durationLogNode.writexml(c, indent, '\t', '\n')
+                    if (key != '__root'):
+                        c.write('\t\t</%s>\n' % (key))
+                c.write('\t</%s>\n' % (self.projectName))
+            c.write('</Projects>\n')
             c.close()
         except:
             print ("\nError creating log file.")
-
-
+        finally:
+            for key in fragments.keys():
+                fragments[key].close()
@@ -0,0 +1,130 @@
+#------------------------------------------------------------------------------
+# Copyright 2013 Esri
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#------------------------------------------------------------------------------
+# Name: metrics.py
+# Description: Collects wall/CPU timings per command, GP tool call and run phase and exports them as JSON and a Prometheus textfile.
+# Version: 20161018
+# Requirements: ArcGIS 10.1 SP1
+# Author: Esri Imagery Workflows team
+#------------------------------------------------------------------------------
+#!/usr/bin/env python
+
+import json
+import time
+
+# record kinds
+const_kind_phase = 'phase'          # config parse, Base.init, log writing.
+const_kind_command = 'command'      # a command in the chain, e.g. AR, CV1
+const_kind_gp = 'gp'                # a geoprocessing tool call.
+
+if (hasattr(time, 'process_time')):
+    _cpu_time = time.process_time
+else:
+    _cpu_time = time.clock          # python 2.x
+
+class Metrics(object):
+
+    def __init__(self, config = ''):
+        self.m_config = config
+        self.m_records = []
+        self.m_command = ''             # the command running now, GP calls are attributed to it.
+
+    def start(self):
+        return (time.time(), _cpu_time())
+
+    def add(self, kind, name, started, status = True, objectid_before = None, objectid_after = None):
+        (wall, cpu) = self.start()
+        record = {
+        'kind' : kind,
+        'name' : name,
+        'command' : self.m_command,
+        'start' : started[0],
+        'wall' : wall - started[0],
+        'cpu' : cpu - started[1],
+        'status' : status != False,
+        'objectid_before' : objectid_before,
+        'objectid_after' : objectid_after,
+        'rows_delta' : None
+        }
+        if (objectid_before is not None and
+            objectid_after is not None):
+            record['rows_delta'] = objectid_after - objectid_before
+        self.m_records.append(record)
+        return record
+
+    def merge(self, records):       # records collected elsewhere, i.e. by a worker process.
+        self.m_records.extend(records)
+
+    def wrap(self, name, fnc):      # times calls to (fnc), used for the arcpy tools called directly. The catalog delta is only known per command.
+        def timed(*args, **kwargs):
+            started = self.start()
+            status = False
+            try:
+                ret = fnc(*args, **kwargs)
+                status = True
+                return ret
+            finally:
+                self.add(const_kind_gp, name, started, status)
+        return timed
+
+    def getSummary(self):       # totals per (kind, name)
+        summary = {}
+        for record in self.m_records:
+            key = '%s:%s' % (record['kind'], record['name'])
+            if ((key in summary.keys()) == False):
+                summary[key] = {'kind' : record['kind'], 'name' : record['name'], 'count' : 0, 'failed' : 0, 'wall' : 0.0, 'cpu' : 0.0, 'rows_delta' : 0}
+            entry = summary[key]
+            entry['count'] += 1
+            entry['wall'] += record['wall']
+            entry['cpu'] += record['cpu']
+            if (record['status'] == False):
+                entry['failed'] += 1
+            if (record['rows_delta'] is not None):
+                entry['rows_delta'] += record['rows_delta']
+        return [summary[k] for k in sorted(summary.keys())]
+
+    def _label(self, value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    def toPrometheus(self):
+        metrics = [
+        ('mdcs_duration_seconds', 'gauge', 'Total wall time per MDCS phase, command or GP tool.', 'wall'),
+        ('mdcs_cpu_seconds', 'gauge', 'Total CPU time of the MDCS process per phase, command or GP tool.', 'cpu'),
+        ('mdcs_calls_total', 'counter', 'Number of times a phase, command or GP tool ran.', 'count'),
+        ('mdcs_failures_total', 'counter', 'Number of failed phases, commands or GP tool calls.', 'failed'),
+        ('mdcs_catalog_rows_added', 'gauge', 'Catalog OBJECTID delta while the command ran.', 'rows_delta')
+        ]
+        summary = self.getSummary()
+        lines = []
+        for (name, typ, help, key) in metrics:
+            lines.append('# HELP %s %s' % (name, help))
+            lines.append('# TYPE %s %s' % (name, typ))
+            for entry in summary:
+                lines.append('%s{config="%s",kind="%s",name="%s"} %s' % (name, self._label(self.m_config), entry['kind'], self._label(entry['name']), entry[key]))
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path_prefix):      # writes (path_prefix).metrics.json and (path_prefix).prom
+        try:
+            with open(path_prefix + '.metrics.json', 'w') as writer:
+                json.dump({
+                'config' : self.m_config,
+                'summary' : self.getSummary(),
+                'records' : self.m_records
+                }, writer, indent = 1)
+            with open(path_prefix + '.prom', 'w') as writer:
+                writer.write(self.toPrometheus())
+            return True
+        except Exception as inf:
+            print ('Error writing metrics (%s)' % (str(inf)))
+            return False
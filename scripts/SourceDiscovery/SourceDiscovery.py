@@ -0,0 +1,245 @@
+#------------------------------------------------------------------------------
+# Copyright 2013 Esri
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#------------------------------------------------------------------------------
+# Name: SourceDiscovery.py
+# Description: Walks the <AddRaster> data paths with a pool of directory listing threads and feeds the matching files to (AR) in chunks (-discover).
+# Version: 20161018
+# Requirements: ArcGIS 10.1 SP1
+# Author: Esri Imagery Workflows team
+#------------------------------------------------------------------------------
+#!/usr/bin/env python
+
+import os
+import re
+import json
+import fnmatch
+import threading
+try:
+    import queue
+except ImportError:
+    import Queue as queue       # python 2.x
+
+import Base
+
+class SourceDiscovery(Base.Base):
+    # Directories are listed concurrently, the directory listing cache (if any) is keyed on the directory mtime,
+    # a listing is only reused if no file got added/removed/renamed in the directory since. Only the names are
+    # cached, the files are always stat'ed as an in-place rewrite doesn't change the directory mtime (-incremental).
+
+    CDISCOVERY_CHUNK = 1000         # files per (AddRastersToMosaicDataset) call.
+    CREGEX_PREFIX = 'REGEX:'        # <filter> given as a regular expression the full path has to match, as (AddRastersToMosaicDataset) accepts it.
+
+    def __init__(self, base, workers = 1, cache_path = ''):
+        self.m_workers = max(1, workers)
+        self.m_cache_path = cache_path
+        self.m_cache = {}           # directory path -> [mtime, [file names], [sub directory names]]
+        self.m_cache_changed = False
+        self.m_lock = threading.Lock()
+        self.m_stats = {'listed' : 0, 'cached' : 0, 'files' : 0}
+
+        self.setLog(base.m_log)
+        self.m_base = base
+
+        self.loadCache()
+
+
+    def loadCache(self):
+        if (self.m_cache_path == '' or
+            os.path.exists(self.m_cache_path) == False):
+            return False
+        try:
+            with open(self.m_cache_path, 'r') as reader:
+                self.m_cache = json.load(reader)
+            for path in list(self.m_cache.keys()):
+                if (len([n for n in self.m_cache[path][1] if isinstance(n, list)]) > 0):
+                    del self.m_cache[path]      # listings cached by earlier versions held the file sizes/mtimes.
+            return True
+        except Exception as inf:
+            self.log('Source discovery: ignoring the directory listing cache (%s): %s' % (self.m_cache_path, str(inf)), self.const_warning_text)
+            self.m_cache = {}
+            return False
+
+
+    def saveCache(self):
+        if (self.m_cache_path == '' or
+            self.m_cache_changed == False):
+            return True
+        try:
+            folder = os.path.dirname(self.m_cache_path)
+            if (os.path.exists(folder) == False):
+                os.makedirs(folder)
+            Base.saveJSON(self.m_cache_path, self.m_cache)
+            self.m_cache_changed = False
+            return True
+        except Exception as inf:
+            self.log('Source discovery: unable to save the directory listing cache (%s): %s' % (self.m_cache_path, str(inf)), self.const_warning_text)
+            return False
+
+
+    def getStats(self):
+        return 'Source discovery: (%s) file(s) in (%s) directories listed, (%s) cached listings used, (%s) worker thread(s)' % \
+        (self.m_stats['files'], self.m_stats['listed'], self.m_stats['cached'], self.m_workers)
+
+
+    def isSupported(self, data_path):       # only local/UNC files and folders can be walked.
+        paths = self.getPaths(data_path)
+        if (len(paths) == 0):
+            return False
+        for path in paths:
+            if (os.path.isdir(path) == False and
+                os.path.isfile(path) == False):
+                return False
+        return True
+
+
+    def hasFolders(self, data_path):
+        for path in self.getPaths(data_path):
+            if (os.path.isdir(path)):
+                return True
+        return False
+
+
+    def getPaths(self, data_path):
+        return [p.strip() for p in data_path.split(';') if p.strip() != '']
+
+
+    def getMatcher(self, filter):       # returns fn(path, name) -> True for the files (filter) selects, None if (filter) is an invalid regular expression.
+        if (filter[:len(self.CREGEX_PREFIX)].upper() == self.CREGEX_PREFIX):
+            try:
+                expr = re.compile('(?:%s)\\Z' % (filter[len(self.CREGEX_PREFIX):]), re.IGNORECASE)
+            except re.error:
+                return None
+            return lambda path, name: expr.match(path) is not None
+        pattern = filter.lower() if filter != '' else '*'
+        return lambda path, name: fnmatch.fnmatch(name.lower(), pattern)
+
+
+    def statFiles(self, path, names):       # returns [[name, size, mtime], ..] for the files still found.
+        files = []
+        for name in names:
+            try:
+                st = os.stat(os.path.join(path, name))
+                files.append([name, st.st_size, st.st_mtime])
+            except OSError:
+                continue
+        return files
+
+
+    def listDir(self, path):        # returns ([[name, size, mtime], ..], [sub directory names])
+        mtime = os.stat(path).st_mtime
+        cached = self.m_cache.get(path)
+        if (cached is not None and
+            cached[0] == mtime):
+            with self.m_lock:
+                self.m_stats['cached'] += 1
+            return (self.statFiles(path, cached[1]), cached[2])
+
+        files = []
+        dirs = []
+        if (hasattr(os, 'scandir')):
+            for entry in os.scandir(path):
+                try:
+                    if (entry.is_dir()):
+                        dirs.append(entry.name)
+                    elif (entry.is_file()):
+                        st = entry.stat()
+                        files.append([entry.name, st.st_size, st.st_mtime])
+                except OSError:
+                    continue
+        else:       # python 2.x
+            for name in os.listdir(path):
+                full = os.path.join(path, name)
+                try:
+                    if (os.path.isdir(full)):
+                        dirs.append(name)
+                    else:
+                        st = os.stat(full)
+                        files.append([name, st.st_size, st.st_mtime])
+                except OSError:
+                    continue
+
+        with self.m_lock:
+            self.m_stats['listed'] += 1
+            if (self.m_cache_path != ''):
+                self.m_cache[path] = [mtime, [f[0] for f in files], dirs]
+                self.m_cache_changed = True
+        return (files, dirs)
+
+
+    def getChunks(self, data_path, filter, recursive):      # yields lists of (path, size, mtime) while the directories are still being listed.
+        matcher = self.getMatcher(filter)
+        chunk = []
+        roots = []
+        for path in self.getPaths(data_path):
+            if (os.path.isfile(path)):
+                st = os.stat(path)
+                chunk.append((path, st.st_size, st.st_mtime))
+            else:
+                roots.append(path)
+
+        if (len(roots) > 0):
+            work = queue.Queue()
+            results = queue.Queue()
+            pending = [len(roots)]
+
+            def worker():
+                while True:
+                    path = work.get()
+                    if (path is None):
+                        return
+                    subdirs = []
+                    try:
+                        (files, subdirs) = self.listDir(path)
+                        found = [(os.path.join(path, f[0]), f[1], f[2]) for f in files]
+                        results.put([f for f in found if matcher(f[0], os.path.basename(f[0]))])
+                    except Exception as inf:
+                        results.put(inf)
+                    with self.m_lock:
+                        if (recursive):
+                            for name in subdirs:
+                                work.put(os.path.join(path, name))
+                            pending[0] += len(subdirs)
+                        pending[0] -= 1
+                        if (pending[0] == 0):
+                            results.put(None)
+
+            threads = []
+            for i in range(0, self.m_workers):
+                thread = threading.Thread(target = worker)
+                thread.daemon = True
+                thread.start()
+                threads.append(thread)
+            for path in roots:
+                work.put(path)
+
+            try:
+                while True:
+                    found = results.get()
+                    if (found is None):
+                        break
+                    if (isinstance(found, Exception)):
+                        self.log('Source discovery: %s' % (str(found)), self.const_warning_text)
+                        continue
+                    chunk.extend(found)
+                    while (len(chunk) >= self.CDISCOVERY_CHUNK):
+                        self.m_stats['files'] += self.CDISCOVERY_CHUNK
+                        yield sorted(chunk[:self.CDISCOVERY_CHUNK])
+                        chunk = chunk[self.CDISCOVERY_CHUNK:]
+            finally:
+                for thread in threads:
+                    work.put(None)
+
+        if (len(chunk) > 0):
+            self.m_stats['files'] += len(chunk)
+            yield sorted(chunk)
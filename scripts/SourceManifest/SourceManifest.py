@@ -0,0 +1,126 @@
+#------------------------------------------------------------------------------
+# Copyright 2013 Esri
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#------------------------------------------------------------------------------
+# Name: SourceManifest.py
+# Description: Keeps a manifest of the source files ingested per mosaic dataset so (AR) only hands new/changed files to the tool (-incremental).
+# Version: 20161018
+# Requirements: ArcGIS 10.1 SP1
+# Author: Esri Imagery Workflows team
+#------------------------------------------------------------------------------
+#!/usr/bin/env python
+
+import os
+import time
+import hashlib
+import sqlite3
+
+import Base
+
+class SourceManifest(Base.Base):
+    # One sqlite db per mosaic dataset, rows are keyed on (dataset_id, path) and
+    # only get written once the tool call that added the file has succeeded.
+
+    CMANIFEST_EXT = '.manifest.sqlite'
+    CHASH_BLOCK = 1024 * 1024
+
+    def __init__(self, base, folder, use_hash = False):
+        self.m_folder = folder
+        self.m_path = ''
+        self.m_use_hash = use_hash      # compare content hashes for files with a new size/mtime, touched files are not re-added.
+        self.m_db = None
+        self.m_known = {}           # dataset_id -> {path : (size, mtime, hash)} as read from the manifest.
+
+        self.setLog(base.m_log)
+        self.m_base = base
+
+
+    def getPath(self, md_path):
+        hsh = hashlib.sha1()
+        hsh.update(md_path.lower().encode('utf-8'))
+        return os.path.join(self.m_folder, '%s_%s%s' % (os.path.basename(md_path), hsh.hexdigest()[:12], self.CMANIFEST_EXT))
+
+
+    def open(self, md_path):
+        try:
+            if (os.path.exists(self.m_folder) == False):
+                os.makedirs(self.m_folder)
+            self.m_path = self.getPath(md_path)
+            self.m_db = sqlite3.connect(self.m_path)
+            self.m_db.execute('CREATE TABLE IF NOT EXISTS sources (dataset_id TEXT, path TEXT, size INTEGER, mtime REAL, hash TEXT, added REAL, PRIMARY KEY (dataset_id, path))')
+            self.m_db.commit()
+            return True
+        except Exception as inf:
+            self.log('Source manifest: unable to open (%s): %s' % (self.m_path, str(inf)), self.const_critical_text)
+            self.m_db = None
+            return False
+
+
+    def close(self):
+        self.m_known = {}
+        if (self.m_db is not None):
+            self.m_db.close()
+            self.m_db = None
+
+
+    def getHash(self, path):
+        hsh = hashlib.sha1()
+        with open(path, 'rb') as reader:
+            block = reader.read(self.CHASH_BLOCK)
+            while (block):
+                hsh.update(block)
+                block = reader.read(self.CHASH_BLOCK)
+        return hsh.hexdigest()
+
+
+    def getChanges(self, dataset_id, files):      # returns (new, changed) lists of (path, size, mtime, hash) for the (path, size, mtime) of (files)
+        if ((dataset_id in self.m_known) == False):
+            self.m_known[dataset_id] = {}
+            for (path, size, mtime, hsh) in self.m_db.execute('SELECT path, size, mtime, hash FROM sources WHERE dataset_id = ?', (dataset_id,)):
+                self.m_known[dataset_id][path] = (size, mtime, hsh)
+        known = self.m_known[dataset_id]
+
+        new = []
+        changed = []
+        touched = []
+        for (path, size, mtime) in files:
+            if ((path in known) == False):
+                new.append((path, size, mtime, self.getHash(path) if self.m_use_hash else None))
+                continue
+            (k_size, k_mtime, k_hash) = known[path]
+            if (k_size == size and
+                k_mtime == mtime):
+                continue
+            hsh = None
+            if (self.m_use_hash):
+                hsh = self.getHash(path)
+                if (hsh == k_hash):
+                    touched.append((path, size, mtime, hsh))
+                    continue
+            changed.append((path, size, mtime, hsh))
+
+        if (len(touched) > 0):       # content unchanged, only the manifest needs the new size/mtime.
+            self.commit(dataset_id, touched)
+        return (new, changed)
+
+
+    def commit(self, dataset_id, records):
+        try:
+            now = time.time()
+            self.m_db.executemany('INSERT OR REPLACE INTO sources (dataset_id, path, size, mtime, hash, added) VALUES (?, ?, ?, ?, ?, ?)',
+            [(dataset_id, path, size, mtime, hsh, now) for (path, size, mtime, hsh) in records])
+            self.m_db.commit()
+            return True
+        except Exception as inf:
+            self.log('Source manifest: unable to update (%s): %s' % (self.m_path, str(inf)), self.const_warning_text)
+            return False
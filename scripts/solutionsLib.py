@@ -20,8 +20,11 @@
 #------------------------------------------------------------------------------
 #!/usr/bin/env python
 
-import arcpy
 import sys, os
+import time
+import tempfile
+import importlib
+import multiprocessing
 from xml.dom import minidom
 from string import ascii_letters, digits
 
@@ -29,6 +32,7 @@ scriptPath = os.path.dirname(__file__)
 sys.path.append(os.path.join(scriptPath, 'Base'))
 
 import Base
+from Base import arcpy
 
 
 class Solutions(Base.Base):
@@ -46,6 +50,9 @@ class Solutions(Base.Base):
         self.processInfo = None
         self.userInfo = None
         self.config = ''
+        self.m_user_commands = {}
+        self.m_invalid_commands = []
+        self.m_failed_nodes = []        # commands that failed in the run, including those the chain continues after.
 
 
     def getAvailableCommands(self):
@@ -74,12 +81,10 @@ class Solutions(Base.Base):
 
     def __invokeDynamicFn(self, args, processKey, fn_name, index):
         try:
-            varnames = eval('%s.__code__.co_varnames' % (fn_name))
-            varcount = eval('%s.__code__.co_argcount' % (fn_name))
-            varnames = varnames[:varcount]
-            for i in range(len(args), len(varnames)):
-                args.append(self.getProcessInfoValue(processKey, varnames[i].lower(), index))
-            for i in range(0, len(varnames)):
+            keys = Base.g_tool_cache.get(fn_name)['keys']
+            for i in range(len(args), len(keys)):
+                args.append(self.getProcessInfoValue(processKey, keys[i], index))
+            for i in range(0, len(keys)):
                 if (args[i] == '#'):    # the default marker (#) as returned by (getProcessInfoValue) gets replaced with (None)
                     args[i] = None
             setExportMosaicDatasetGeometry = Base.DynaInvoke(fn_name, args, self.__invokeDynamicFnCallback, self.m_log.Message)
@@ -93,1205 +98,1408 @@ class Solutions(Base.Base):
 
     #mapping commands to functions
     def executeCommand(self, com, index = 0):
+        handler = self.getCommand(com)
+        if (handler is None):
+            return self.executeUserCommand(com, index)
+        return handler['fnc'](self, com, index)
+
 
     #create the geodatabse to hold all relevant mosaic datasets.
-        if (com == 'CM'):
-            createMD = self.CreateMD.CreateMD(self.m_base)
-            bSuccess = createMD.init(self.config)
-            if (bSuccess):
-                bSuccess = createMD.createGeodataBase()
-                if (not bSuccess):
-                    return False
-                return createMD.createMD()
-            return False
+    def executeCM(self, com, index = 0):
+        createMD = self.getModule('CreateMD').CreateMD(self.m_base)
+        bSuccess = createMD.init(self.config)
+        if (bSuccess):
+            bSuccess = createMD.createGeodataBase()
+            if (not bSuccess):
+                return False
+            return createMD.createMD()
+        return False
+
 
     #Add custom fields to elevation mosaic datasets.
-        elif (com == 'AF'):
-            addFields = self.AddFields.AddFields(self.m_base)
-            bSuccess = addFields.init(self.config)
-            if (bSuccess):
-                return addFields.CreateFields()
-            return False
+    def executeAF(self, com, index = 0):
+        addFields = self.getModule('AddFields').AddFields(self.m_base)
+        bSuccess = addFields.init(self.config)
+        if (bSuccess):
+            return addFields.CreateFields()
+        return False
+
 
     #Add rasters/data to mosaic datasets.
-        elif (com == 'AR'):
-            addRasters = self.AddRasters.AddRasters(self.m_base)
-            bSuccess = addRasters.init(self.config)
-            if (bSuccess):
-                if (com in self.userInfo.keys()):
-                    if ('cb' in self.userInfo[com].keys()):
-                        bSuccess = addRasters.AddCallBack(self.userInfo[com]['cb'])
-                return addRasters.AddRasters()
-            return False
+    def executeAR(self, com, index = 0):
+        addRasters = self.getModule('AddRasters').AddRasters(self.m_base)
+        bSuccess = addRasters.init(self.config)
+        if (bSuccess):
+            if (com in self.userInfo.keys()):
+                if ('cb' in self.userInfo[com].keys()):
+                    bSuccess = addRasters.AddCallBack(self.userInfo[com]['cb'])
+            return addRasters.AddRasters()
+        return False
+
 
     #Create referenced mosaic datasets.
-        elif(com == 'CR'):
-            createRefMD = self.CreateRefMD.CreateReferencedMD(self.m_base)
-            bSuccess = createRefMD.init(self.config)
-            if (bSuccess):
-                return createRefMD.createReferencedMD()
-            return False
+    def executeCR(self, com, index = 0):
+        createRefMD = self.getModule('CreateRefMD').CreateReferencedMD(self.m_base)
+        bSuccess = createRefMD.init(self.config)
+        if (bSuccess):
+            return createRefMD.createReferencedMD()
+        return False
+
+
+    def executeSP(self, com, index = 0):
+        setProps = self.getModule('SetMDProperties').SetMDProperties(self.m_base)
+        bSuccess = setProps.init(self.config)
+        if (bSuccess):
+            path = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+            return setProps.setMDProperties(path)
+        return False
 
-        elif(com == 'SP'):
-            setProps = self.SetMDProperties.SetMDProperties(self.m_base)
-            bSuccess = setProps.init(self.config)
-            if (bSuccess):
-                path = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                return setProps.setMDProperties(path)
+
+    def executeCBMD(self, com, index = 0):
+        try:
+            self.m_log.Message("\tColor Balancing mosaic dataset : " + self.m_base.m_mdName, self.m_log.const_general_text)
+            fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+            processKey = 'colorbalancemosaicdataset'
+            arcpy.ColorBalanceMosaicDataset_management(fullPath,
+            self.getProcessInfoValue(processKey,'balancing_method', index),
+            self.getProcessInfoValue(processKey,'color_surface_type', index),
+            self.getProcessInfoValue(processKey,'target_raster', index),
+            self.getProcessInfoValue(processKey,'exclude_raster', index),
+            self.getProcessInfoValue(processKey,'stretch_type', index),
+            self.getProcessInfoValue(processKey,'gamma', index),
+            self.getProcessInfoValue(processKey,'block_field', index)
+            )
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
             return False
 
-        elif (com == 'CBMD'):
-            try:
-                self.m_log.Message("\tColor Balancing mosaic dataset : " + self.m_base.m_mdName, self.m_log.const_general_text)
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                processKey = 'colorbalancemosaicdataset'
-                arcpy.ColorBalanceMosaicDataset_management(fullPath,
-                self.getProcessInfoValue(processKey,'balancing_method', index),
-                self.getProcessInfoValue(processKey,'color_surface_type', index),
-                self.getProcessInfoValue(processKey,'target_raster', index),
-                self.getProcessInfoValue(processKey,'exclude_raster', index),
-                self.getProcessInfoValue(processKey,'stretch_type', index),
-                self.getProcessInfoValue(processKey,'gamma', index),
-                self.getProcessInfoValue(processKey,'block_field', index)
-                )
-                return True
-            except:
-                self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                return False
 
     #Remove Index from Mosaic dataset.
-        elif (com == 'RI'):
-            fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-            processKey = 'removeindex'
-            try:
-                self.log ("Removing Index(%s) " % (self.getProcessInfoValue(processKey, 'index_name', index)))
-                arcpy.RemoveIndex_management(fullPath,
-                self.getProcessInfoValue(processKey, 'index_name', index)
-                )
-                self.log(arcpy.GetMessages())
-                return True
-            except:
-                self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                return False
+    def executeRI(self, com, index = 0):
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        processKey = 'removeindex'
+        try:
+            self.log ("Removing Index(%s) " % (self.getProcessInfoValue(processKey, 'index_name', index)))
+            arcpy.RemoveIndex_management(fullPath,
+            self.getProcessInfoValue(processKey, 'index_name', index)
+            )
+            self.log(arcpy.GetMessages())
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
+
 
     #Remove raster/Items from Mosaic dataset.
-        elif (com == 'RRFMD'):
-            try:
-                self.m_log.Message("\tRemove rasters from mosaic dataset : " + self.m_base.m_mdName, self.m_log.const_general_text)
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                processKey = 'removerastersfrommosaicdataset'
-                arcpy.RemoveRastersFromMosaicDataset_management(fullPath,
-                self.getProcessInfoValue(processKey,'where_clause', index),
-                self.getProcessInfoValue(processKey,'update_boundary', index),
-                self.getProcessInfoValue(processKey,'mark_overviews_items', index),
-                self.getProcessInfoValue(processKey,'delete_overview_images', index),
-                self.getProcessInfoValue(processKey,'delete_item_cache', index),
-                self.getProcessInfoValue(processKey,'remove_items', index),
-                self.getProcessInfoValue(processKey,'update_cellsize_ranges', index)
-                )
-                return True
-            except:
-                self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                return False
+    def executeRRFMD(self, com, index = 0):
+        try:
+            self.m_log.Message("\tRemove rasters from mosaic dataset : " + self.m_base.m_mdName, self.m_log.const_general_text)
+            fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+            processKey = 'removerastersfrommosaicdataset'
+            arcpy.RemoveRastersFromMosaicDataset_management(fullPath,
+            self.getProcessInfoValue(processKey,'where_clause', index),
+            self.getProcessInfoValue(processKey,'update_boundary', index),
+            self.getProcessInfoValue(processKey,'mark_overviews_items', index),
+            self.getProcessInfoValue(processKey,'delete_overview_images', index),
+            self.getProcessInfoValue(processKey,'delete_item_cache', index),
+            self.getProcessInfoValue(processKey,'remove_items', index),
+            self.getProcessInfoValue(processKey,'update_cellsize_ranges', index)
+            )
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
+
 
     # Delete mosaic dataset.
-        elif (com == 'DMD'):
-            try:
-                self.m_log.Message("\tDelete Mosaic dataset  : " + self.m_base.m_mdName, self.m_log.const_general_text)
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                processKey = 'deletemosaicdataset'
-                arcpy.DeleteMosaicDataset_management(fullPath,
-                self.getProcessInfoValue(processKey,'delete_overview_images', index),
-                self.getProcessInfoValue(processKey,'delete_item_cache', index)
-                )
-                return True
-            except:
-                self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                return False
+    def executeDMD(self, com, index = 0):
+        try:
+            self.m_log.Message("\tDelete Mosaic dataset  : " + self.m_base.m_mdName, self.m_log.const_general_text)
+            fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+            processKey = 'deletemosaicdataset'
+            arcpy.DeleteMosaicDataset_management(fullPath,
+            self.getProcessInfoValue(processKey,'delete_overview_images', index),
+            self.getProcessInfoValue(processKey,'delete_item_cache', index)
+            )
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
+
 
     # Merge mosaic dataset
-        elif (com == 'MMDI'):
-            try:
-                self.m_log.Message("\tMerge mosaic dataset  Items: " + self.m_base.m_mdName, self.m_log.const_general_text)
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                processKey = 'mergemosaicdatasetitems'
-                arcpy.MergeMosaicDatasetItems_management (fullPath,
-                self.getProcessInfoValue(processKey,'where_clause', index),
-                self.getProcessInfoValue(processKey,'block_field', index),
-                self.getProcessInfoValue(processKey,'max_rows_per_merged_items', index)
-                )
-                return True
-            except:
-                self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                return False
+    def executeMMDI(self, com, index = 0):
+        try:
+            self.m_log.Message("\tMerge mosaic dataset  Items: " + self.m_base.m_mdName, self.m_log.const_general_text)
+            fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+            processKey = 'mergemosaicdatasetitems'
+            arcpy.MergeMosaicDatasetItems_management (fullPath,
+            self.getProcessInfoValue(processKey,'where_clause', index),
+            self.getProcessInfoValue(processKey,'block_field', index),
+            self.getProcessInfoValue(processKey,'max_rows_per_merged_items', index)
+            )
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
 
 
-        elif (com == 'ERF'):
-            try:
-                self.m_log.Message("\tEditing raster function : " + self.m_base.m_mdName, self.m_log.const_general_text)
-                processKey = 'editrasterfunction'
-                rfunction_path = self.getProcessInfoValue(processKey,'function_chain_definition', index)
-                if (rfunction_path.find('.rft') >-1 and rfunction_path.find('/') == -1):
-                    rfunction_path = self.m_base.const_raster_function_templates_path_ + "/" + rfunction_path
-
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-
-                lyrName = 'lyr_%s' % str(self.m_base.m_last_AT_ObjectID)
-                expression = "OBJECTID >%s" % (str(self.m_base.m_last_AT_ObjectID))
-                arcpy.MakeMosaicLayer_management(fullPath, lyrName, expression)
-
-                arcpy.EditRasterFunction_management(lyrName,
-                self.getProcessInfoValue(processKey,'edit_mosaic_dataset_item', index),
-                self.getProcessInfoValue(processKey,'edit_options', index),
-                rfunction_path,
-                self.getProcessInfoValue(processKey,'location_function_name', index),
-                )
+    def executeERF(self, com, index = 0):
+        try:
+            self.m_log.Message("\tEditing raster function : " + self.m_base.m_mdName, self.m_log.const_general_text)
+            processKey = 'editrasterfunction'
+            rfunction_path = self.getProcessInfoValue(processKey,'function_chain_definition', index)
+            if (rfunction_path.find('.rft') >-1 and rfunction_path.find('/') == -1):
+                rfunction_path = self.m_base.const_raster_function_templates_path_ + "/" + rfunction_path
 
-                arcpy.Delete_management(lyrName)
+            fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
 
-                return True
-            except:
-                self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            lyrName = 'lyr_%s' % str(self.m_base.m_last_AT_ObjectID)
+            expression = self.m_base.getObjectIDScope()
+            arcpy.MakeMosaicLayer_management(fullPath, lyrName, expression)
+
+            arcpy.EditRasterFunction_management(lyrName,
+            self.getProcessInfoValue(processKey,'edit_mosaic_dataset_item', index),
+            self.getProcessInfoValue(processKey,'edit_options', index),
+            rfunction_path,
+            self.getProcessInfoValue(processKey,'location_function_name', index),
+            )
+
+            arcpy.Delete_management(lyrName)
+
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
+
+
+    def executeANCP(self, com, index = 0):
+        self.m_log.Message("\t{}:{}".format(self.commands[com]['desc'], self.m_base.m_mdName), self.m_log.const_general_text)
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        return self.__invokeDynamicFn(
+        [fullPath],
+        'analyzecontrolpoints',
+        'arcpy.AnalyzeControlPoints_management',
+        index
+        )
+        return False
+
+
+    def executeAPCP(self, com, index = 0):
+        self.m_log.Message("\t{}:{}".format(self.commands[com]['desc'], self.m_base.m_mdName), self.m_log.const_general_text)
+        return self.__invokeDynamicFn(
+        [],
+        'appendcontrolpoints',
+        'arcpy.AppendControlPoints_management ',
+        index
+        )
+        return False
+
+
+    def executeABA(self, com, index = 0):
+        self.m_log.Message("\t{}:{}".format(self.commands[com]['desc'], self.m_base.m_mdName), self.m_log.const_general_text)
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        return self.__invokeDynamicFn(
+        [fullPath],
+        'applyblockadjustment',
+        'arcpy.ApplyBlockAdjustment_management',
+        index
+        )
+        return False
+
+
+    def executeCBA(self, com, index = 0):
+        self.m_log.Message("\t{}:{}".format(self.commands[com]['desc'], self.m_base.m_mdName), self.m_log.const_general_text)
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        return self.__invokeDynamicFn(
+        [fullPath],
+        'computeblockadjustment',
+        'arcpy.ComputeBlockAdjustment_management',
+        index
+        )
+        return False
+
+
+    def executeCCP(self, com, index = 0):
+        self.m_log.Message("\t{}:{}".format(self.commands[com]['desc'], self.m_base.m_mdName), self.m_log.const_general_text)
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        return self.__invokeDynamicFn(
+        [fullPath],
+        'computecontrolpoints',
+        'arcpy.ComputeControlPoints_management',
+        index
+        )
+        return False
+
+
+    def executeCTP(self, com, index = 0):
+        self.m_log.Message("\tCompute Tie Points : " + self.m_base.m_mdName, self.m_log.const_general_text)
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        return self.__invokeDynamicFn(
+        [fullPath],
+        'computetiepoints',
+        'arcpy.ComputeTiePoints_management',
+        index
+        )
+        return False
+
+
+    def executeAMDS(self, com, index = 0):
+        self.m_log.Message("\tAlter Mosaic Dataset Schema : " + self.m_base.m_mdName, self.m_log.const_general_text)
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        return self.__invokeDynamicFn(
+        [fullPath],
+        'altermosaicdatasetschema',
+        'arcpy.AlterMosaicDatasetSchema_management',
+        index
+        )
+        return False
+
+
+    def executeAMD(self, com, index = 0):
+        self.m_log.Message("\Analyze Mosaic Dataset : " + self.m_base.m_mdName, self.m_log.const_general_text)
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        return self.__invokeDynamicFn(
+        [fullPath],
+        'analyzemosaicdataset',
+        'arcpy.AnalyzeMosaicDataset_management',
+        index
+        )
+        return False
+
+
+    def executeBMDIC(self, com, index = 0):
+        self.m_log.Message("\Build Mosaic Dataset Item Cache : " + self.m_base.m_mdName, self.m_log.const_general_text)
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        return self.__invokeDynamicFn(
+        [fullPath],
+        'buildmosaicdatasetitemcache',
+        'arcpy.BuildMosaicDatasetItemCache_management',
+        index
+        )
+        return False
+
+
+    def executeCDA(self, com, index = 0):
+        self.m_log.Message("\Compute Dirty Area : " + self.m_base.m_mdName, self.m_log.const_general_text)
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        return self.__invokeDynamicFn(
+        [fullPath],
+        'computedirtyarea',
+        'arcpy.ComputeDirtyArea_management',
+        index
+        )
+        return False
+
+
+    def executeGEA(self, com, index = 0):
+        self.m_log.Message("\Generate Exclude Area : " + self.m_base.m_mdName, self.m_log.const_general_text)
+        return self.__invokeDynamicFn(
+        [],
+        'generateexcludearea',
+        'arcpy.GenerateExcludeArea_management',
+        index
+        )
+        return False
+
+
+    def executeCS(self, com, index = 0):
+        try:
+            self.m_log.Message("\tCalculate statistic for the mosaic dataset : " + self.m_base.m_mdName, self.m_log.const_general_text)
+            fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+            processKey = 'calculatestatistics'
+            arcpy.CalculateStatistics_management(fullPath,
+            self.getProcessInfoValue(processKey,'x_skip_factor', index),
+            self.getProcessInfoValue(processKey,'y_skip_factor', index),
+            self.getProcessInfoValue(processKey,'ignore_values', index),
+            self.getProcessInfoValue(processKey,'skip_existing', index),
+            self.getProcessInfoValue(processKey,'area_of_interest', index)
+            )
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
+
+
+    def executeBPS(self, com, index = 0):
+        try:
+            self.m_log.Message("\tBuilding Pyramids and Calculating Statistic for the mosaic dataset : " + self.m_base.m_mdName, self.m_log.const_general_text)
+            fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+            processKey = 'buildpyramidsandstatistics'
+
+            lyrName = 'lyr_%s' % str(self.m_base.m_last_AT_ObjectID)
+            expression = self.m_base.getObjectIDScope()
+            arcpy.MakeMosaicLayer_management(fullPath, lyrName, expression)
+
+            arcpy.BuildPyramidsandStatistics_management(lyrName,
+            self.getProcessInfoValue(processKey,'include_subdirectories', index),
+            self.getProcessInfoValue(processKey,'build_pyramids', index),
+            self.getProcessInfoValue(processKey,'calculate_statistics', index),
+            self.getProcessInfoValue(processKey,'BUILD_ON_SOURCE', index),
+            self.getProcessInfoValue(processKey,'block_field', index),
+            self.getProcessInfoValue(processKey,'estimate_statistics', index),
+            self.getProcessInfoValue(processKey,'x_skip_factor', index),
+            self.getProcessInfoValue(processKey,'y_skip_factor', index),
+            self.getProcessInfoValue(processKey,'ignore_values', index),
+            self.getProcessInfoValue(processKey,'pyramid_level', index),
+            self.getProcessInfoValue(processKey,'SKIP_FIRST', index),
+            self.getProcessInfoValue(processKey,'resample_technique', index),
+            self.getProcessInfoValue(processKey,'compression_type', index),
+            self.getProcessInfoValue(processKey,'compression_quality', index),
+            self.getProcessInfoValue(processKey,'skip_existing', index)
+            )
+
+            arcpy.Delete_management(lyrName)
+
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
+
+
+    def executeBP(self, com, index = 0):
+        try:
+            self.m_log.Message("\tBuilding Pyramid for the mosaic dataset/raster dataset : " + self.m_base.m_mdName, self.m_log.const_general_text)
+            fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+            processKey = 'buildpyramids'
+            arcpy.BuildPyramids_management(fullPath,
+            self.getProcessInfoValue(processKey,'pyramid_level', index),
+            self.getProcessInfoValue(processKey,'SKIP_FIRST', index),
+            self.getProcessInfoValue(processKey,'resample_technique', index),
+            self.getProcessInfoValue(processKey,'compression_type', index),
+            self.getProcessInfoValue(processKey,'compression_quality', index),
+            self.getProcessInfoValue(processKey,'skip_existing', index))
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
+
+
+    def executeBF(self, com, index = 0):
+        try:
+            self.m_log.Message("\tRecomputing footprint for the mosaic dataset: " + self.m_base.m_mdName, self.m_log.const_general_text)
+            fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+
+            processKey = 'buildfootprint'
+
+            isQuery = False
+            query = self.getProcessInfoValue(processKey, 'where_clause', index)
+            if (len(query) > 0 and
+                query != '#'):
+                    isQuery = True
+
+            expression = self.m_base.getObjectIDScope()
+            if (isQuery == True):
+                expression += ' AND %s' % (query)
+
+            args = []
+            args.append(fullPath)
+            args.append(expression)
+            args.append(self.getProcessInfoValue(processKey, 'reset_footprint', index))
+            args.append(self.getProcessInfoValue(processKey, 'min_data_value', index))
+            args.append(self.getProcessInfoValue(processKey, 'max_data_value', index))
+            args.append(self.getProcessInfoValue(processKey, 'approx_num_vertices', index))
+            args.append(self.getProcessInfoValue(processKey, 'shrink_distance', index))
+            args.append(self.getProcessInfoValue(processKey, 'maintain_edges', index))
+            args.append(self.getProcessInfoValue(processKey, 'skip_derived_images', index))
+            args.append(self.getProcessInfoValue(processKey, 'update_boundary', index))
+            args.append(self.getProcessInfoValue(processKey, 'request_size', index))
+            args.append(self.getProcessInfoValue(processKey, 'min_region_size', index))
+            args.append(self.getProcessInfoValue(processKey, 'simplification_method', index))
+            args.append(self.getProcessInfoValue(processKey, 'edge_tolerance', index))
+            args.append(self.getProcessInfoValue(processKey, 'max_sliver_size', index))
+            args.append(self.getProcessInfoValue(processKey, 'min_thinness_ratio', index))
+
+            setBuitFootprints = Base.DynaInvoke('arcpy.BuildFootprints_management', args, None, self.m_log.Message)
+            if (setBuitFootprints.init() == False):
                 return False
+            return setBuitFootprints.invoke()
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
 
-        elif (com == 'ANCP'):
-                    self.m_log.Message("\t{}:{}".format(self.commands[com]['desc'], self.m_base.m_mdName), self.m_log.const_general_text)
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                    return self.__invokeDynamicFn(
-                    [fullPath],
-                    'analyzecontrolpoints',
-                    'arcpy.AnalyzeControlPoints_management',
-                    index
-                    )
-        elif (com == 'APCP'):
-                    self.m_log.Message("\t{}:{}".format(self.commands[com]['desc'], self.m_base.m_mdName), self.m_log.const_general_text)
-                    return self.__invokeDynamicFn(
-                    [],
-                    'appendcontrolpoints',
-                    'arcpy.AppendControlPoints_management ',
-                    index
-                    )
-
-        elif (com == 'ABA'):
-                    self.m_log.Message("\t{}:{}".format(self.commands[com]['desc'], self.m_base.m_mdName), self.m_log.const_general_text)
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                    return self.__invokeDynamicFn(
-                    [fullPath],
-                    'applyblockadjustment',
-                    'arcpy.ApplyBlockAdjustment_management',
-                    index
-                    )
-
-        elif (com == 'CBA'):
-                    self.m_log.Message("\t{}:{}".format(self.commands[com]['desc'], self.m_base.m_mdName), self.m_log.const_general_text)
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                    return self.__invokeDynamicFn(
-                    [fullPath],
-                    'computeblockadjustment',
-                    'arcpy.ComputeBlockAdjustment_management',
-                    index
-                    )
-
-        elif (com == 'CCP'):
-                    self.m_log.Message("\t{}:{}".format(self.commands[com]['desc'], self.m_base.m_mdName), self.m_log.const_general_text)
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                    return self.__invokeDynamicFn(
-                    [fullPath],
-                    'computecontrolpoints',
-                    'arcpy.ComputeControlPoints_management',
-                    index
-                    )
-
-        elif (com == 'CTP'):
-                    self.m_log.Message("\tCompute Tie Points : " + self.m_base.m_mdName, self.m_log.const_general_text)
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                    return self.__invokeDynamicFn(
-                    [fullPath],
-                    'computetiepoints',
-                    'arcpy.ComputeTiePoints_management',
-                    index
-                    )
-
-        elif (com == 'AMDS'):
-                    self.m_log.Message("\tAlter Mosaic Dataset Schema : " + self.m_base.m_mdName, self.m_log.const_general_text)
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                    return self.__invokeDynamicFn(
-                    [fullPath],
-                    'altermosaicdatasetschema',
-                    'arcpy.AlterMosaicDatasetSchema_management',
-                    index
-                    )
-
-        elif (com == 'AMD'):
-                    self.m_log.Message("\Analyze Mosaic Dataset : " + self.m_base.m_mdName, self.m_log.const_general_text)
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                    return self.__invokeDynamicFn(
-                    [fullPath],
-                    'analyzemosaicdataset',
-                    'arcpy.AnalyzeMosaicDataset_management',
-                    index
-                    )
-
-        elif (com == 'BMDIC'):
-                    self.m_log.Message("\Build Mosaic Dataset Item Cache : " + self.m_base.m_mdName, self.m_log.const_general_text)
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                    return self.__invokeDynamicFn(
-                    [fullPath],
-                    'buildmosaicdatasetitemcache',
-                    'arcpy.BuildMosaicDatasetItemCache_management',
-                    index
-                    )
-
-        elif (com == 'CDA'):
-                    self.m_log.Message("\Compute Dirty Area : " + self.m_base.m_mdName, self.m_log.const_general_text)
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                    return self.__invokeDynamicFn(
-                    [fullPath],
-                    'computedirtyarea',
-                    'arcpy.ComputeDirtyArea_management',
-                    index
-                    )
-
-        elif (com == 'GEA'):
-                    self.m_log.Message("\Generate Exclude Area : " + self.m_base.m_mdName, self.m_log.const_general_text)
-                    return self.__invokeDynamicFn(
-                    [],
-                    'generateexcludearea',
-                    'arcpy.GenerateExcludeArea_management',
-                    index
-                    )
-
-        elif (com == 'CS'):
-            try:
-                self.m_log.Message("\tCalculate statistic for the mosaic dataset : " + self.m_base.m_mdName, self.m_log.const_general_text)
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                processKey = 'calculatestatistics'
-                arcpy.CalculateStatistics_management(fullPath,
-                self.getProcessInfoValue(processKey,'x_skip_factor', index),
-                self.getProcessInfoValue(processKey,'y_skip_factor', index),
-                self.getProcessInfoValue(processKey,'ignore_values', index),
-                self.getProcessInfoValue(processKey,'skip_existing', index),
-                self.getProcessInfoValue(processKey,'area_of_interest', index)
-                )
-                return True
-            except:
-                self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+
+    def executeBS(self, com, index = 0):
+        try:
+            self.m_log.Message("\tBuild Seamline for the mosaic dataset: " + self.m_base.m_mdName, self.m_log.const_general_text)
+            fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+            processKey = 'buildseamlines'
+            args = []
+            args.append(fullPath)
+            args.append(self.getProcessInfoValue(processKey,'cell_size', index))
+            args.append(self.getProcessInfoValue(processKey,'sort_method', index))
+            args.append(self.getProcessInfoValue(processKey,'sort_order', index))
+            args.append(self.getProcessInfoValue(processKey,'order_by_attribute', index))
+            args.append(self.getProcessInfoValue(processKey,'order_by_base_value', index))
+            args.append(self.getProcessInfoValue(processKey,'view_point', index))
+            args.append(self.getProcessInfoValue(processKey,'computation_method', index))
+            args.append(self.getProcessInfoValue(processKey,'blend_width', index))
+            args.append(self.getProcessInfoValue(processKey,'blend_type', index))
+            args.append(self.getProcessInfoValue(processKey,'request_size', index))
+            args.append(self.getProcessInfoValue(processKey,'request_size_type', index))
+            args.append(self.getProcessInfoValue(processKey,'blend_width_units', index))
+            args.append(self.getProcessInfoValue(processKey,'area_of_interest', index))
+            args.append(self.getProcessInfoValue(processKey,'where_clause', index))
+            args.append(self.getProcessInfoValue(processKey,'update_existing', index))
+
+            setBuitSeamlines = Base.DynaInvoke('arcpy.BuildSeamlines_management', args, None, self.m_log.Message)
+            if (setBuitSeamlines.init() == False):
                 return False
+            return setBuitSeamlines.invoke()
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
 
-        elif (com == 'BPS'):
-            try:
-                self.m_log.Message("\tBuilding Pyramids and Calculating Statistic for the mosaic dataset : " + self.m_base.m_mdName, self.m_log.const_general_text)
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                processKey = 'buildpyramidsandstatistics'
-
-                lyrName = 'lyr_%s' % str(self.m_base.m_last_AT_ObjectID)
-                expression = "OBJECTID >%s" % (str(self.m_base.m_last_AT_ObjectID))
-                arcpy.MakeMosaicLayer_management(fullPath, lyrName, expression)
-
-                arcpy.BuildPyramidsandStatistics_management(lyrName,
-                self.getProcessInfoValue(processKey,'include_subdirectories', index),
-                self.getProcessInfoValue(processKey,'build_pyramids', index),
-                self.getProcessInfoValue(processKey,'calculate_statistics', index),
-                self.getProcessInfoValue(processKey,'BUILD_ON_SOURCE', index),
-                self.getProcessInfoValue(processKey,'block_field', index),
-                self.getProcessInfoValue(processKey,'estimate_statistics', index),
-                self.getProcessInfoValue(processKey,'x_skip_factor', index),
-                self.getProcessInfoValue(processKey,'y_skip_factor', index),
-                self.getProcessInfoValue(processKey,'ignore_values', index),
-                self.getProcessInfoValue(processKey,'pyramid_level', index),
-                self.getProcessInfoValue(processKey,'SKIP_FIRST', index),
-                self.getProcessInfoValue(processKey,'resample_technique', index),
-                self.getProcessInfoValue(processKey,'compression_type', index),
-                self.getProcessInfoValue(processKey,'compression_quality', index),
-                self.getProcessInfoValue(processKey,'skip_existing', index)
-                )
 
-                arcpy.Delete_management(lyrName)
+    def executeEMDG(self, com, index = 0):
+        self.m_log.Message("\tExport mosaic dataset geometry:" + self.m_base.m_mdName, self.m_log.const_general_text)
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        return self.__invokeDynamicFn(
+        [fullPath],
+        'exportmosaicdatasetgeometry',
+        'arcpy.ExportMosaicDatasetGeometry_management',
+        index
+        )
+        return False
+
+
+    def executeEMDI(self, com, index = 0):
+        self.m_log.Message("\tExport mosaic dataset items:" + self.m_base.m_mdName, self.m_log.const_general_text)
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        return self.__invokeDynamicFn(
+        [fullPath],
+        'exportmosaicdatasetitems',
+        'arcpy.ExportMosaicDatasetItems_management',
+        index
+        )
+        return False
+
+
+    def executeSMDI(self, com, index = 0):
+        self.m_log.Message("\tSplit mosaic dataset items:" + self.m_base.m_mdName, self.m_log.const_general_text)
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        return self.__invokeDynamicFn(
+        [fullPath],
+        'splitmosaicdatasetitems',
+        'arcpy.MergeMosaicDatasetItems_management',
+        index
+        )
+        return False
+
+
+    def executeSY(self, com, index = 0):
+        self.m_log.Message("\tSynchronize mosaic dataset:" + self.m_base.m_mdName, self.m_log.const_general_text)
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        return self.__invokeDynamicFn(
+        [fullPath],
+        'synchronizemosaicdataset',
+        'arcpy.SynchronizeMosaicDataset_management',
+        index
+        )
+        return False
+
+
+    def executeCSDD(self, com, index = 0):
+        self.m_log.Message("\t{}:{}".format(self.commands[com]['desc'], self.m_base.m_mdName), self.m_log.const_general_text)
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        return self.__invokeDynamicFn(
+        [fullPath],
+        'createimagesddraft',
+        'arcpy.CreateImageSDDraft',
+        index
+        )
+        return False
+
+
+    def executeSTS(self, com, index = 0):
+        self.m_log.Message("\t{}:{}".format(self.commands[com]['desc'], self.m_base.m_mdName), self.m_log.const_general_text)
+        return self.__invokeDynamicFn(
+        [],
+        'stageservice_server',
+        'arcpy.StageService_server',
+        index
+        )
+        return False
+
+
+    def executeUSD(self, com, index = 0):
+        self.m_log.Message("\t{}".format(self.commands[com]['desc']), self.m_log.const_general_text)
+        return self.__invokeDynamicFn(
+        [],
+        'uploadservicedefinition_server',
+        'arcpy.UploadServiceDefinition_server',
+        index
+        )
+        return False
+
+
+    def executeJF(self, com, index = 0):
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        try:
+            processKey ='joinfield'
+            arcpy.JoinField_management(self.getProcessInfoValue(processKey, 'in_data', index),
+            self.getProcessInfoValue(processKey, 'in_field', index),
+            self.getProcessInfoValue(processKey, 'join_table', index),
+            self.getProcessInfoValue(processKey, 'join_field', index),
+            self.getProcessInfoValue(processKey, 'fields', index))
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
 
-                return True
-            except:
-                self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                return False
 
-        elif(com == 'BP'):
-            try:
-                self.m_log.Message("\tBuilding Pyramid for the mosaic dataset/raster dataset : " + self.m_base.m_mdName, self.m_log.const_general_text)
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                processKey = 'buildpyramids'
-                arcpy.BuildPyramids_management(fullPath,
-                self.getProcessInfoValue(processKey,'pyramid_level', index),
-                self.getProcessInfoValue(processKey,'SKIP_FIRST', index),
-                self.getProcessInfoValue(processKey,'resample_technique', index),
-                self.getProcessInfoValue(processKey,'compression_type', index),
-                self.getProcessInfoValue(processKey,'compression_quality', index),
-                self.getProcessInfoValue(processKey,'skip_existing', index))
+    def executeDN(self, com, index = 0):
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        try:
+            processKey = 'definemosaicdatasetnodata'
+
+            lyrName = 'lyr_%s' % str(self.m_base.m_last_AT_ObjectID)
+            expression = self.m_base.getObjectIDScope()
+            arcpy.MakeMosaicLayer_management(fullPath, lyrName, expression)
+
+            arcpy.DefineMosaicDatasetNoData_management(
+            lyrName,
+            self.getProcessInfoValue(processKey, 'num_bands', index),
+            self.getProcessInfoValue(processKey, 'bands_for_nodata_value', index),
+            self.getProcessInfoValue(processKey, 'bands_for_valid_data_range', index),
+            self.getProcessInfoValue(processKey, 'where_clause', index),
+            self.getProcessInfoValue(processKey, 'composite_nodata_value', index)
+            )
+            arcpy.Delete_management(lyrName)
+            return True
+
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+        return False
+
+
+    def executeIG(self, com, index = 0):
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        try:
+            processKey = 'importgeometry'
+            importPath = self.getProcessInfoValue(processKey, 'input_featureclass', index)
+            const_ig_search_ = '.gdb\\'
+            igIndx = importPath.lower().find(const_ig_search_)
+            igIndxSep = importPath.find('\\')
+
+            if (igIndxSep == igIndx + len(const_ig_search_) - 1):
+                importPath = self.prefixFolderPath(importPath, self.m_base.const_import_geometry_features_path_)
+
+            arcpy.ImportMosaicDatasetGeometry_management(
+            fullPath,
+            self.getProcessInfoValue(processKey, 'target_featureclass_type', index),
+            self.getProcessInfoValue(processKey, 'target_join_field', index),
+            importPath,
+            self.getProcessInfoValue(processKey, 'input_join_field', index)
+            )
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+        return False
+
+
+    def executeIF(self, com, index = 0):
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        processKey = 'importfieldvalues'
+
+        try:
+            joinTable = self.getProcessInfoValue(processKey, 'input_featureclass', index)
+            catalogKey = self.getProcessInfoValue(processKey, 'input_join_field', index)
+            tableKey = self.getProcessInfoValue(processKey, 'target_join_field', index)
+
+            catalogFields = Base.g_field_cache.getFields(fullPath)
+            fields = []
+            for field in arcpy.ListFields(joinTable):
+                if (field.name == "Comments" or
+                    field.name == "OBJECTID" or
+                    field.name == "Dataset_ID"):
+                    self.log("\t\tvalues exist for the field : " + field.name, self.m_log.const_general_text)
+                elif (field.name.upper() in [tableKey.upper(), catalogKey.upper()]):
+                    continue        # the join keys are read, not imported.
+                elif (field.type in ['OID', 'Geometry', 'Raster'] or
+                      (field.name.upper() in catalogFields.keys()) == False or
+                      catalogFields[field.name.upper()] in ['OID', 'Geometry', 'Raster'] or
+                      getattr(field, 'editable', True) == False):
+                    self.log("\t\tskipping the field : " + field.name + " (no editable mosaic dataset field of that name)", self.m_log.const_warning_text)
+                else:
+                    fields.append(field.name)
+            if (len(fields) == 0):
+                self.log("No fields to import from (%s)" % (joinTable), self.m_log.const_warning_text)
                 return True
-            except:
-                self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                return False
 
-        elif(com == 'BF'):
-                try:
-                    self.m_log.Message("\tRecomputing footprint for the mosaic dataset: " + self.m_base.m_mdName, self.m_log.const_general_text)
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-
-                    processKey = 'buildfootprint'
-
-                    isQuery = False
-                    query = self.getProcessInfoValue(processKey, 'where_clause', index)
-                    if (len(query) > 0 and
-                        query != '#'):
-                            isQuery = True
-
-                    expression = "OBJECTID >%s" % (str(self.m_base.m_last_AT_ObjectID))
-                    if (isQuery == True):
-                        expression += ' AND %s' % (query)
-
-                    args = []
-                    args.append(fullPath)
-                    args.append(expression)
-                    args.append(self.getProcessInfoValue(processKey, 'reset_footprint', index))
-                    args.append(self.getProcessInfoValue(processKey, 'min_data_value', index))
-                    args.append(self.getProcessInfoValue(processKey, 'max_data_value', index))
-                    args.append(self.getProcessInfoValue(processKey, 'approx_num_vertices', index))
-                    args.append(self.getProcessInfoValue(processKey, 'shrink_distance', index))
-                    args.append(self.getProcessInfoValue(processKey, 'maintain_edges', index))
-                    args.append(self.getProcessInfoValue(processKey, 'skip_derived_images', index))
-                    args.append(self.getProcessInfoValue(processKey, 'update_boundary', index))
-                    args.append(self.getProcessInfoValue(processKey, 'request_size', index))
-                    args.append(self.getProcessInfoValue(processKey, 'min_region_size', index))
-                    args.append(self.getProcessInfoValue(processKey, 'simplification_method', index))
-                    args.append(self.getProcessInfoValue(processKey, 'edge_tolerance', index))
-                    args.append(self.getProcessInfoValue(processKey, 'max_sliver_size', index))
-                    args.append(self.getProcessInfoValue(processKey, 'min_thinness_ratio', index))
-
-                    setBuitFootprints = Base.DynaInvoke('arcpy.BuildFootprints_management', args, None, self.m_log.Message)
-                    if (setBuitFootprints.init() == False):
-                        return False
-                    return setBuitFootprints.invoke()
-                except:
-                    self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                    return False
+            self.log("Reading the configuration table (%s)" % (joinTable), self.m_log.const_general_text)
+            values = {}
+            with arcpy.da.SearchCursor(joinTable, [tableKey] + fields) as rows:
+                for row in rows:
+                    values[row[0]] = row[1:]        # like (AddJoin), the last row of duplicate keys wins.
+
+            catalogKeyIndex = len(fields)
+            matched = set()
+            updatedItems = unmatchedItems = 0
+            with arcpy.da.UpdateCursor(fullPath, fields + [catalogKey]) as rows:
+                for row in rows:
+                    key = row[catalogKeyIndex]
+                    if ((key in values) == False):
+                        unmatchedItems += 1
+                        continue
+                    matched.add(key)
+                    rows.updateRow(list(values[key]) + [key])
+                    updatedItems += 1
+
+            self.log("\t\tDone calculating values for the fields (%s) on (%s) item(s)" % (', '.join(fields), updatedItems), self.m_log.const_general_text)
+            unmatchedKeys = [k for k in values.keys() if (k in matched) == False]
+            if (len(unmatchedKeys) > 0):
+                self.log("\t\t(%s) key(s) of the configuration table match no mosaic dataset item: %s%s" % (len(unmatchedKeys), ', '.join([str(k) for k in sorted(unmatchedKeys, key = str)[:20]]), ' ..' if len(unmatchedKeys) > 20 else ''), self.m_log.const_warning_text)
+            if (unmatchedItems > 0):
+                self.log("\t\t(%s) mosaic dataset item(s) have no (%s) value in the configuration table, their field values are left unchanged" % (unmatchedItems, catalogKey), self.m_log.const_general_text)
+            return True
+        except Exception as inf:
+            self.log("Import field values: %s" % (str(inf)), self.m_log.const_critical_text)
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+        return False
 
-        elif (com == 'BS'):
-                try:
-                    self.m_log.Message("\tBuild Seamline for the mosaic dataset: " + self.m_base.m_mdName, self.m_log.const_general_text)
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                    processKey = 'buildseamlines'
-                    args = []
-                    args.append(fullPath)
-                    args.append(self.getProcessInfoValue(processKey,'cell_size', index))
-                    args.append(self.getProcessInfoValue(processKey,'sort_method', index))
-                    args.append(self.getProcessInfoValue(processKey,'sort_order', index))
-                    args.append(self.getProcessInfoValue(processKey,'order_by_attribute', index))
-                    args.append(self.getProcessInfoValue(processKey,'order_by_base_value', index))
-                    args.append(self.getProcessInfoValue(processKey,'view_point', index))
-                    args.append(self.getProcessInfoValue(processKey,'computation_method', index))
-                    args.append(self.getProcessInfoValue(processKey,'blend_width', index))
-                    args.append(self.getProcessInfoValue(processKey,'blend_type', index))
-                    args.append(self.getProcessInfoValue(processKey,'request_size', index))
-                    args.append(self.getProcessInfoValue(processKey,'request_size_type', index))
-                    args.append(self.getProcessInfoValue(processKey,'blend_width_units', index))
-                    args.append(self.getProcessInfoValue(processKey,'area_of_interest', index))
-                    args.append(self.getProcessInfoValue(processKey,'where_clause', index))
-                    args.append(self.getProcessInfoValue(processKey,'update_existing', index))
-
-                    setBuitSeamlines = Base.DynaInvoke('arcpy.BuildSeamlines_management', args, None, self.m_log.Message)
-                    if (setBuitSeamlines.init() == False):
-                        return False
-                    return setBuitSeamlines.invoke()
-                except:
-                    self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                    return False
 
-        elif (com == 'EMDG'):
-                    self.m_log.Message("\tExport mosaic dataset geometry:" + self.m_base.m_mdName, self.m_log.const_general_text)
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                    return self.__invokeDynamicFn(
-                    [fullPath],
-                    'exportmosaicdatasetgeometry',
-                    'arcpy.ExportMosaicDatasetGeometry_management',
-                    index
-                    )
-
-        elif (com == 'EMDI'):
-                    self.m_log.Message("\tExport mosaic dataset items:" + self.m_base.m_mdName, self.m_log.const_general_text)
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                    return self.__invokeDynamicFn(
-                    [fullPath],
-                    'exportmosaicdatasetitems',
-                    'arcpy.ExportMosaicDatasetItems_management',
-                    index
-                    )
-
-        elif (com == 'SMDI'):
-                    self.m_log.Message("\tSplit mosaic dataset items:" + self.m_base.m_mdName, self.m_log.const_general_text)
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                    return self.__invokeDynamicFn(
-                    [fullPath],
-                    'splitmosaicdatasetitems',
-                    'arcpy.MergeMosaicDatasetItems_management',
-                    index
-                    )
-
-        elif (com == 'SY'):
-                    self.m_log.Message("\tSynchronize mosaic dataset:" + self.m_base.m_mdName, self.m_log.const_general_text)
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                    return self.__invokeDynamicFn(
-                    [fullPath],
-                    'synchronizemosaicdataset',
-                    'arcpy.SynchronizeMosaicDataset_management',
-                    index
-                    )
-
-        elif (com == 'CSDD'):
-                    self.m_log.Message("\t{}:{}".format(self.commands[com]['desc'], self.m_base.m_mdName), self.m_log.const_general_text)
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                    return self.__invokeDynamicFn(
-                    [fullPath],
-                    'createimagesddraft',
-                    'arcpy.CreateImageSDDraft',
-                    index
-                    )
-
-        elif (com == 'STS'):
-                    self.m_log.Message("\t{}:{}".format(self.commands[com]['desc'], self.m_base.m_mdName), self.m_log.const_general_text)
-                    return self.__invokeDynamicFn(
-                    [],
-                    'stageservice_server',
-                    'arcpy.StageService_server',
-                    index
-                    )
-
-        elif (com == 'USD'):
-                    self.m_log.Message("\t{}".format(self.commands[com]['desc']), self.m_log.const_general_text)
-                    return self.__invokeDynamicFn(
-                    [],
-                    'uploadservicedefinition_server',
-                    'arcpy.UploadServiceDefinition_server',
-                    index
-                    )
-
-        elif(com =='JF'):
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                try:
-                    processKey ='joinfield'
-                    arcpy.JoinField_management(self.getProcessInfoValue(processKey, 'in_data', index),
-                    self.getProcessInfoValue(processKey, 'in_field', index),
-                    self.getProcessInfoValue(processKey, 'join_table', index),
-                    self.getProcessInfoValue(processKey, 'join_field', index),
-                    self.getProcessInfoValue(processKey, 'fields', index))
-                    return True
-                except:
-                    self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                    return False
+    def executeBB(self, com, index = 0):
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        processKey = 'buildboundary'
+        self.log ("Building the boundary "+ self.getProcessInfoValue(processKey, 'simplification_method', index))
+        try:
+            arcpy.BuildBoundary_management(
+            fullPath,
+            self.getProcessInfoValue(processKey, 'where_clause', index),
+            self.getProcessInfoValue(processKey, 'append_to_existing', index),
+            self.getProcessInfoValue(processKey, 'simplification_method', index)
+            )
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
 
-        elif(com == 'DN'):
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                try:
-                    processKey = 'definemosaicdatasetnodata'
-
-                    lyrName = 'lyr_%s' % str(self.m_base.m_last_AT_ObjectID)
-                    expression = "OBJECTID >%s" % (str(self.m_base.m_last_AT_ObjectID))
-                    arcpy.MakeMosaicLayer_management(fullPath, lyrName, expression)
-
-                    arcpy.DefineMosaicDatasetNoData_management(
-                    lyrName,
-                    self.getProcessInfoValue(processKey, 'num_bands', index),
-                    self.getProcessInfoValue(processKey, 'bands_for_nodata_value', index),
-                    self.getProcessInfoValue(processKey, 'bands_for_valid_data_range', index),
-                    self.getProcessInfoValue(processKey, 'where_clause', index),
-                    self.getProcessInfoValue(processKey, 'composite_nodata_value', index)
-                    )
-                    arcpy.Delete_management(lyrName)
-                    return True
-
-                except:
-                    self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-
-        elif(com == 'IG'):
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                try:
-                    processKey = 'importgeometry'
-                    importPath = self.getProcessInfoValue(processKey, 'input_featureclass', index)
-                    const_ig_search_ = '.gdb\\'
-                    igIndx = importPath.lower().find(const_ig_search_)
-                    igIndxSep = importPath.find('\\')
-
-                    if (igIndxSep == igIndx + len(const_ig_search_) - 1):
-                        importPath = self.prefixFolderPath(importPath, self.m_base.const_import_geometry_features_path_)
-
-                    arcpy.ImportMosaicDatasetGeometry_management(
-                    fullPath,
-                    self.getProcessInfoValue(processKey, 'target_featureclass_type', index),
-                    self.getProcessInfoValue(processKey, 'target_join_field', index),
-                    importPath,
-                    self.getProcessInfoValue(processKey, 'input_join_field', index)
-                    )
-                    return True
-                except:
-                    self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-
-        elif(com == 'IF'):
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                processKey = 'importfieldvalues'
-
-                try:
-                    j = 0
-                    joinTable = self.getProcessInfoValue(processKey, 'input_featureclass', index)
-                    confTableName = os.path.basename(joinTable)
-
-                    joinFeildList = [f.name for f in arcpy.ListFields(joinTable)]
-                    self.log(joinFeildList)
-                    mlayer = os.path.basename(fullPath) +"layer" + str(j)
-                    j = j + 1
-                    arcpy.MakeMosaicLayer_management(fullPath,mlayer)
-                    self.log("Joining the mosaic dataset layer with the configuration table", self.m_log.const_general_text)
-                    mlayerJoin = arcpy.AddJoin_management(
-                    mlayer + "/Footprint",
-                    self.getProcessInfoValue(processKey, 'input_join_field', index),
-                    joinTable,
-                    self.getProcessInfoValue(processKey, 'target_join_field', index),
-                    "KEEP_ALL"
-                    )
-                    for jfl in joinFeildList:
-                        if jfl == "Comments" or jfl == "OBJECTID" or jfl == "Dataset_ID":
-                            self.log("\t\tvalues exist for the field : " + jfl, self.m_log.const_general_text)
-                        else:
-                            fieldcal ="AMD_" + mdName + "_CAT." + jfl
-                            fromfield = "["+confTableName+"." + jfl + "]"
-                            try:
-                                arcpy.CalculateField_management(mlayerJoin,fieldcal,fromfield)
-                                self.log("\t\tDone calculating values for the Field :" + fieldcal, self.m_log.const_general_text)
-                            except:
-                                self.log("Failed to calculate values for the field : " + fieldcal, self.m_log.const_warning_text)
-                                self.log(arcpy.GetMessages(), self.m_log.const_warning_text)
-                    return True
-                except:
-                    self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-
-
-        elif(com == 'BB'):
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                processKey = 'buildboundary'
-                self.log ("Building the boundary "+ self.getProcessInfoValue(processKey, 'simplification_method', index))
-                try:
-                    arcpy.BuildBoundary_management(
-                    fullPath,
-                    self.getProcessInfoValue(processKey, 'where_clause', index),
-                    self.getProcessInfoValue(processKey, 'append_to_existing', index),
-                    self.getProcessInfoValue(processKey, 'simplification_method', index)
-                    )
-                    return True
-                except:
-                    self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                    return False
 
-        # Delete fields
-        elif(com == 'DF'):
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                processKey = 'deletefield'
-                try:
-                    self.log ("Deleting fields (%s) " % (self.getProcessInfoValue(processKey, 'drop_field', index)))
-
-                    arcpy.DeleteField_management(
-                    fullPath,
-                    self.getProcessInfoValue(processKey, 'drop_field', index)
-                    )
-                    self.log(arcpy.GetMessages())
-                    return True
-                except:
-                    self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                    return False
+    # Delete fields
+    def executeDF(self, com, index = 0):
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        processKey = 'deletefield'
+        try:
+            self.log ("Deleting fields (%s) " % (self.getProcessInfoValue(processKey, 'drop_field', index)))
 
-        elif(com == 'RP'):
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                processKey = 'repairmosaicdatasetpaths'
-                self.log ("Repairing mosaic dataset paths ")
-                try:
-                    arcpy.RepairMosaicDatasetPaths_management(
-                    fullPath,
-                    self.getProcessInfoValue(processKey, 'paths_list', index),
-                    self.getProcessInfoValue(processKey, 'where_clause', index)
-                    )
-                    return True
-                except:
-                    self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                    return False
+            arcpy.DeleteField_management(
+            fullPath,
+            self.getProcessInfoValue(processKey, 'drop_field', index)
+            )
+            self.log(arcpy.GetMessages())
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
 
-        elif(com == 'SS'):
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                processKey = 'setstatistics'
-                self.log("Setting MD statistics for:" + fullPath, self.m_log.const_general_text)
-                stats_file_ss = self.m_base.getAbsPath(self.getProcessInfoValue(processKey, 'stats_file', index))
-                if stats_file_ss != '#' and stats_file_ss != '' :
-                    stats_file_ss = self.prefixFolderPath(self.getProcessInfoValue(processKey, 'stats_file', index), self.m_base.const_statistics_path_)
-
-                try:
-                    arcpy.SetRasterProperties_management(
-                    fullPath,
-                    self.getProcessInfoValue(processKey, 'data_type', index),
-                    self.getProcessInfoValue(processKey, 'statistics', index),
-                    stats_file_ss,
-                    self.getProcessInfoValue(processKey, 'nodata', index)
-                     )
-                    return True
-                except:
-                    self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                    return False
 
-        elif(com == 'CC'):
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                processKey = 'calculatecellsizeranges'
-                self.log("Calculating cell ranges for:" + fullPath, self.m_log.const_general_text)
-
-                try:
-                    arcpy.CalculateCellSizeRanges_management(
-                    fullPath,
-                    self.getProcessInfoValue(processKey, 'where_clause', index),
-                    self.getProcessInfoValue(processKey, 'do_compute_min', index),
-                    self.getProcessInfoValue(processKey, 'do_compute_max', index),
-                    self.getProcessInfoValue(processKey, 'max_range_factor', index),
-                    self.getProcessInfoValue(processKey, 'cell_size_tolerance_factor', index),
-                    self.getProcessInfoValue(processKey, 'update_missing_only', index),
-                     )
-                    return True
-                except:
-                    self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                    return False
+    def executeRP(self, com, index = 0):
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        processKey = 'repairmosaicdatasetpaths'
+        self.log ("Repairing mosaic dataset paths ")
+        try:
+            arcpy.RepairMosaicDatasetPaths_management(
+            fullPath,
+            self.getProcessInfoValue(processKey, 'paths_list', index),
+            self.getProcessInfoValue(processKey, 'where_clause', index)
+            )
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
 
-        elif(com == 'BO'):
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                processKey = 'buildoverviews'
-                self.log("Building overviews for:" + fullPath, self.m_log.const_general_text)
-
-                try:
-                    arcpy.BuildOverviews_management(
-                    fullPath,
-                    self.getProcessInfoValue(processKey, 'where_clause', index),
-                    self.getProcessInfoValue(processKey, 'define_missing_tiles', index),
-                    self.getProcessInfoValue(processKey, 'generate_overviews', index),
-                    self.getProcessInfoValue(processKey, 'generate_missing_images', index),
-                    self.getProcessInfoValue(processKey, 'regenerate_stale_images', index)
-                     )
-                    return True
-                except:
-                    self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                    return False
 
-        elif(com == 'DO'):
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                processKey = 'defineoverviews'
-                self.log("Define overviews for:" + fullPath, self.m_log.const_general_text)
-
-                try:
-                    arcpy.DefineOverviews_management(
-                    fullPath,
-                    self.getProcessInfoValue(processKey, 'overview_image_folder', index),
-                    self.getProcessInfoValue(processKey, 'in_template_dataset', index),
-                    self.getProcessInfoValue(processKey, 'extent', index),
-                    self.getProcessInfoValue(processKey, 'pixel_size', index),
-                    self.getProcessInfoValue(processKey, 'number_of_levels', index),
-                    self.getProcessInfoValue(processKey, 'tile_rows', index),
-                    self.getProcessInfoValue(processKey, 'tile_cols', index),
-                    self.getProcessInfoValue(processKey, 'overview_factor', index),
-                    self.getProcessInfoValue(processKey, 'force_overview_tiles', index),
-                    self.getProcessInfoValue(processKey, 'resampling_method', index),
-                    self.getProcessInfoValue(processKey, 'compression_method', index),
-                    self.getProcessInfoValue(processKey, 'compression_quality', index)
-                     )
-                    return True
-                except:
-                    self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                    return False
+    def executeSS(self, com, index = 0):
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        processKey = 'setstatistics'
+        self.log("Setting MD statistics for:" + fullPath, self.m_log.const_general_text)
+        stats_file_ss = self.m_base.getAbsPath(self.getProcessInfoValue(processKey, 'stats_file', index))
+        if stats_file_ss != '#' and stats_file_ss != '' :
+            stats_file_ss = self.prefixFolderPath(self.getProcessInfoValue(processKey, 'stats_file', index), self.m_base.const_statistics_path_)
+
+        try:
+            arcpy.SetRasterProperties_management(
+            fullPath,
+            self.getProcessInfoValue(processKey, 'data_type', index),
+            self.getProcessInfoValue(processKey, 'statistics', index),
+            stats_file_ss,
+            self.getProcessInfoValue(processKey, 'nodata', index)
+             )
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
 
-        elif(com == 'AI'):
-                fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                processKey = 'addindex'
-                self.log("Adding Index:" + fullPath, self.m_log.const_general_text)
 
-                maxValues = len(self.processInfo.processInfo[processKey][index])
-                isError = False
-                for indx in range(0, maxValues):
+    def executeCC(self, com, index = 0):
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        processKey = 'calculatecellsizeranges'
+        self.log("Calculating cell ranges for:" + fullPath, self.m_log.const_general_text)
 
-                    try:
-                        arcpy.AddIndex_management(fullPath,
-                        self.getProcessInfoValue(processKey, 'fields', index, indx),
-                        self.getProcessInfoValue(processKey, 'index_name', index, indx),
-                        self.getProcessInfoValue(processKey, 'unique', index, indx),
-                        self.getProcessInfoValue(processKey, 'ascending', index, indx)
-                        )
-                    except:
-                        self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                        isError = True
+        try:
+            arcpy.CalculateCellSizeRanges_management(
+            fullPath,
+            self.getProcessInfoValue(processKey, 'where_clause', index),
+            self.getProcessInfoValue(processKey, 'do_compute_min', index),
+            self.getProcessInfoValue(processKey, 'do_compute_max', index),
+            self.getProcessInfoValue(processKey, 'max_range_factor', index),
+            self.getProcessInfoValue(processKey, 'cell_size_tolerance_factor', index),
+            self.getProcessInfoValue(processKey, 'update_missing_only', index),
+             )
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
 
-                return not isError
 
+    def executeBO(self, com, index = 0):
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        processKey = 'buildoverviews'
+        self.log("Building overviews for:" + fullPath, self.m_log.const_general_text)
 
-        elif(com == 'CFC'):
-            fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-            processKey = 'cachefeatureclass'
+        try:
+            arcpy.BuildOverviews_management(
+            fullPath,
+            self.getProcessInfoValue(processKey, 'where_clause', index),
+            self.getProcessInfoValue(processKey, 'define_missing_tiles', index),
+            self.getProcessInfoValue(processKey, 'generate_overviews', index),
+            self.getProcessInfoValue(processKey, 'generate_missing_images', index),
+            self.getProcessInfoValue(processKey, 'regenerate_stale_images', index)
+             )
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
 
-            seamlineFC_name = 'AMD_' + self.m_base.m_mdName + '_SML'
-            seamlineFC_Path = os.path.join(self.m_base.m_geoPath,seamlineFC_name)
-            if (arcpy.Exists(seamlineFC_Path) == False):
-                self.log("Seamline does not exist for the mosaic dataset: " + fullPath, self.m_log.const_general_text)
-                return False
 
-            try:
-                outCFC = self.getProcessInfoValue(processKey, 'out_cache_featureclass', index).replace('\\', '/')
-            except Exception as inf:
-                self.log(str(inf), self.m_log.const_critical_text)
-                return False
+    def executeDO(self, com, index = 0):
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        processKey = 'defineoverviews'
+        self.log("Define overviews for:" + fullPath, self.m_log.const_general_text)
+
+        try:
+            arcpy.DefineOverviews_management(
+            fullPath,
+            self.getProcessInfoValue(processKey, 'overview_image_folder', index),
+            self.getProcessInfoValue(processKey, 'in_template_dataset', index),
+            self.getProcessInfoValue(processKey, 'extent', index),
+            self.getProcessInfoValue(processKey, 'pixel_size', index),
+            self.getProcessInfoValue(processKey, 'number_of_levels', index),
+            self.getProcessInfoValue(processKey, 'tile_rows', index),
+            self.getProcessInfoValue(processKey, 'tile_cols', index),
+            self.getProcessInfoValue(processKey, 'overview_factor', index),
+            self.getProcessInfoValue(processKey, 'force_overview_tiles', index),
+            self.getProcessInfoValue(processKey, 'resampling_method', index),
+            self.getProcessInfoValue(processKey, 'compression_method', index),
+            self.getProcessInfoValue(processKey, 'compression_quality', index)
+             )
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
 
-            if (outCFC.find('/') == -1):
-                outCFC = os.path.join(self.m_base.m_geoPath, outCFC)
 
-            if arcpy.Exists(outCFC):
-                self.log("Output cache feature class already exists: " + outCFC, self.m_log.const_critical_text)
-                return False
+    def executeAI(self, com, index = 0):
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        processKey = 'addindex'
+        self.log("Adding Index:" + fullPath, self.m_log.const_general_text)
 
-            (outCFC_wrk, outCFC_name) = os.path.split(outCFC)
-            self.log("Exporting seamline as a feaure class: " + outCFC, self.m_log.const_general_text)
+        maxValues = len(self.processInfo.processInfo[processKey][index])
+        isError = False
+        for indx in range(0, maxValues):
 
             try:
-                arcpy.FeatureClassToFeatureClass_conversion(seamlineFC_Path, outCFC_wrk, outCFC_name, "#", "#", "#")
+                arcpy.AddIndex_management(fullPath,
+                self.getProcessInfoValue(processKey, 'fields', index, indx),
+                self.getProcessInfoValue(processKey, 'index_name', index, indx),
+                self.getProcessInfoValue(processKey, 'unique', index, indx),
+                self.getProcessInfoValue(processKey, 'ascending', index, indx)
+                )
             except:
-                self.log('Failed to create the output featue class (%s): (%s)' % (outCFC, arcpy.GetMessages()), self.m_log.const_critical_text)
-                return False
-            try:
-                dropFList = ['BlendWidthUnits', 'BlendType', 'BlendWidth', 'ItemHash']
-                sfieldList = arcpy.ListFields(seamlineFC_Path)
-                for sfield in sfieldList:
-                    if sfield.name.lower() in dropFList:
-                        dropFList.remove(sfield.name)
+                self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+                isError = True
 
-                arcpy.DeleteField_management(outCFC, dropFList)
-            except:
-                self.log('Failed to delete the fields: ' + arcpy.GetMessages(), self.m_log.const_critical_text)
+        return not isError
 
-            catfieldList= []
-            catfield = arcpy.ListFields(fullPath)
-            for field in catfield:
-                catfieldList.append(field.name)
-            removelist = [u'OBJECTID', u'Shape', u'Raster',u'MinPS', u'MaxPS', u'HighPS', u'Category', u'Tag', u'GroupName', u'ProductName', u'CenterX', u'CenterY', u'ZOrder', u'TypeID', u'ItemTS', u'UriHash', u'Uri', u'Shape_Length', u'Shape_Area', u'SOrder', u'SLevelPS']
-            importField = list(set(catfieldList) - set(removelist))
 
-            try:
-                arcpy.JoinField_management(outCFC, "RasterID", fullPath, "OBJECTID", importField)
-            except:
-                self.log("Failed to import metadata fields:" + arcpy.GetMessages(), self.m_log.const_critical_text)
-                return False
+    def executeCFC(self, com, index = 0):
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        processKey = 'cachefeatureclass'
+
+        seamlineFC_name = 'AMD_' + self.m_base.m_mdName + '_SML'
+        seamlineFC_Path = os.path.join(self.m_base.m_geoPath,seamlineFC_name)
+        if (arcpy.Exists(seamlineFC_Path) == False):
+            self.log("Seamline does not exist for the mosaic dataset: " + fullPath, self.m_log.const_general_text)
+            return False
+
+        try:
+            outCFC = self.getProcessInfoValue(processKey, 'out_cache_featureclass', index).replace('\\', '/')
+        except Exception as inf:
+            self.log(str(inf), self.m_log.const_critical_text)
+            return False
+
+        if (outCFC.find('/') == -1):
+            outCFC = os.path.join(self.m_base.m_geoPath, outCFC)
+
+        if arcpy.Exists(outCFC):
+            self.log("Output cache feature class already exists: " + outCFC, self.m_log.const_critical_text)
+            return False
+
+        (outCFC_wrk, outCFC_name) = os.path.split(outCFC)
+        self.log("Exporting seamline as a feaure class: " + outCFC, self.m_log.const_general_text)
+
+        try:
+            arcpy.FeatureClassToFeatureClass_conversion(seamlineFC_Path, outCFC_wrk, outCFC_name, "#", "#", "#")
+        except:
+            self.log('Failed to create the output featue class (%s): (%s)' % (outCFC, arcpy.GetMessages()), self.m_log.const_critical_text)
+            return False
+        try:
+            dropFList = ['BlendWidthUnits', 'BlendType', 'BlendWidth', 'ItemHash']
+            sfieldList = arcpy.ListFields(seamlineFC_Path)
+            for sfield in sfieldList:
+                if sfield.name.lower() in dropFList:
+                    dropFList.remove(sfield.name)
+
+            arcpy.DeleteField_management(outCFC, dropFList)
+        except:
+            self.log('Failed to delete the fields: ' + arcpy.GetMessages(), self.m_log.const_critical_text)
+
+        removelist = [u'OBJECTID', u'Shape', u'Raster',u'MinPS', u'MaxPS', u'HighPS', u'Category', u'Tag', u'GroupName', u'ProductName', u'CenterX', u'CenterY', u'ZOrder', u'TypeID', u'ItemTS', u'UriHash', u'Uri', u'Shape_Length', u'Shape_Area', u'SOrder', u'SLevelPS']
+        importField = [f for f in Base.g_field_cache.getSchema(fullPath) if (f[0] in removelist) == False and f[1] in Base.field_types.keys()]
+
+        try:
+            Base.g_field_cache.invalidate(outCFC)
+            outFields = Base.g_field_cache.getFields(outCFC)
+            addFields = []
+            for (name, field_type, length) in importField:
+                outName = name
+                if (outName.upper() in outFields.keys()):       # like (JoinField), e.g. Name -> Name_1
+                    i = 1
+                    while ('%s_%s' % (name, i)).upper() in outFields.keys():
+                        i += 1
+                    outName = '%s_%s' % (name, i)
+                addFields.append((outName, Base.field_types[field_type], length if field_type == 'String' else ''))
+            Base.g_field_cache.addFields(outCFC, addFields)
+
+            self.log("Reading (%s) attribute(s) of the mosaic dataset items" % (len(importField)), self.m_log.const_general_text)
+            values = {}
+            with arcpy.da.SearchCursor(fullPath, ['OBJECTID'] + [f[0] for f in importField]) as rows:
+                for row in rows:
+                    values[row[0]] = row[1:]
+
+            empty = [None] * len(importField)
+            with arcpy.da.UpdateCursor(outCFC, ['RasterID'] + [f[0] for f in addFields]) as rows:
+                for row in rows:
+                    rows.updateRow([row[0]] + list(values.get(row[0], empty)))
+        except:
+            self.log("Failed to import metadata fields:" + arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
+
+        return True
+
 
+    def executeCV(self, com, index = 0):
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        processKey = 'calculatevalues'
+
+        max_CV = len(self.processInfo.processInfo[processKey])
+        if (index > max_CV - 1):
+            self.log('Wrong index (%s) specified for (%s). Max index is (%s)' % (index,  processKey, max_CV - 1), self.m_log.const_critical_text)
+            return False
+
+        fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        maxValues = len(self.processInfo.processInfo[processKey][index])
+        self.log("Calculate values:" + fullPath, self.m_log.const_general_text)
+
+        entries = []
+        for indx in range(0, maxValues):
+            entry = {}
+            for key in ['fieldname', 'expression', 'expression_type', 'code_block', 'query']:
+                entry[key] = self.getProcessInfoValue(processKey, key, index, indx)
+            entries.append(entry)
+
+        calculateValues = self.getModule('CalculateValues').CalculateValues(self.m_base)
+        return calculateValues.run(fullPath, entries)
+
+
+    def executeCP(self, com, index = 0):
+        self.log("Compacting file geodatabase:" + self.m_base.m_geoPath, self.m_log.const_general_text)
+
+        try:
+            arcpy.Compact_management(self.m_base.m_geoPath)
             return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
 
-        elif(com == 'CV'):
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                    processKey = 'calculatevalues'
-
-                    max_CV = len(self.processInfo.processInfo[processKey])
-                    if (index > max_CV - 1):
-                        self.log('Wrong index (%s) specified for (%s). Max index is (%s)' % (index,  processKey, max_CV - 1), self.m_log.const_critical_text)
-                        return False
-
-                    fullPath = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-                    maxValues = len(self.processInfo.processInfo[processKey][index])
-                    self.log("Calculate values:" + fullPath, self.m_log.const_general_text)
-                    isError = False
-
-                    for indx in range(0, maxValues):
-
-                        isQuery = False
-                        query = self.getProcessInfoValue(processKey, 'query', index, indx)
-                        lyrName = 'lyr_%s' % str(self.m_base.m_last_AT_ObjectID)
-                        if (query != '#'):
-                            isQuery = True
-
-                        expression = "OBJECTID >%s" % (str(self.m_base.m_last_AT_ObjectID))
-                        if (isQuery == True):
-                            expression += ' AND %s' % (query)
-                        try:
-                            arcpy.MakeMosaicLayer_management(fullPath, lyrName, expression)
-                            lyrName_footprint = lyrName + "/Footprint"
-                            arcpy.CalculateField_management(lyrName_footprint,
-                            self.getProcessInfoValue(processKey, 'fieldname', index, indx),
-                            self.getProcessInfoValue(processKey, 'expression', index, indx),
-                            self.getProcessInfoValue(processKey, 'expression_type', index, indx),
-                            self.getProcessInfoValue(processKey, 'code_block', index, indx)
-                            )
-                        except:
-                            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                            isError = True
-                        try:
-                            arcpy.Delete_management(lyrName)     # passes for unknown/uncreated layer names
-                        except:
-                            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                            isError = True
-
-                    return not isError
-
-        elif(com == 'CP'):
-                self.log("Compacting file geodatabase:" + self.m_base.m_geoPath, self.m_log.const_general_text)
-
-                try:
-                    arcpy.Compact_management(self.m_base.m_geoPath)
-                    return True
-                except:
-                    self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                    return False
 
-        elif(com == 'SE'):
-                self.log("Set environment variables on index: %s" % (index), self.m_log.const_general_text)
+    def executeSE(self, com, index = 0):
+        self.log("Set environment variables on index: %s" % (index), self.m_log.const_general_text)
 
-                node = self.m_base.m_doc.getElementsByTagName('Environment')
-                if (len(node) == 0 or
-                    index > len(node) - 1):
-                    self.log('No environment variables could be found/at index (%s)' % (index), self.m_log.const_warning_text)
-                    return False
+        node = self.getXMLNodes(self.m_base.m_doc, 'Environment')
+        if (len(node) == 0 or
+            index > len(node) - 1):
+            self.log('No environment variables could be found/at index (%s)' % (index), self.m_log.const_warning_text)
+            return False
+
+        json = {}
+        self.processEnv (node[index].firstChild, 0, json)
+
+        for l in range(0, len(json)):
+            p = str(l)
+            pIndx = -1
+            parent = json[p]['parent'].lower()
+            if (parent == 'environment'):
+                pIndx = 0
+
+            key_ = val_ = ''
+            key_len_ = len(json[p]['key'])
+            for i in range(0, key_len_):
+                typ = json[p]['type'][i]
+                if (typ != 'p'):
+                    try:
+                        k = json[p]['key'][i]
+                        v =  json[p]['val'][i]
 
-                json = {}
-                self.processEnv (node[index].firstChild, 0, json)
-
-                for l in range(0, len(json)):
-                    p = str(l)
-                    pIndx = -1
-                    parent = json[p]['parent'].lower()
-                    if (parent == 'environment'):
-                        pIndx = 0
-
-                    key_ = val_ = ''
-                    key_len_ = len(json[p]['key'])
-                    for i in range(0, key_len_):
-                        typ = json[p]['type'][i]
-                        if (typ != 'p'):
-                            try:
-                                k = json[p]['key'][i]
-                                v =  json[p]['val'][i]
-
-                                if (k == 'ClearEnvironment' or      # no use for these yet.
-                                    k ==  'ResetEnvironments'):
-                                        continue
-
-                                if (pIndx == 0):
-                                    key_  =  k
-                                    val_ =  v.strip()
-
-                                    if (val_ != ''):
-                                        arcpy.env[key_] = val_
-                                        self.log('Env[%s]=%s' % (key_, val_), self.m_log.const_general_text)
-                                    continue
-                                else:
-                                    key_ = json[p]['parent']
-
-                                val_ += json[p]['val'][i]
-                                if (i < key_len_ - 1):
-                                    val_ += ' '
-                                else:
-                                    if (val_.strip() != ''):
-                                        arcpy.env[key_] = val_
-                                        self.log('Env[%s]=%s' % (key_, val_), self.m_log.const_general_text)
-
-                            except Exception as inst:
-                                self.log(str(inst), self.m_log.const_warning_text)
+                        if (k == 'ClearEnvironment' or      # no use for these yet.
+                            k ==  'ResetEnvironments'):
                                 continue
 
-                return True     #should unable to set environment variables return False?
+                        if (pIndx == 0):
+                            key_  =  k
+                            val_ =  v.strip()
 
-        elif (com == 'MTC'):
+                            if (val_ != ''):
+                                arcpy.env[key_] = val_
+                                self.m_base.m_env_settings[key_] = val_
+                                self.log('Env[%s]=%s' % (key_, val_), self.m_log.const_general_text)
+                            continue
+                        else:
+                            key_ = json[p]['parent']
 
-            mdName = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
-            processKey = 'managetilecache'
-            self.log("Building cache for:" + mdName, self.m_log.const_general_text)
+                        val_ += json[p]['val'][i]
+                        if (i < key_len_ - 1):
+                            val_ += ' '
+                        else:
+                            if (val_.strip() != ''):
+                                arcpy.env[key_] = val_
+                                self.m_base.m_env_settings[key_] = val_
+                                self.log('Env[%s]=%s' % (key_, val_), self.m_log.const_general_text)
 
-            try:
-                arcpy.ManageTileCache_management(
-                self.getProcessInfoValue(processKey, 'in_cache_location',index),
-                self.getProcessInfoValue(processKey, 'manage_mode',index),
-                self.getProcessInfoValue(processKey, 'in_cache_name',index),
-                mdName,
-                self.getProcessInfoValue(processKey, 'tiling_scheme',index),
-                self.getProcessInfoValue(processKey, 'import_tiling_scheme',index),
-                self.getProcessInfoValue(processKey,'scales',index),
-                self.getProcessInfoValue(processKey,'area_of_interest',index),
-                self.getProcessInfoValue(processKey, 'max_cell_size',index))
+                    except Exception as inst:
+                        self.log(str(inst), self.m_log.const_warning_text)
+                        continue
 
-                return True
-            except:
-                self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+        return True     #should unable to set environment variables return False?
 
-        elif (com == 'ETC'):
-            processKey = 'exporttilecache'
-            try:
-                self.log("Exporting cache for:" + self.getProcessInfoValue(processKey, 'in_target_cache_name',index), self.m_log.const_general_text)
 
-                arcpy.ExportTileCache_management(
-                self.getProcessInfoValue(processKey, 'in_cache_source',index),
-                self.getProcessInfoValue(processKey, 'in_target_cache_folder',index),
-                self.getProcessInfoValue(processKey, 'in_target_cache_name',index),
-                self.getProcessInfoValue(processKey, 'export_cache_type',index),
-                self.getProcessInfoValue(processKey, 'storage_format_type',index),
-                self.getProcessInfoValue(processKey,'scales',index),
-                self.getProcessInfoValue(processKey,'area_of_interest',index))
+    def executeMTC(self, com, index = 0):
 
-                return True
-            except:
-                self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+        mdName = os.path.join(self.m_base.m_geoPath, self.m_base.m_mdName)
+        processKey = 'managetilecache'
+        self.log("Building cache for:" + mdName, self.m_log.const_general_text)
 
-        elif (com == 'STP'):
-            processKey = 'sharepackage'
-            try:
-                self.log("Publishing Tile Package:" + self.getProcessInfoValue(processKey, 'in_package',index), self.m_log.const_general_text)
-
-                arcpy.SharePackage_management (
-                self.getProcessInfoValue(processKey, 'in_package',index),
-                self.getProcessInfoValue(processKey, 'username',index),
-                self.getProcessInfoValue(processKey, 'password',index),
-                self.getProcessInfoValue(processKey, 'summary',index),
-                self.getProcessInfoValue(processKey, 'tags',index),
-                self.getProcessInfoValue(processKey, 'credits',index),
-                self.getProcessInfoValue(processKey,'public',index),
-                self.getProcessInfoValue(processKey, 'groups',index))
+        try:
+            arcpy.ManageTileCache_management(
+            self.getProcessInfoValue(processKey, 'in_cache_location',index),
+            self.getProcessInfoValue(processKey, 'manage_mode',index),
+            self.getProcessInfoValue(processKey, 'in_cache_name',index),
+            mdName,
+            self.getProcessInfoValue(processKey, 'tiling_scheme',index),
+            self.getProcessInfoValue(processKey, 'import_tiling_scheme',index),
+            self.getProcessInfoValue(processKey,'scales',index),
+            self.getProcessInfoValue(processKey,'area_of_interest',index),
+            self.getProcessInfoValue(processKey, 'max_cell_size',index))
 
-                return True
-            except:
-                self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
-                return False
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+        return False
 
-        else:
 
-            # The command could be a user defined function externally defined in the module (MDCS_UC.py). Let's invoke it.
-            data = {
-            'log' : self.m_log,
-            'workspace' : self.m_base.m_geoPath,
-            'mosaicdataset' : self.m_base.m_mdName,
-            'mdcs' : self.m_base.m_doc
-            }
-            return self.invoke_user_function(com, data)
+    def executeETC(self, com, index = 0):
+        processKey = 'exporttilecache'
+        try:
+            self.log("Exporting cache for:" + self.getProcessInfoValue(processKey, 'in_target_cache_name',index), self.m_log.const_general_text)
+
+            arcpy.ExportTileCache_management(
+            self.getProcessInfoValue(processKey, 'in_cache_source',index),
+            self.getProcessInfoValue(processKey, 'in_target_cache_folder',index),
+            self.getProcessInfoValue(processKey, 'in_target_cache_name',index),
+            self.getProcessInfoValue(processKey, 'export_cache_type',index),
+            self.getProcessInfoValue(processKey, 'storage_format_type',index),
+            self.getProcessInfoValue(processKey,'scales',index),
+            self.getProcessInfoValue(processKey,'area_of_interest',index))
+
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+        return False
+
+
+    def executeSTP(self, com, index = 0):
+        processKey = 'sharepackage'
+        try:
+            self.log("Publishing Tile Package:" + self.getProcessInfoValue(processKey, 'in_package',index), self.m_log.const_general_text)
+
+            arcpy.SharePackage_management (
+            self.getProcessInfoValue(processKey, 'in_package',index),
+            self.getProcessInfoValue(processKey, 'username',index),
+            self.getProcessInfoValue(processKey, 'password',index),
+            self.getProcessInfoValue(processKey, 'summary',index),
+            self.getProcessInfoValue(processKey, 'tags',index),
+            self.getProcessInfoValue(processKey, 'credits',index),
+            self.getProcessInfoValue(processKey,'public',index),
+            self.getProcessInfoValue(processKey, 'groups',index))
+
+            return True
+        except:
+            self.log(arcpy.GetMessages(), self.m_log.const_critical_text)
+            return False
+
 
-        return False            #main function body return, no matching command found!
+    def executeUserCommand(self, com, index = 0):
 
+        # The command could be a user defined function externally defined in the module (MDCS_UC.py). Let's invoke it.
+        data = {
+        'log' : self.m_log,
+        'workspace' : self.m_base.m_geoPath,
+        'mosaicdataset' : self.m_base.m_mdName,
+        'mdcs' : self.m_base.m_doc
+        }
+        return self.invoke_user_function(com, data)
 
 
+    # command registry, command code -> handler. (module) is the component module the handler needs (loaded on first use),
+    # (process) the config <Processes> block the command reads its arguments from.
     commands = \
     {
     'CM' :
         {   'desc' : 'Create a new mosaic dataset.',
-            'fnc' : executeCommand
+            'fnc' : executeCM,
+            'module' : 'CreateMD',
+            'process' : None
         },
     'CR' :
         {   'desc' : 'Create new referenced mosaic dataset.',
-            'fnc' : executeCommand
+            'fnc' : executeCR,
+            'module' : 'CreateRefMD',
+            'process' : None
         },
     'AF' :
         {   'desc' : 'Add fields.',
-            'fnc' : executeCommand
+            'fnc' : executeAF,
+            'module' : 'AddFields',
+            'process' : None
         },
     'AR' :
         {   'desc' : 'Add rasters/data to a mosaic dataset.',
-            'fnc' : executeCommand
+            'fnc' : executeAR,
+            'module' : 'AddRasters',
+            'process' : None
         },
     'BF' :
         {   'desc' : 'Build footprint.',
-            'fnc' : executeCommand
+            'fnc' : executeBF,
+            'module' : None,
+            'process' : 'buildfootprint'
         },
     'JF' :
         {   'desc' : 'Join the content of two tables based on a common attribute field.',
-            'fnc' : executeCommand
+            'fnc' : executeJF,
+            'module' : None,
+            'process' : 'joinfield'
         },
     'BS' :
         {   'desc' : 'Build Seamlines.',
-            'fnc' : executeCommand
+            'fnc' : executeBS,
+            'module' : None,
+            'process' : 'buildseamlines'
         },
     'BP' :
         {   'desc' : 'Build Pyramid.',
-            'fnc' : executeCommand
+            'fnc' : executeBP,
+            'module' : None,
+            'process' : 'buildpyramids'
         },
     'ANCP' :
         {   'desc' : 'Analyze Control Points.',
-            'fnc' : executeCommand
+            'fnc' : executeANCP,
+            'module' : None,
+            'process' : 'analyzecontrolpoints'
         },
     'APCP' :
         {   'desc' : 'Append Control Points.',
-            'fnc' : executeCommand
+            'fnc' : executeAPCP,
+            'module' : None,
+            'process' : 'appendcontrolpoints'
         },
     'ABA' :
         {   'desc' : 'Apply Block Adjustment.',
-            'fnc' : executeCommand
+            'fnc' : executeABA,
+            'module' : None,
+            'process' : 'applyblockadjustment'
         },
     'CBA' :
         {   'desc' : 'Compute Block Adjustment.',
-            'fnc' : executeCommand
+            'fnc' : executeCBA,
+            'module' : None,
+            'process' : 'computeblockadjustment'
         },
     'CCP' :
         {   'desc' : 'Compute Control Points.',
-            'fnc' : executeCommand
+            'fnc' : executeCCP,
+            'module' : None,
+            'process' : 'computecontrolpoints'
         },
     'CTP' :
         {   'desc' : 'Compute Tie Points.',
-            'fnc' : executeCommand
+            'fnc' : executeCTP,
+            'module' : None,
+            'process' : 'computetiepoints'
         },
     'AMDS' :
         {   'desc' : 'Alter Mosaic Dataset Schema.',
-            'fnc' : executeCommand
+            'fnc' : executeAMDS,
+            'module' : None,
+            'process' : 'altermosaicdatasetschema'
         },
     'AMD' :
         {   'desc' : 'Analyze Mosaic Dataset.',
-            'fnc' : executeCommand
+            'fnc' : executeAMD,
+            'module' : None,
+            'process' : 'analyzemosaicdataset'
         },
     'BMDIC' :
         {   'desc' : 'Build Mosaic Dataset Item Cache.',
-            'fnc' : executeCommand
+            'fnc' : executeBMDIC,
+            'module' : None,
+            'process' : 'buildmosaicdatasetitemcache'
         },
     'CDA' :
         {   'desc' : 'Compute Dirty Area.',
-            'fnc' : executeCommand
+            'fnc' : executeCDA,
+            'module' : None,
+            'process' : 'computedirtyarea'
         },
     'GEA' :
         {   'desc' : 'Generate Exclude Area.',
-            'fnc' : executeCommand
+            'fnc' : executeGEA,
+            'module' : None,
+            'process' : 'generateexcludearea'
         },
     'CS' :
         {   'desc' : 'Calculate Statistics.',
-            'fnc' : executeCommand
+            'fnc' : executeCS,
+            'module' : None,
+            'process' : 'calculatestatistics'
         },
     'RP' :
         {   'desc' : 'Repair mosaic dataset paths',
-            'fnc' : executeCommand
+            'fnc' : executeRP,
+            'module' : None,
+            'process' : 'repairmosaicdatasetpaths'
         },
     'CBMD' :
         {   'desc' : 'Color balance mosaic dataset.',
-            'fnc' : executeCommand
+            'fnc' : executeCBMD,
+            'module' : None,
+            'process' : 'colorbalancemosaicdataset'
         },
     'RRFMD' :
         {   'desc' : 'Remove Rasters from Mosaic ataset.',
-            'fnc' : executeCommand
+            'fnc' : executeRRFMD,
+            'module' : None,
+            'process' : 'removerastersfrommosaicdataset'
         },
     'DMD' :
         {   'desc' : 'Delete Mosaic dataset.',
-            'fnc' : executeCommand
+            'fnc' : executeDMD,
+            'module' : None,
+            'process' : 'deletemosaicdataset'
         },
-   'MMDI' :
+    'MMDI' :
         {   'desc' : 'Merge Mosaic dataset items.',
-            'fnc' : executeCommand
+            'fnc' : executeMMDI,
+            'module' : None,
+            'process' : 'mergemosaicdatasetitems'
         },
     'BPS' :
         {   'desc' : 'Build pyramid and Statistics.',
-            'fnc' : executeCommand
+            'fnc' : executeBPS,
+            'module' : None,
+            'process' : 'buildpyramidsandstatistics'
         },
     'ERF' :
         {   'desc' : 'Edit raster function.',
-            'fnc' : executeCommand
+            'fnc' : executeERF,
+            'module' : None,
+            'process' : 'editrasterfunction'
         },
     'DN' :
         {   'desc' : 'Define no data values.',
-            'fnc' : executeCommand
+            'fnc' : executeDN,
+            'module' : None,
+            'process' : 'definemosaicdatasetnodata'
         },
     'SP' :
         {   'desc' : 'Set mosaic dataset properties.',
-            'fnc' : executeCommand
+            'fnc' : executeSP,
+            'module' : 'SetMDProperties',
+            'process' : None
         },
     'IG' :
         {   'desc' : 'Import mosaic dataset geometry.',
-            'fnc' : executeCommand
+            'fnc' : executeIG,
+            'module' : None,
+            'process' : 'importgeometry'
         },
     'DF' :
         {   'desc' : 'Delete field.',
-            'fnc' : executeCommand
+            'fnc' : executeDF,
+            'module' : None,
+            'process' : 'deletefield'
         },
     'IF' :
         {   'desc' : 'Import field values/calculate fields.',
-            'fnc' : executeCommand
+            'fnc' : executeIF,
+            'module' : None,
+            'process' : 'importfieldvalues'
         },
     'BB' :
         {   'desc' : 'Build boundary.',
-            'fnc' : executeCommand
+            'fnc' : executeBB,
+            'module' : None,
+            'process' : 'buildboundary'
         },
     'SS' :
         {   'desc' : 'Set statistics for a raster or mosaic dataset.',
-            'fnc' : executeCommand
+            'fnc' : executeSS,
+            'module' : None,
+            'process' : 'setstatistics'
         },
     'CC' :
         {   'desc' : 'Computes the minimum and maximum cell sizes for the rasters in a mosaic dataset.',
-            'fnc' : executeCommand
+            'fnc' : executeCC,
+            'module' : None,
+            'process' : 'calculatecellsizeranges'
         },
     'BO' :
         {   'desc' : 'Defines and generates overviews for a mosaic dataset.',
-            'fnc' : executeCommand
+            'fnc' : executeBO,
+            'module' : None,
+            'process' : 'buildoverviews'
         },
     'DO' :
         {   'desc' : 'Defines the tiling schema and properties of the preprocessed raster datasets.',
-            'fnc' : executeCommand
+            'fnc' : executeDO,
+            'module' : None,
+            'process' : 'defineoverviews'
         },
     'AI' :
         {   'desc' : 'Adds attribute index on the mosaic dataset.',
-            'fnc' : executeCommand
+            'fnc' : executeAI,
+            'module' : None,
+            'process' : 'addindex'
         },
     'RI' :
         {   'desc' : 'Removes attribute index on the mosaic dataset.',
-            'fnc' : executeCommand
+            'fnc' : executeRI,
+            'module' : None,
+            'process' : 'removeindex'
         },
     'CFC' :
         {   'desc' : 'Create cache feature class.',
-            'fnc' : executeCommand
+            'fnc' : executeCFC,
+            'module' : None,
+            'process' : 'cachefeatureclass'
         },
     'CV' :
         {   'desc' : 'Calculate mosaic dataset values.',
-            'fnc' : executeCommand
+            'fnc' : executeCV,
+            'module' : None,
+            'process' : 'calculatevalues'
         },
     'CP' :
         {   'desc' : 'Compact file geodatabase.',
-            'fnc' : executeCommand
+            'fnc' : executeCP,
+            'module' : None,
+            'process' : None
         },
     'SY' :
         {   'desc' : 'Synchronize mosaic dataset.',
-            'fnc' : executeCommand
+            'fnc' : executeSY,
+            'module' : None,
+            'process' : 'synchronizemosaicdataset'
         },
     'SE' :
         {   'desc' : 'Set environment variables.',
-            'fnc' : executeCommand
+            'fnc' : executeSE,
+            'module' : None,
+            'process' : None
         },
     'MTC' :
         {   'desc' : 'Manage Tile Cache.',
-            'fnc' : executeCommand
+            'fnc' : executeMTC,
+            'module' : None,
+            'process' : 'managetilecache'
         },
     'ETC' :
         {   'desc' : 'Export Tile Cache.',
-            'fnc' : executeCommand
+            'fnc' : executeETC,
+            'module' : None,
+            'process' : 'exporttilecache'
         },
     'STP' :
         {   'desc' : 'Share Package.',
-            'fnc' : executeCommand
+            'fnc' : executeSTP,
+            'module' : None,
+            'process' : 'sharepackage'
         },
     'EMDG' :
         {   'desc' : 'Export mosaic dataset geometry.',
-            'fnc' : executeCommand
+            'fnc' : executeEMDG,
+            'module' : None,
+            'process' : 'exportmosaicdatasetgeometry'
         },
     'EMDI' :
         {   'desc' : 'Export mosaic dataset items.',
-            'fnc' : executeCommand
+            'fnc' : executeEMDI,
+            'module' : None,
+            'process' : 'exportmosaicdatasetitems'
         },
     'SMDI' :
         {   'desc' : 'Split mosaic dataset items.',
-            'fnc' : executeCommand
+            'fnc' : executeSMDI,
+            'module' : None,
+            'process' : 'splitmosaicdatasetitems'
         },
     'CSDD' :
         {   'desc' : 'Create an image service definition draft file.',
-            'fnc' : executeCommand
+            'fnc' : executeCSDD,
+            'module' : None,
+            'process' : 'createimagesddraft'
         },
     'STS' :
         {   'desc' : 'Stages a service definition.',
-            'fnc' : executeCommand
+            'fnc' : executeSTS,
+            'module' : None,
+            'process' : 'stageservice_server'
         },
     'USD' :
         {   'desc' : 'Uploads and publishes a service definition to a specified server.',
-            'fnc' : executeCommand
+            'fnc' : executeUSD,
+            'module' : None,
+            'process' : 'uploadservicedefinition_server'
         }
     }
 
 
     #mapping of config/component paths.
 
-    base_path_ = scriptPath + '\\'
+    base_path_ = os.path.join(scriptPath, '')
 
     com_locations = \
     {
@@ -1303,6 +1511,10 @@ class Solutions(Base.Base):
         {
             'pyc' : base_path_ + 'AddFields/',
         },
+    'CalculateValues' :
+        {
+            'pyc' : base_path_ + 'CalculateValues/',
+        },
     'AddRasters' :
         {
             'pyc' : base_path_ + 'AddRasters/',
@@ -1314,11 +1526,41 @@ class Solutions(Base.Base):
     'CreateRefMD' :
         {
             'pyc' : base_path_ + 'CreateRefMD/',
+            'deps' : ['SetMDProperties']
         },
     'ProcessInfo' :
         {
             'pyc' : base_path_ + 'ProcessInfo/',
         },
+    'Scheduler' :
+        {
+            'pyc' : base_path_ + 'Scheduler/',
+        },
+    'ConfigCache' :
+        {
+            'pyc' : base_path_ + 'ConfigCache/',
+        },
+    'Planner' :
+        {
+            'pyc' : base_path_ + 'Planner/',
+            'deps' : ['Scheduler']
+        },
+    'Backend' :
+        {
+            'pyc' : base_path_ + 'Backend/',
+        },
+    'Checkpoint' :
+        {
+            'pyc' : base_path_ + 'Checkpoint/',
+        },
+    'SourceManifest' :
+        {
+            'pyc' : base_path_ + 'SourceManifest/',
+        },
+    'SourceDiscovery' :
+        {
+            'pyc' : base_path_ + 'SourceDiscovery/',
+        },
     'Base' :
         {
             'pyc' : base_path_ + 'Base/',
@@ -1326,24 +1568,58 @@ class Solutions(Base.Base):
     }
 
 
-    #update environment path to include where components reside.
-    sys.path.append(com_locations['CreateMD']['pyc'])
-    sys.path.append(com_locations['AddFields']['pyc'])
-    sys.path.append(com_locations['AddRasters']['pyc'])
-    sys.path.append(com_locations['CreateRefMD']['pyc'])
-    sys.path.append(com_locations['SetMDProperties']['pyc'])
-    sys.path.append(com_locations['ProcessInfo']['pyc'])
-    sys.path.append(com_locations['Base']['pyc'])
+    def getModule(self, name):      # imports the component module (name) on first use, components not used by the run are never loaded.
+        if (name in sys.modules):
+            return sys.modules[name]
+        location = self.com_locations[name]
+        if ('deps' in location.keys()):
+            for dep in location['deps']:
+                self.getModule(dep)
+        if ((location['pyc'] in sys.path) == False):
+            sys.path.append(location['pyc'])
+        return importlib.import_module(name)
+
+
+    def setBackend(self, backend, state = None):     # (arcpy) or (memory[:latency in seconds]), (state) seeds the in-memory datasets.
+        values = backend.split(':')
+        name = values[0].lower()
+        if (name == 'arcpy'):
+            arcpy.reset()       # an earlier run in this process may have switched to the in-memory backend.
+            self.m_base.m_backend = name
+            return True
+        if (name != 'memory'):
+            self.log('Unknown backend (%s)' % (backend), self.const_critical_text)
+            return False
+        try:
+            latency = float(values[1]) if len(values) > 1 else 0.0
+        except:
+            self.log('Invalid backend latency (%s)' % (backend), self.const_critical_text)
+            return False
+        memory = self.getModule('Backend').MemoryBackend(latency)
+        if (state is not None):
+            memory.setState(state)
+        arcpy.setModule(memory, name)
+        self.m_base.m_backend = backend
+        self.log('Using the in-memory geoprocessing backend, tool latency (%s) s' % (latency), self.const_general_text)
+        return True
+
+
+    def getCommand(self, cmd):      # returns the registered command handler or None.
+        if (cmd in self.m_user_commands.keys()):
+            return self.m_user_commands[cmd]
+        if (cmd in self.commands.keys()):
+            return self.commands[cmd]
+        return None
 
 
-    #import all the modules required for the MDCS project.
-    #import Base
-    import CreateMD
-    import AddFields
-    import AddRasters
-    import SetMDProperties
-    import CreateRefMD
-    import ProcessInfo
+    def registerUserCommand(self, cmd):     # user defined functions in (MDCS_UC) get registered for the run like any other command.
+        self.m_user_commands[cmd] = {
+        'desc' : 'User defined command (%s)' % (cmd),
+        'fnc' : Solutions.executeUserCommand,
+        'module' : None,
+        'process' : None
+        }
+        return self.m_user_commands[cmd]
 
 
     def getProcessInfoValue(self, process, key, index = 0, indx = -1):
@@ -1362,14 +1638,43 @@ class Solutions(Base.Base):
         return '#'
 
 
-    def run(self, conf, com, info):
+    def load(self):
 
-        self.config = conf       #configuration/XML template
-        self.userInfo = info     #callback information for commands /e.t.c.
+        cache = entry = None
+        if (self.m_base.m_cache_folder != ''):
+            cache = self.getModule('ConfigCache').ConfigCache(self.m_base, self.m_base.m_cache_folder)
+            t0 = time.time()
+            entry = cache.load(self.config)
+            if (entry is not None):
+                self.log('Config cache: hit (%s) in (%.1f) ms' % (cache.m_key, (time.time() - t0) * 1000), self.const_general_text)
+            else:
+                self.log('Config cache: miss (%s)' % (cache.m_key), self.const_general_text)
+            Base.g_tool_cache.load(self.getToolCachePath())
+            Base.g_env_probe.load(self.getEnvProbePath())
 
         try:
-            self.m_base.m_doc = minidom.parse(self.config)
-            (ret, msg) = self.m_base.init()
+            t0 = time.time()
+            if (Base.g_metrics is not None):
+                t1 = Base.g_metrics.start()
+            if (entry is not None):
+                self.m_base.m_doc = minidom.parseString(entry['xml'].encode('utf-8'))
+                self.m_base.m_config_resolved = True
+                self.m_base.m_workspace = entry['workspace']
+                self.m_base.m_geodatabase = entry['geodatabase']
+                self.m_base.m_mdName = entry['md']
+                self.m_base.m_compiled_config['addrasters'] = entry['addrasters']
+            else:
+                self.m_base.m_doc = minidom.parse(self.config)
+            self.log('Config parsed in (%.1f) ms' % ((time.time() - t0) * 1000), self.const_general_text)
+            if (Base.g_metrics is not None):
+                Base.g_metrics.add('phase', 'config_parse', t1)
+                t1 = Base.g_metrics.start()
+            if (self.m_base.m_validate_only):
+                (ret, msg) = self.m_base.resolveConfig()
+            else:
+                (ret, msg) = self.m_base.init()
+            if (Base.g_metrics is not None):
+                Base.g_metrics.add('phase', 'init', t1, ret)
             if (ret == False):
                 if (msg == self.m_base.const_init_ret_version or
                     msg == self.m_base.const_init_ret_sde or
@@ -1381,34 +1686,33 @@ class Solutions(Base.Base):
             self.const_critical_text)
             return False
 
-        self.processInfo = self.ProcessInfo.ProcessInfo(self.m_base)
+        self.processInfo = self.getModule('ProcessInfo').ProcessInfo(self.m_base)
+        if (entry is not None):
+            return self.processInfo.setProcessInfo(self.config, entry['processinfo'])
+
         bSuccess = self.processInfo.init(self.config)
         if (bSuccess == False):
             return False
 
-        bSuccess = self.processInfo.hasProcessInfo
+        if (cache is not None):
+            addRasters = self.getModule('AddRasters').AddRasters(self.m_base)
+            if (addRasters.readConfig() == True):
+                cache.save({
+                'xml' : self.m_base.m_doc.toxml(),
+                'workspace' : self.m_base.m_workspace,
+                'geodatabase' : self.m_base.m_geodatabase,
+                'md' : self.m_base.m_mdName,
+                'commands' : self.m_base.m_commands,
+                'processinfo' : self.processInfo.processInfo,
+                'addrasters' : addRasters.sMdNameList
+                })
 
-        #split commands with '+'
-        self.log('Using template:' + self.config, self.const_general_text)
-
-        com_ = com
-        if (com_.upper() == self.const_cmd_default_text.upper()):
-            try:
-                com_ = self.getXMLNodeValue(self.m_base.m_doc, "Command")         #gets command defaults.
-                self.log('Using default command(s):' + com_)
-
-            except:
-                self.log("Error: Reading input config file:" + self.config + "\nQuitting...",
-                self.const_critical_text)
-                return False
+        return True
 
-            if (len(com_.strip()) == 0):
-                self.log('Error: Empty command.',
-                self.const_critical_text)
-                return False
 
-        self.log('Processing command(s):' + com_.upper(), self.const_general_text)
+    def getCommandNodes(self, com_):
 
+        nodes = []
         aryCmds = com_.split('+')
         for command in aryCmds:
 
@@ -1429,41 +1733,417 @@ class Solutions(Base.Base):
             if ((cmd in self.commands.keys()) == False):
                 if (self.isUser_Function(ucCommand) == True):
                     try:
-                        self.commands[ucCommand] = {}
-                        self.commands[ucCommand]['desc'] = 'User defined command (%s)' % (ucCommand)
-                        self.commands[ucCommand]['fnc'] = self.commands['CM']['fnc']        # can't use self.executeCommand directly here. Need to check.
-
+                        self.registerUserCommand(ucCommand)
                         cmd = ucCommand     # preseve user defined function case.
                         is_user_cmd = True
                     except:
                         self.log('Unabled to add user defined function/command (%s) to command chain.' % (ucCommand), self.const_warning_text)
-                        return False    # return to prevent further processing.
+                        return None    # return to prevent further processing.
                 else:
                     self.log("Command/Err: Unknown command:" + cmd, self.const_warning_text)
+                    self.m_invalid_commands.append(command)
                     continue
 
             indexed_cmd = False if index == 0 else True
             cat_cmd  = '%s%s' % (cmd, '' if not indexed_cmd else index)
-            if (self.isLog() == True):
-                 self.m_log.CreateCategory(cat_cmd)
-
-            self.log("Command:" + cat_cmd + '->' + '%s' % self.commands[cmd]['desc'], self.const_general_text)
-            if (indexed_cmd):
-                self.log('Using parameter values at index (%s)' % index, self.const_general_text)
-            success = 'OK'
-
-            status = self.commands[cmd]['fnc'](self, cmd, index)
-            if (status == False):
-                success = 'Failed!'
-            self.log(success, self.const_status_text)
-
-            if (self.isLog() == True):
-                self.m_log.CloseCategory()
-
-            if (status == False and     # do not continue with any following commands if AR / user defined function commands fail.
-                (cmd == 'AR' or
-                 cmd == 'CM' or
-                 is_user_cmd == True)):
+
+            nodes.append({
+            'cmd' : cmd,
+            'index' : index,
+            'cat' : cat_cmd,
+            'is_user_cmd' : is_user_cmd,
+            'pos' : len(nodes)      # position in the chain, identifies the command in the checkpoint journal.
+            })
+
+        return nodes
+
+
+    # commands other than (AR) that could add/remove catalog items and so invalidate the known max OBJECTID.
+    catalog_item_writers = ['CM', 'CR', 'DMD', 'RRFMD', 'MMDI', 'SMDI', 'SY', 'BO', 'DO', 'JF']
+
+    # commands that need an exclusive schema lock on the mosaic dataset.
+    schema_writers = ['AF', 'DF', 'AI', 'AMDS']
+
+    def waitForSchemaLocks(self):       # exclusive/edit locks held by other processes (e.g. -workers) would fail the schema change.
+        gdb = self.m_base.m_geoPath
+        if (gdb.lower().endswith(self.m_base.const_geodatabase_ext.lower()) == False or
+            os.path.isdir(gdb) == False):
+            return True     # only file geodatabases keep lock files.
+        waited = self.m_base.waitForLockRelease(gdb, schema = True)
+        if (waited > 0):
+            self.log('Waited (%s) s for the geodatabase locks to be released.' % (waited), self.const_general_text)
+        return waited >= 0
+
+
+    def invalidateCatalogState(self, node):
+        if (node['cmd'] in self.catalog_item_writers or
+            node['is_user_cmd'] == True):
+            self.m_base.m_objectid_tracker.invalidate()
+        if ((node['cmd'] in ['AR', 'AF']) == False):      # (AR, AF) only add fields through the field cache.
+            Base.g_field_cache.invalidate()
+
+
+    def getCatalogMax(self, node):     # the max OBJECTID of the catalog for (metrics), None if unknown/not relevant to the command.
+        if (node['cmd'] != 'AR' and
+            (node['cmd'] in self.catalog_item_writers) == False and
+            node['is_user_cmd'] == False):
+            return None
+        tracker = self.m_base.m_objectid_tracker
+        try:
+            return tracker.getMax(self.m_base.m_geoPath, self.m_base.m_mdName)
+        except:
+            return None
+
+
+    def isStopCommand(self, node):      # do not continue with any following commands if AR / user defined function commands fail.
+        return (node['cmd'] == 'AR' or
+                node['cmd'] == 'CM' or
+                node['is_user_cmd'] == True)
+
+
+    def executeNode(self, node):
+
+        cmd = node['cmd']
+        index = node['index']
+        cat_cmd = node['cat']
+
+        if (self.isLog() == True):
+             self.m_log.CreateCategory(cat_cmd)
+
+        self.log("Command:" + cat_cmd + '->' + '%s' % self.getCommand(cmd)['desc'], self.const_general_text)
+        if (index > 0):
+            self.log('Using parameter values at index (%s)' % index, self.const_general_text)
+        success = 'OK'
+
+        metrics = Base.g_metrics
+        if (metrics is not None):
+            metrics.m_command = cat_cmd
+            objectid = self.getCatalogMax(node)
+            t0 = metrics.start()
+
+        checkpoint = self.m_base.m_checkpoint
+        if (checkpoint is not None):
+            checkpoint.setCommand(node)
+
+        if (cmd in self.schema_writers):
+            self.waitForSchemaLocks()
+
+        status = self.executeCommand(cmd, index)
+        if (status == False):
+            success = 'Failed!'
+            self.m_failed_nodes.append(node['cat'])
+        elif (checkpoint is not None):
+            checkpoint.commandDone(node)
+        self.log(success, self.const_status_text)
+        self.invalidateCatalogState(node)
+
+        if (metrics is not None):
+            metrics.add('command', cat_cmd, t0, status, objectid, self.getCatalogMax(node))
+            metrics.m_command = ''
+
+        if (self.isLog() == True):
+            self.m_log.CloseCategory()
+
+        return status
+
+
+    def getWorkerState(self, node):     # values needed to re-create this run in a worker process.
+        return {
+        'config' : self.config,
+        'node' : node,
+        'code_base' : self.m_base.m_code_base,
+        'workspace' : self.m_base.m_workspace,
+        'geodatabase' : self.m_base.m_geodatabase,
+        'md' : self.m_base.m_mdName,
+        'sources' : self.m_base.m_sources,
+        'dynamic_params' : self.m_base.m_dynamic_params,
+        'cache_folder' : self.m_base.m_cache_folder,
+        'lock_timeout' : self.m_base.m_lock_timeout,
+        'last_objectid' : self.m_base.m_last_AT_ObjectID,
+        'art' : (self.m_base.m_art_apply_changes, self.m_base.m_art_ws, self.m_base.m_art_ds),
+        'env' : self.m_base.m_env_settings,
+        'metrics' : Base.g_metrics is not None,
+        'backend' : (self.m_base.m_backend, arcpy.getState() if arcpy.getSource() != 'arcpy' else None)
+        }
+
+
+    def runScheduled(self, nodes):
+
+        if (multiprocessing.current_process().daemon):     # pool workers (MDCS_Batch) aren't allowed to have child processes.
+            self.log('Command schedule: (-workers) is ignored within a daemonic worker process, running the commands in order.', self.const_warning_text)
+            return self.runNodes(nodes)
+
+        scheduler = self.getModule('Scheduler').CommandScheduler(nodes, self.m_log.Message)
+
+        self.log('Command schedule using (%s) worker processes:' % (self.m_base.m_max_workers), self.const_general_text)
+        levels = scheduler.getLevels()
+        for i in range(0, len(levels)):
+            self.log('\tStage %s: %s' % (i, ', '.join([nodes[n]['cat'] for n in levels[i]])), self.const_general_text)
+
+        pool = multiprocessing.Pool(processes=self.m_base.m_max_workers)
+        try:
+            return scheduler.run(
+            lambda i: self.executeNode(nodes[i]),
+            lambda i: WorkerNode(self, nodes[i], pool.apply_async(executeCommandWorker, (self.getWorkerState(nodes[i]),))),
+            lambda i, status: self.isStopCommand(nodes[i])
+            )
+        finally:
+            pool.close()
+            pool.join()
+
+
+    def run(self, conf, com, info):
+
+        self.config = conf       #configuration/XML template
+        self.userInfo = info     #callback information for commands /e.t.c.
+
+        if (self.load() == False):
+            return False
+
+        bSuccess = self.processInfo.hasProcessInfo
+
+        #split commands with '+'
+        self.log('Using template:' + self.config, self.const_general_text)
+
+        com_ = self.resolveCommands(com)
+        if (com_ is None):
+            return False
+
+        nodes = self.getCommandNodes(com_)
+        if (nodes is None):
+            return False
+
+        checkpoint = self.getModule('Checkpoint').Checkpoint(self.m_base, self.getStateFolder('checkpoints'))
+        if (checkpoint.start(self.config, com_.upper(), self.m_base.m_resume) == True):
+            nodes = checkpoint.getPending(nodes)
+        self.m_base.m_checkpoint = checkpoint
+
+        if (self.m_base.m_incremental != ''):
+            self.m_base.m_source_manifest = self.getModule('SourceManifest').SourceManifest(self.m_base, self.getStateFolder('manifests'), self.m_base.m_incremental == 'hash')
+        if (self.m_base.m_incremental != '' or
+            self.m_base.m_discovery_workers > 0):      # the manifest compares the files found by the discovery.
+            cache_path = ''
+            if (self.m_base.m_cache_folder != '' and
+                self.m_base.m_discovery_workers > 0):
+                cache_path = os.path.join(self.m_base.m_cache_folder, 'listings.json')
+            self.m_base.m_source_discovery = self.getModule('SourceDiscovery').SourceDiscovery(self.m_base, self.m_base.m_discovery_workers, cache_path)
+
+        if (self.m_base.m_max_workers > 1 and
+            len(nodes) > 1):
+            status = self.runScheduled(nodes)
+        else:
+            status = self.runNodes(nodes)
+
+        self.m_base.logConfigStats()
+        self.log(Base.g_tool_cache.getStats(), self.const_general_text)
+        if (arcpy.getSource() != 'arcpy'):
+            self.log(arcpy.getStats(), self.const_general_text)
+        if (self.m_base.m_source_discovery is not None):
+            self.log(self.m_base.m_source_discovery.getStats(), self.const_general_text)
+            self.m_base.m_source_discovery.saveCache()
+        if (self.m_base.m_cache_folder != ''):
+            Base.g_tool_cache.save(self.getToolCachePath())
+            Base.g_env_probe.save(self.getEnvProbePath())
+        if (status == True and
+            len(self.m_invalid_commands) == 0 and
+            len(self.m_failed_nodes) == 0):
+            checkpoint.remove()
+        else:
+            self.log('Checkpoint: completed steps are journaled in (%s), use -resume to continue.' % (checkpoint.m_path), self.const_general_text)
+        return status
+
+
+    def getStateFolder(self, name):      # checkpoint journals/source manifests go next to the compiled configs or in (name) in the log folder.
+        if (self.m_base.m_cache_folder != ''):
+            return self.m_base.m_cache_folder
+        if (self.m_log.logFolder != ''):
+            return os.path.join(os.path.abspath(self.m_log.logFolder), name)
+        return os.path.join(tempfile.gettempdir(), 'mdcs', name)
+
+
+    def getToolCachePath(self):     # GP tool signatures persisted next to the compiled configs.
+        return os.path.join(self.m_base.m_cache_folder, 'tools.json')
+
+
+    def getEnvProbePath(self):      # install info/version/patches persisted next to the compiled configs.
+        return os.path.join(self.m_base.m_cache_folder, 'environment.json')
+
+
+    def resolveCommands(self, com):      # returns the command chain to run or None.
+
+        com_ = com
+        if (com_.upper() == self.const_cmd_default_text.upper()):
+            try:
+                com_ = self.getXMLNodeValue(self.m_base.m_doc, "Command")         #gets command defaults.
+                self.log('Using default command(s):' + com_)
+
+            except:
+                self.log("Error: Reading input config file:" + self.config + "\nQuitting...",
+                self.const_critical_text)
+                return None
+
+            if (len(com_.strip()) == 0):
+                self.log('Error: Empty command.',
+                self.const_critical_text)
+                return None
+
+        self.log('Processing command(s):' + com_.upper(), self.const_general_text)
+        return com_
+
+
+    def prepare(self, conf, com):       # resolves the config and the command chain only, returns the command nodes or None.
+
+        self.config = conf
+        self.userInfo = {}
+        self.m_base.m_validate_only = True
+
+        if (self.load() == False):
+            return None
+
+        com_ = self.resolveCommands(com)
+        if (com_ is None):
+            return None
+
+        return self.getCommandNodes(com_)
+
+
+    def checkNode(self, node):      # returns the error message or '' if the command could be run.
+        process = self.getCommand(node['cmd'])['process']
+        if (process is None):
+            return ''
+        if ((process in self.processInfo.processInfo.keys()) == False):
+            return 'Command (%s): process block (%s) is not found in the config.' % (node['cat'], process)
+        if (node['index'] > len(self.processInfo.processInfo[process]) - 1):
+            return 'Command (%s): invalid command index, (%s) has (%s) entries.' % (node['cat'], process, len(self.processInfo.processInfo[process]))
+        return ''
+
+
+    def validate(self, conf, com):      # resolves the config, process blocks and command chain without running any command.
+
+        self.log('Validating template:' + conf, self.const_general_text)
+        nodes = self.prepare(conf, com)
+        if (nodes is None):
+            return False
+
+        status = len(self.m_invalid_commands) == 0
+        for node in nodes:
+            msg = self.checkNode(node)
+            if (msg != ''):
+                self.log(msg, self.const_critical_text)
+                status = False
+
+        self.log('Validation %s: (%s) command(s), workspace (%s), mosaic dataset (%s)' % ('OK' if status else 'Failed!', len(nodes), self.m_base.m_geoPath, self.m_base.m_mdName),
+        self.const_general_text if status else self.const_critical_text)
+        return status
+
+
+    def plan(self, conf, com):      # dry-run, prints the execution plan with cost estimates. No geoprocessing tool gets run.
+
+        nodes = self.prepare(conf, com)
+        if (nodes is None):
+            return False
+
+        planner = self.getModule('Planner').ExecutionPlanner(self)
+        return planner.run(nodes)
+
+
+    def runNodes(self, nodes):
+
+        for node in nodes:
+            status = self.executeNode(node)
+            if (status == False and
+                self.isStopCommand(node)):
                     return False
 
         return True
+
+
+class WorkerNode(object):       # a command running in a worker process. Its log messages get merged back on completion.
+
+    def __init__(self, solutions, node, result):
+        self.m_solutions = solutions
+        self.m_node = node
+        self.m_result = result
+
+    def ready(self):
+        return self.m_result.ready()
+
+    def get(self):
+        log = self.m_solutions.m_log
+        try:
+            (status, messages, duration, records, changes) = self.m_result.get()
+        except Exception as inf:
+            (status, messages, duration, records, changes) = (False, [{'error' : {'type' : 'critical', 'text' : str(inf)}}], 0, [], None)
+        if (changes is not None):       # datasets edited by the command on the in-memory backend.
+            arcpy.mergeChanges(changes)
+        if (Base.g_metrics is not None):
+            Base.g_metrics.merge(records)
+        messages.append({'text' : 'Failed!' if status == False else 'OK', 'type' : 'status'})
+        log.MergeCategory(self.m_node['cat'], messages, duration)
+        self.m_solutions.invalidateCatalogState(self.m_node)
+        if (status == False):
+            self.m_solutions.m_failed_nodes.append(self.m_node['cat'])
+        elif (self.m_solutions.m_base.m_checkpoint is not None):
+            self.m_solutions.m_base.m_checkpoint.commandDone(self.m_node)
+        return status
+
+
+def executeCommandWorker(state):        # entry point for commands run by the worker processes.
+
+    sys.path.append(os.path.join(scriptPath, 'SolutionsLog'))
+    import logger
+
+    t0 = time.time()
+    base = Base.Base()
+    log = logger.Logger(base)
+    base.setLog(log)
+    base.setCodeBase(state['code_base'])
+    base.m_workspace = state['workspace']
+    base.m_geodatabase = state['geodatabase']
+    base.m_mdName = state['md']
+    base.m_sources = state['sources']
+    base.m_dynamic_params = state['dynamic_params']
+    base.m_cache_folder = state['cache_folder']
+    base.m_lock_timeout = state['lock_timeout']
+    base.m_last_AT_ObjectID = state['last_objectid']
+    (base.m_art_apply_changes, base.m_art_ws, base.m_art_ds) = state['art']
+    solutions = Solutions(base)
+    (backend, backend_state) = state['backend']
+    if (solutions.setBackend(backend, backend_state) == False):
+        messages = log.GetCategoryMessages('__root')
+        log.Close()
+        return (False, messages, time.time() - t0, [], None)
+    for key in state['env']:
+        arcpy.env[key] = state['env'][key]
+        base.m_env_settings[key] = state['env'][key]
+
+    if (state['metrics']):
+        import metrics
+        Base.g_metrics = metrics.Metrics(state['config'])
+
+    node = state['node']
+    solutions.config = state['config']
+    solutions.userInfo = {}
+    if (solutions.load() == False):
+        messages = log.GetCategoryMessages('__root')
+        log.Close()
+        return (False, messages, time.time() - t0, [], None)
+
+    log.CreateCategory(node['cat'])
+    log.Message("Command:" + node['cat'] + '->' + '%s' % solutions.getCommand(node['cmd'])['desc'], log.const_general_text)
+    if (Base.g_metrics is not None):
+        Base.g_metrics.m_command = node['cat']
+        t1 = Base.g_metrics.start()
+    if (node['cmd'] in solutions.schema_writers):
+        solutions.waitForSchemaLocks()
+    status = solutions.executeCommand(node['cmd'], node['index'])
+    records = []
+    if (Base.g_metrics is not None):
+        Base.g_metrics.add('command', node['cat'], t1, status)
+        records = Base.g_metrics.m_records
+    changes = None
+    if (arcpy.getSource() != 'arcpy'):
+        changes = arcpy.getChanges()
+    messages = log.GetCategoryMessages(node['cat'])
+    log.Close()
+    return (status != False, messages, time.time() - t0, records, changes)